@@ -16,11 +16,12 @@ import os
 
 # Importar módulos del proyecto
 from parser.loader import MTConfigLoader
-from core.turing_machine import TuringMachine
 from core.simulation import Simulator
+from core.result_store import ResultStore, machine_hash
+from config import RESULT_CACHE_PATH, RESULT_CACHE_MAX_BYTES, MACHINE_CACHE_DIR
 
 
-def medir_tiempo_ejecucion(machine, input_str, repeticiones=5):
+def medir_tiempo_ejecucion(machine, input_str, repeticiones=5, store=None, machine_key=None):
     """
     Mide el tiempo de ejecución de la máquina de Turing para una entrada dada.
     
@@ -28,6 +29,9 @@ def medir_tiempo_ejecucion(machine, input_str, repeticiones=5):
         machine: Instancia de TuringMachine
         input_str: Cadena de entrada en notación unaria
         repeticiones: Número de veces a repetir la medición
+        store: ResultStore opcional donde registrar pasos y resultado (no
+            evita la simulación, ya que es la que se mide)
+        machine_key: Hash de la máquina usado como clave en store
     
     Returns:
         tuple: (tiempo_promedio, tiempo_min, tiempo_max, pasos, resultado)
@@ -42,13 +46,13 @@ def medir_tiempo_ejecucion(machine, input_str, repeticiones=5):
         fin = time.perf_counter()
         tiempos.append(fin - inicio)
     
-    # Contar pasos (número de transiciones)
-    _, log_lines, _ = simulator.run_string(input_str)
-    pasos = sum(1 for line in log_lines if '⊢' in line)
+    # Contar pasos desde la última medición (una línea por transición tras
+    # el encabezado) y guardar el resultado si la caché aún no lo tiene
+    pasos = len(log_lines) - len(simulator.header_lines(input_str))
+    if store is not None and store.get(machine_key, input_str) is None:
+        store.put(machine_key, input_str, accepted, pasos, final_tape)
     
-    # Obtener resultado final
-    accepted, _, final_tape = simulator.run_string(input_str)
-    resultado_longitud = len([s for s in final_tape.tape if s == '1'])
+    resultado_longitud = final_tape.count('1')
     
     return (
         np.mean(tiempos),
@@ -136,10 +140,14 @@ def main():
     # Cargar la configuración de la máquina de Turing
     print("\n1. Cargando máquina de Turing...")
     loader = MTConfigLoader("machines/fibonacci_config.yaml")
-    config = loader.load()
-    machine = TuringMachine(config)
+    config, machine = loader.load_compiled(MACHINE_CACHE_DIR)
     print("   [OK] Máquina cargada exitosamente.")
     
+    store = None
+    if RESULT_CACHE_PATH is not None:
+        store = ResultStore(RESULT_CACHE_PATH, max_bytes=RESULT_CACHE_MAX_BYTES)
+    machine_key = machine_hash(config)
+    
     # Generar entradas de prueba (n = 0 a 15)
     print("\n2. Generando entradas de prueba...")
     entradas_prueba = []
@@ -157,7 +165,7 @@ def main():
     resultados = []
     for n, entrada in entradas_prueba:
         tiempo_prom, tiempo_min, tiempo_max, pasos, fib_n = medir_tiempo_ejecucion(
-            machine, entrada, repeticiones=5
+            machine, entrada, repeticiones=5, store=store, machine_key=machine_key
         )
         
         resultados.append({
@@ -177,6 +185,9 @@ def main():
     print("="*80)
     print("   [OK] Mediciones completadas.")
     
+    if store is not None:
+        store.close()
+    
     # Crear DataFrame
     df_resultados = pd.DataFrame(resultados)
     
@@ -0,0 +1,389 @@
+"""
+Suite de benchmarks del simulador de Máquinas de Turing.
+
+Este script mide todas las máquinas del directorio machines/ con cada modo
+de simulación disponible, sobre las cadenas de simulación de cada máquina.
+Para cada entrada registra pasos por segundo, nanosegundos por paso y
+memoria máxima (y, en el modo por bloques, la tasa de aciertos de su
+memoria de recorridos), agrega los resultados a un historial en JSON y los compara
+con una línea base guardada: si algún caso se vuelve más lento que el
+umbral configurado, el script termina con código de salida 1.
+
+Uso:
+    python benchmark.py                      # medir y comparar con la línea base
+    python benchmark.py --save-baseline      # guardar la medición como línea base
+    python benchmark.py --modes fast macro --machines fibonacci_config
+"""
+
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from parser.loader import MTConfigLoader
+from core.simulation import Simulator
+from core.macro import MacroSimulator
+from core.codegen import GeneratedSimulator
+from core.batch import BatchSimulator, np
+from config import MACHINE_CACHE_DIR
+from config import BENCHMARK_HISTORY_PATH, BENCHMARK_BASELINE_PATH, BENCHMARK_THRESHOLD
+
+# Directorio con las definiciones de las máquinas a medir
+MACHINES_DIR = "machines"
+
+# Duración mínima de cada ronda de medición, en segundos; las entradas
+# rápidas se ejecutan varias veces por ronda para reducir el ruido
+MIN_ROUND_SECONDS = 0.05
+
+
+def _traced(machine):
+    """Modo con registro completo en memoria (run_string)."""
+    return Simulator(machine).run_string
+
+
+def _streamed(machine):
+    """Modo con registro producido línea a línea sin conservarlo (iter_steps)."""
+    simulator = Simulator(machine)
+
+    def run(input_str):
+        for _ in simulator.iter_steps(input_str).lines():
+            pass
+    return run
+
+
+def _fast(machine):
+    """Modo sin registro sobre la tabla compilada (run_fast)."""
+    return Simulator(machine).run_fast
+
+
+def _fast_loops(machine):
+    """Modo sin registro con detección de ciclos (run_fast con detect_loops)."""
+    return Simulator(machine, detect_loops=True).run_fast
+
+
+def _macro(machine):
+    """Modo por bloques con memoria de recorridos (MacroSimulator)."""
+    return MacroSimulator(machine).run
+
+
+def _generated(machine):
+    """Modo con código generado para la máquina (GeneratedSimulator)."""
+    return GeneratedSimulator(machine).run
+
+
+def _batch(machine):
+    """Modo en lote con NumPy (BatchSimulator), con un lote de una cadena."""
+    simulator = BatchSimulator(machine)
+    return lambda input_str: simulator.run([input_str])
+
+
+# Modos de simulación disponibles: nombre -> constructor del ejecutor
+MODES = {
+    "traced": _traced,
+    "streamed": _streamed,
+    "fast": _fast,
+    "fast_loops": _fast_loops,
+    "macro": _macro,
+    "generated": _generated,
+}
+
+# El modo en lote solo está disponible si NumPy está instalado
+if np is not None:
+    MODES["batch"] = _batch
+
+
+def measure(run, input_str, repeats):
+    """
+    Mide el tiempo de ejecución de una entrada.
+    
+    Cada ronda ejecuta la entrada las veces necesarias para durar al menos
+    MIN_ROUND_SECONDS; se conserva el mejor tiempo por ejecución. Igual que
+    timeit, el recolector de basura se desactiva durante la medición.
+    
+    Args:
+        run (callable): Ejecutor del modo medido.
+        input_str (str): Cadena de entrada.
+        repeats (int): Número de rondas.
+    
+    Returns:
+        float: Mejor tiempo por ejecución, en segundos.
+    """
+    def timed(number):
+        start = time.perf_counter()
+        for _ in range(number):
+            run(input_str)
+        return time.perf_counter() - start
+
+    gc.collect()
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        number = 1
+        while True:
+            elapsed = timed(number)
+            if elapsed >= MIN_ROUND_SECONDS:
+                break
+            number *= 2
+
+        best = elapsed / number
+        for _ in range(repeats - 1):
+            best = min(best, timed(number) / number)
+    finally:
+        if enabled:
+            gc.enable()
+    return best
+
+
+def cache_counts(run):
+    """
+    Lee los contadores de la memoria de recorridos de un ejecutor.
+    
+    Args:
+        run (callable): Ejecutor del modo medido.
+    
+    Returns:
+        tuple: (aciertos, fallos) acumulados, o None si el modo no tiene
+            memoria de recorridos.
+    """
+    simulator = getattr(run, "__self__", None)
+    if not isinstance(simulator, MacroSimulator):
+        return None
+    stats = simulator.cache_stats()
+    return stats["hits"], stats["misses"]
+
+
+def peak_memory(run, input_str):
+    """
+    Mide la memoria máxima reservada durante una ejecución.
+    
+    Args:
+        run (callable): Ejecutor del modo medido.
+        input_str (str): Cadena de entrada.
+    
+    Returns:
+        int: Pico de memoria reservada por Python, en bytes.
+    """
+    tracemalloc.start()
+    try:
+        run(input_str)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def benchmark_machine(path, modes, repeats):
+    """
+    Mide una máquina con los modos indicados sobre sus cadenas de simulación.
+    
+    Args:
+        path (str): Ruta del archivo YAML de la máquina.
+        modes (list): Nombres de los modos a medir (claves de MODES).
+        repeats (int): Rondas de medición por entrada.
+    
+    Returns:
+        list: Un diccionario por (modo, entrada) con machine, mode, input,
+            size, steps, seconds, steps_per_second, ns_per_step, peak_bytes
+            y, en los modos con memoria de recorridos, cache_hit_rate (tasa
+            de aciertos de las ejecuciones medidas).
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    config, machine = MTConfigLoader(path).load_compiled(MACHINE_CACHE_DIR)
+    inputs = [str(s) for s in config["simulation_strings"]]
+
+    # El número de pasos no depende del modo
+    reference = Simulator(machine)
+    steps = {input_str: reference.run_fast(input_str)[1] for input_str in inputs}
+
+    records = []
+    for mode in modes:
+        run = MODES[mode](machine)
+        for input_str in inputs:
+            before = cache_counts(run)
+            seconds = measure(run, input_str, repeats)
+            after = cache_counts(run)
+            count = max(steps[input_str], 1)
+            records.append({
+                "machine": name,
+                "mode": mode,
+                "input": input_str,
+                "size": len(input_str),
+                "steps": steps[input_str],
+                "seconds": seconds,
+                "steps_per_second": count / seconds,
+                "ns_per_step": seconds * 1e9 / count,
+                "peak_bytes": peak_memory(run, input_str),
+            })
+
+            line = (
+                f"{name:<20} {mode:<11} n={len(input_str):<4} pasos={steps[input_str]:<9} "
+                f"{records[-1]['ns_per_step']:>10.1f} ns/paso  {records[-1]['peak_bytes'] / 1024:>9.1f} KiB"
+            )
+            if before is not None:
+                # Aciertos de la memoria de recorridos en las ejecuciones medidas
+                hits, misses = after[0] - before[0], after[1] - before[1]
+                records[-1]["cache_hit_rate"] = hits / (hits + misses) if hits + misses else 0.0
+                line += f"  aciertos={records[-1]['cache_hit_rate']:.1%}"
+            print(line)
+    return records
+
+
+def find_regressions(records, baseline, threshold):
+    """
+    Compara una medición con la línea base.
+    
+    Args:
+        records (list): Resultados de la medición actual.
+        baseline (list): Resultados de la línea base.
+        threshold (float): Aumento relativo de ns/paso tolerado (0.2 = 20%).
+    
+    Returns:
+        list: Tuplas (registro, ns/paso de la línea base, aumento relativo)
+            de los casos que superan el umbral.
+    """
+    reference = {(r["machine"], r["mode"], r["input"]): r["ns_per_step"] for r in baseline}
+
+    regressions = []
+    for record in records:
+        before = reference.get((record["machine"], record["mode"], record["input"]))
+        if before is None:
+            continue
+        change = record["ns_per_step"] / before - 1
+        if change > threshold:
+            regressions.append((record, before, change))
+    return regressions
+
+
+def load_json(path, default):
+    """
+    Lee un archivo JSON del benchmark.
+    
+    Args:
+        path (str): Ruta del archivo.
+        default: Valor devuelto si el archivo no existe.
+    
+    Returns:
+        Contenido del archivo, o default si no existe.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def write_json(path, data):
+    """
+    Escribe un archivo JSON del benchmark de forma atómica.
+    
+    Args:
+        path (str): Ruta del archivo.
+        data: Contenido serializable en JSON.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(temporary, path)
+
+
+def parse_args():
+    """
+    Interpreta los argumentos de línea de comandos.
+    
+    Returns:
+        argparse.Namespace: Opciones del benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks del simulador de Máquinas de Turing")
+    parser.add_argument(
+        "--modes", nargs="+", choices=sorted(MODES), default=list(MODES),
+        help="Modos de simulación a medir (por defecto todos)"
+    )
+    parser.add_argument(
+        "--machines", nargs="+", default=None,
+        help="Nombres de las máquinas a medir, sin extensión (por defecto todas las de machines/)"
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=5,
+        help="Rondas de medición por entrada (por defecto 5)"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=BENCHMARK_THRESHOLD,
+        help="Aumento relativo de ns/paso que se considera regresión"
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true",
+        help="Guardar esta medición como nueva línea base"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """
+    Ejecuta la suite de benchmarks.
+    
+    Mide las máquinas y modos seleccionados, agrega la medición al
+    historial, la compara con la línea base (o la guarda como tal) y
+    termina con código 1 si se detecta alguna regresión.
+    
+    Raises:
+        ValueError: Si el número de rondas no es positivo o alguna máquina
+            indicada no existe.
+    """
+    args = parse_args()
+    if args.repeats < 1:
+        raise ValueError(f"Número de rondas no válido: {args.repeats}")
+
+    paths = sorted(glob.glob(os.path.join(MACHINES_DIR, "*.yaml")))
+    if args.machines is not None:
+        available = {os.path.splitext(os.path.basename(p))[0]: p for p in paths}
+        missing = [name for name in args.machines if name not in available]
+        if missing:
+            raise ValueError(f"Máquinas no encontradas: {', '.join(missing)}")
+        paths = [available[name] for name in args.machines]
+
+    records = []
+    for path in paths:
+        records.extend(benchmark_machine(path, args.modes, args.repeats))
+
+    history = load_json(BENCHMARK_HISTORY_PATH, [])
+    history.append({
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": records,
+    })
+    write_json(BENCHMARK_HISTORY_PATH, history)
+    print(f"\nHistorial actualizado: {BENCHMARK_HISTORY_PATH}")
+
+    if args.save_baseline:
+        write_json(BENCHMARK_BASELINE_PATH, records)
+        print(f"Línea base guardada: {BENCHMARK_BASELINE_PATH}")
+        return
+
+    baseline = load_json(BENCHMARK_BASELINE_PATH, None)
+    if baseline is None:
+        print("Sin línea base para comparar (use --save-baseline)")
+        return
+
+    regressions = find_regressions(records, baseline, args.threshold)
+    for record, before, change in regressions:
+        print(
+            f"REGRESIÓN {record['machine']} {record['mode']} '{record['input']}': "
+            f"{before:.1f} -> {record['ns_per_step']:.1f} ns/paso (+{change:.0%})"
+        )
+
+    if regressions:
+        sys.exit(1)
+    print(f"Sin regresiones respecto a la línea base (umbral {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
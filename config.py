@@ -6,10 +6,127 @@ CONFIGURACION = "machines/fibonacci_config.yaml"
 # Ruta del directorio de salida para los resultados de las simulaciones
 OUTPUT_DIR = "outputs"
 
+# Directorio de la caché de máquinas compiladas (None la desactiva)
+MACHINE_CACHE_DIR = ".mtcache"
+
 # --- Configuraciones para para máquinas que generan cadenas
 
 # Imprimir cadena resultante
 PRINT_RESULT = True
 
 # Imprimir longitud de la cadena resultante (requiere PRINT_RESULT = True)
-PRINT_LENGTH = True
\ No newline at end of file
+PRINT_LENGTH = True
+
+# --- Configuraciones del registro de transiciones
+
+# Compresión de los archivos de salida: None, "gzip" (.gz) o "lzma" (.xz)
+OUTPUT_COMPRESSION = None
+
+# Reunir todos los registros de una ejecución en un único archivo en lugar
+# de un archivo por cadena: None, "zip" o "sqlite" (outputs/simulaciones.*)
+OUTPUT_ARCHIVE = None
+
+# Caracteres acumulados antes de entregar un bloque al hilo de escritura
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Bloques que pueden esperar al hilo de escritura antes de pausar la simulación
+OUTPUT_QUEUE_SIZE = 8
+
+# Formato del registro de transiciones: "text" escribe cada paso con sus
+# IDs en el archivo de salida; "binary" los guarda en un registro compacto
+# (simulation_N.trace, legible con trace_view.py) y el archivo de salida
+# solo contiene el resultado; "ring" solo escribe los últimos pasos y un
+# paso de cada cierto número de pasos, generados al terminar la simulación
+TRACE_FORMAT = "text"
+
+# Pasos entre las configuraciones completas que guarda el índice del
+# registro binario (menos pasos = acceso más rápido a un paso cualquiera)
+TRACE_SNAPSHOT_STEPS = 1 << 16
+
+# Últimos pasos que muestra el registro acotado (TRACE_FORMAT = "ring")
+TRACE_RING_STEPS = 256
+
+# Pasos entre los pasos muestreados del registro acotado (None no muestrea)
+TRACE_SAMPLE_STEPS = 1 << 14
+
+# Pasos muestreados que se conservan (los más recientes)
+TRACE_RING_SAMPLES = 64
+
+# Número de celdas a cada lado del cabezal que se muestran en cada ID
+# (None muestra la cinta completa)
+ID_WINDOW = None
+
+# Representación de la cinta: "dense" (buffer contiguo, la más rápida),
+# "paged" (solo reserva memoria para las zonas con símbolos no blancos, útil
+# si la máquina se aleja mucho sobre blancos) o "runs" (rachas de símbolos
+# iguales, útil para cintas en notación unaria como la de Fibonacci)
+TAPE_TYPE = "dense"
+
+# Guardar junto a cada archivo de salida un perfil en JSON (.profile.json)
+# con las reglas y estados más usados, las posiciones del cabezal y el
+# tiempo dedicado a transiciones, IDs y registro. Solo con TRACE_FORMAT =
+# "text": main.py rechaza la combinación con "binary" o "ring"
+PROFILE = False
+
+# --- Presupuesto de recursos por simulación (None = sin límite)
+# Una simulación que supera cualquiera de estos límites se reporta como
+# ABORTADA, junto con sus estadísticas parciales
+
+# Número máximo de transiciones
+MAX_STEPS = None
+
+# Número máximo de celdas de cinta usadas
+MAX_TAPE_CELLS = None
+
+# Tamaño máximo del registro de transiciones, en bytes
+MAX_LOG_BYTES = None
+
+# Tiempo máximo de reloj, en segundos
+MAX_SECONDS = None
+
+# Rechazar las simulaciones que repiten una configuración completa
+# (estado, cache, cabezal y cinta), reportando el inicio y la longitud del ciclo.
+# Agrega trabajo a cada paso y desactiva los macro-pasos de barrido de
+# run_fast, por lo que conviene activarlo solo para máquinas que pueden ciclar
+DETECT_LOOPS = False
+
+# --- Puntos de control de simulaciones largas
+# Con alguno de estos intervalos, cada simulación guarda su configuración
+# junto a su archivo de salida (extensión .ckpt) y, si se interrumpe, la
+# siguiente ejecución la reanuda (desactivado por defecto)
+
+# Pasos entre puntos de control (None = sin límite de pasos)
+CHECKPOINT_STEPS = None
+
+# Segundos entre puntos de control (None = sin límite de tiempo; si ambos
+# son None no se guardan puntos de control)
+CHECKPOINT_SECONDS = None
+
+# --- Configuraciones de la caché de resultados
+
+# Base de datos SQLite con los resultados ya simulados (None la desactiva)
+RESULT_CACHE_PATH = OUTPUT_DIR + "/resultados_cache.sqlite"
+
+# Tamaño máximo en bytes de las cintas almacenadas; al superarlo se
+# descartan los resultados usados hace más tiempo (None no lo limita)
+RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# --- Configuraciones de la suite de benchmarks (benchmark.py)
+
+# Historial en JSON con todas las mediciones realizadas
+BENCHMARK_HISTORY_PATH = OUTPUT_DIR + "/benchmark_history.json"
+
+# Medición de referencia con la que se comparan las nuevas mediciones
+BENCHMARK_BASELINE_PATH = OUTPUT_DIR + "/benchmark_baseline.json"
+
+# Aumento relativo de ns/paso a partir del cual se reporta una regresión
+BENCHMARK_THRESHOLD = 0.25
+
+# --- Configuraciones del servidor de simulación (server.py)
+
+# Dirección en la que escucha el servidor (solo localhost)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+
+# Procesos que atienden las simulaciones del servidor (None usa uno por CPU)
+SERVER_WORKERS = None
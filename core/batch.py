@@ -0,0 +1,218 @@
+"""
+Módulo para la simulación en lote de muchas cadenas con NumPy.
+
+Este módulo proporciona la clase BatchSimulator, que simula B cadenas de
+entrada sobre la misma máquina avanzándolas a la par: las cintas se
+guardan como un arreglo 2-D de códigos de símbolos y los cabezales, bases
+(estado y cache) y contadores de pasos como vectores, de modo que cada
+paso de todas las simulaciones activas es un puñado de operaciones
+vectorizadas sobre la tabla compilada de la máquina.
+
+NumPy es una dependencia opcional: si no está instalado, el módulo se
+importa igualmente pero BatchSimulator lanza ImportError al crearse.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+from core.budget import Budget
+from core.simulation import Simulator
+from core.tape import INITIAL_MARGIN, Tape
+
+
+class BatchSimulator:
+    """
+    Simula muchas cadenas a la vez sobre una misma Máquina de Turing.
+    
+    Los resultados coinciden con los de Simulator.run_string (veredicto y
+    cinta final) y con el número de pasos de Simulator.run_fast. Las
+    cadenas con símbolos ajenos a la máquina se simulan por separado con
+    run_fast, ya que no tienen columna en la tabla compilada.
+    
+    Attributes:
+        machine (TuringMachine): Máquina a simular.
+        max_steps (int): Pasos máximos por cadena (None sin límite); las
+            cadenas que lo alcanzan se reportan con veredicto None.
+    """
+
+    def __init__(self, machine, max_steps=None):
+        """
+        Prepara la tabla compilada de la máquina como arreglos de NumPy.
+        
+        Args:
+            machine (TuringMachine): Máquina a simular.
+            max_steps (int): Pasos máximos por cadena (None sin límite).
+        
+        Raises:
+            ImportError: Si NumPy no está instalado.
+        """
+        if np is None:
+            raise ImportError("BatchSimulator requiere NumPy (pip install numpy)")
+
+        self.machine = machine
+        self.max_steps = max_steps
+
+        compiled = machine.compile()
+        self._compiled = compiled
+        self._dtype = np.uint8 if compiled.n_symbols <= 256 else np.uint32
+
+        # Tabla como columnas de NumPy, con un bloque extra al final (base
+        # sink) al que pasan las cintas detenidas: sus entradas reescriben el
+        # mismo símbolo sin mover el cabezal, de modo que todas las filas
+        # pueden avanzar a la par sin comprobar cuáles siguen activas.
+        # status es 0 si la simulación continúa, 1 si acepta y -1 si no hay
+        # transición (las entradas sin transición se comportan como sink).
+        n_symbols = compiled.n_symbols
+        size = len(compiled.table)
+        self._sink = size
+
+        symbols = np.arange(size + n_symbols) % n_symbols
+        self._next_base = np.full(size + n_symbols, size, dtype=np.int64)
+        self._write = symbols.astype(self._dtype)
+        self._move = np.zeros(size + n_symbols, dtype=np.int64)
+        self._status = np.zeros(size + n_symbols, dtype=np.int8)
+
+        for slot, entry in enumerate(compiled.table):
+            if entry is None:
+                self._status[slot] = -1
+                continue
+
+            next_base, tape_output, movement, accepts, _, _ = entry
+            self._write[slot] = tape_output
+            self._move[slot] = movement
+            if accepts:
+                self._status[slot] = 1
+            else:
+                self._next_base[slot] = next_base
+
+
+    def run(self, inputs):
+        """
+        Simula todas las cadenas y devuelve el resultado de cada una.
+        
+        Args:
+            inputs (list): Cadenas de entrada.
+        
+        Returns:
+            list: Una tupla (aceptada, pasos, tape) por cadena, en el orden
+                de inputs, igual que Simulator.run_fast.
+        """
+        codes = self._compiled.symbol_codes
+        results = [None] * len(inputs)
+
+        budget = Budget(max_steps=self.max_steps) if self.max_steps is not None else None
+        fallback = Simulator(self.machine, budget=budget)
+
+        batch = []
+        for index, input_str in enumerate(inputs):
+            if all(symbol in codes for symbol in input_str):
+                batch.append(index)
+            else:
+                results[index] = fallback.run_fast(input_str)
+
+        if batch:
+            for index, result in zip(batch, self._run_batch([inputs[i] for i in batch])):
+                results[index] = result
+        return results
+
+
+    def _run_batch(self, inputs):
+        """
+        Avanza a la par las cadenas cuyos símbolos son todos de la máquina.
+        
+        Método privado. Todas las cintas comparten columnas: la columna
+        origin corresponde al primer símbolo de cada entrada. Cuando algún
+        cabezal se acerca al borde, el arreglo se amplía por ambos lados, y
+        cuando quedan pocas cintas activas se descartan las filas detenidas.
+        
+        Args:
+            inputs (list): Cadenas de entrada.
+        
+        Returns:
+            list: Una tupla (aceptada, pasos, tape) por cadena.
+        """
+        compiled = self._compiled
+        codes = compiled.symbol_codes
+        results = [None] * len(inputs)
+
+        longest = max(len(input_str) for input_str in inputs)
+        origin = INITIAL_MARGIN
+        tapes = np.zeros((len(inputs), longest + 2 * INITIAL_MARGIN), dtype=self._dtype)
+        for row, input_str in enumerate(inputs):
+            tapes[row, origin:origin + len(input_str)] = [codes[symbol] for symbol in input_str]
+
+        rows = np.arange(len(inputs))  # índice en inputs de cada fila
+        heads = np.full(len(inputs), origin, dtype=np.int64)
+        bases = np.full(len(inputs), compiled.initial_base, dtype=np.int64)
+        steps = np.zeros(len(inputs), dtype=np.int64)
+        verdicts = np.zeros(len(inputs), dtype=np.int8)  # 1 aceptada, -1 rechazada, 0 abortada
+        running = np.ones(len(inputs), dtype=bool)
+
+        # Celdas usadas de cada cinta: la entrada más las celdas leídas
+        lowest = heads.copy()
+        highest = np.array([origin + len(input_str) for input_str in inputs], dtype=np.int64)
+
+        def finish(done):
+            for row in np.flatnonzero(done):
+                start, end = lowest[row], highest[row]
+                tape = Tape.from_codes(
+                    tapes[row, start:end].tolist(), compiled.symbols,
+                    head=int(heads[row] - start), origin=int(origin - start),
+                    blank_symbol=self.machine.blank_symbol
+                )
+                accepted = {1: True, -1: False, 0: None}[int(verdicts[row])]
+                results[rows[row]] = (accepted, int(steps[row]), tape)
+
+        next_write, moves, next_bases, statuses = self._write, self._move, self._next_base, self._status
+        limit = self.max_steps if self.max_steps is not None else float("inf")
+        iteration = 0
+        slack = INITIAL_MARGIN - 1
+
+        while iteration < limit:
+            if slack <= 0:
+                # Distancia mínima de un cabezal al borde; si es poca, ampliar
+                slack = min(heads.min(), tapes.shape[1] - 1 - heads.max())
+                if slack < INITIAL_MARGIN:
+                    margin = tapes.shape[1]
+                    tapes = np.pad(tapes, ((0, 0), (margin, margin)))
+                    heads += margin
+                    lowest += margin
+                    highest += margin
+                    origin += margin
+                    slack += margin
+
+            index = np.arange(len(rows))
+            slots = bases + tapes[index, heads]
+            np.minimum(lowest, heads, out=lowest, where=running)
+            np.maximum(highest, heads + 1, out=highest, where=running)
+
+            status = statuses[slots]
+            tapes[index, heads] = next_write[slots]
+            heads += moves[slots]
+            bases = next_bases[slots]
+
+            steps += running & (status >= 0)
+            halted = running & (status != 0)
+            verdicts[halted] = status[halted]
+            running &= status == 0
+
+            iteration += 1
+            slack -= 1
+
+            # Revisar las filas activas solo en los pasos en que alguna se detuvo
+            if halted.any():
+                if not running.any():
+                    break
+
+                # Descartar las filas detenidas cuando son la mayoría
+                if 2 * np.count_nonzero(running) < len(rows):
+                    finish(~running)
+                    keep = running
+                    tapes, rows, heads, bases = tapes[keep], rows[keep], heads[keep], bases[keep]
+                    steps, verdicts, lowest, highest = steps[keep], verdicts[keep], lowest[keep], highest[keep]
+                    running = running[keep]
+
+        finish(np.ones(len(rows), dtype=bool))
+        return results
@@ -0,0 +1,151 @@
+"""
+Módulo para limitar los recursos de una simulación.
+
+Este módulo proporciona la clase Budget, que define límites de pasos,
+celdas de cinta, bytes de registro y tiempo de reloj para una simulación,
+y BudgetReport, que describe una simulación abortada por superarlos. Una
+simulación abortada es un tercer resultado posible, junto a aceptada y
+rechazada.
+"""
+
+import time
+from collections import namedtuple
+
+
+# Resumen de una simulación abortada: recurso que se agotó y estadísticas
+# parciales en el momento de abortar (elapsed en segundos)
+BudgetReport = namedtuple("BudgetReport", [
+    "reason", "steps", "cells", "log_bytes", "elapsed",
+])
+
+# Pasos entre consultas del reloj en los bucles sin registro
+CLOCK_INTERVAL = 4096
+
+
+class Budget:
+    """
+    Límites de recursos para una simulación.
+    
+    Cada límite es opcional (None significa sin límite). Una instancia no
+    guarda estado de ninguna ejecución, por lo que puede compartirse entre
+    simulaciones.
+    
+    Attributes:
+        max_steps (int): Número máximo de transiciones.
+        max_cells (int): Número máximo de celdas de cinta usadas.
+        max_log_bytes (int): Tamaño máximo del registro en bytes (UTF-8).
+        max_seconds (float): Tiempo de reloj máximo en segundos.
+    """
+
+    def __init__(self, max_steps=None, max_cells=None, max_log_bytes=None, max_seconds=None):
+        """
+        Inicializa los límites de la simulación.
+        
+        Args:
+            max_steps (int): Número máximo de transiciones.
+            max_cells (int): Número máximo de celdas de cinta usadas.
+            max_log_bytes (int): Tamaño máximo del registro en bytes.
+            max_seconds (float): Tiempo de reloj máximo en segundos.
+        
+        Raises:
+            ValueError: Si algún límite es negativo.
+        """
+        for name, value in (("max_steps", max_steps), ("max_cells", max_cells),
+                            ("max_log_bytes", max_log_bytes), ("max_seconds", max_seconds)):
+            if value is not None and value < 0:
+                raise ValueError(f"Límite no válido para {name}: {value}")
+
+        self.max_steps = max_steps
+        self.max_cells = max_cells
+        self.max_log_bytes = max_log_bytes
+        self.max_seconds = max_seconds
+
+
+    def start(self, elapsed=0.0):
+        """
+        Marca el inicio de una ejecución sujeta a este presupuesto.
+        
+        Args:
+            elapsed (float): Segundos ya consumidos por la ejecución (al
+                reanudarla desde un punto de control).
+        
+        Returns:
+            BudgetClock: Reloj con el instante de inicio de la ejecución.
+        """
+        return BudgetClock(self, elapsed)
+
+
+class BudgetClock:
+    """
+    Estado de una ejecución respecto a su presupuesto.
+    
+    Attributes:
+        budget (Budget): Presupuesto aplicado.
+        started (float): Instante de inicio según time.monotonic.
+        deadline (float): Instante límite (None si no hay límite de tiempo).
+    """
+
+    def __init__(self, budget, elapsed=0.0):
+        """
+        Inicia el reloj de una ejecución.
+        
+        Args:
+            budget (Budget): Presupuesto aplicado.
+            elapsed (float): Segundos ya consumidos por la ejecución.
+        """
+        self.budget = budget
+        self.started = time.monotonic() - elapsed
+        self.deadline = None
+        if budget.max_seconds is not None:
+            self.deadline = self.started + budget.max_seconds
+
+
+    def next_check(self, steps):
+        """
+        Calcula el siguiente número de pasos en que hay que consultar check.
+        
+        Los bucles sin registro comparan su contador con este valor en lugar
+        de consultar el presupuesto en cada paso.
+        
+        Args:
+            steps (int): Pasos aplicados hasta el momento.
+        
+        Returns:
+            float: Número de pasos del siguiente control (inf si ninguno).
+        """
+        limit = float("inf")
+        if self.budget.max_steps is not None:
+            limit = self.budget.max_steps
+        if self.deadline is not None:
+            limit = min(limit, steps + CLOCK_INTERVAL)
+        return limit
+
+
+    def check(self, steps, cells, log_bytes=0):
+        """
+        Comprueba si la ejecución agotó alguno de sus recursos.
+        
+        Args:
+            steps (int): Transiciones aplicadas.
+            cells (int): Celdas de cinta usadas.
+            log_bytes (int): Bytes de registro producidos.
+        
+        Returns:
+            BudgetReport: Resumen de la ejecución abortada, o None si la
+                ejecución puede continuar.
+        """
+        budget = self.budget
+        reason = None
+
+        if budget.max_steps is not None and steps >= budget.max_steps:
+            reason = "pasos"
+        elif budget.max_cells is not None and cells > budget.max_cells:
+            reason = "celdas de cinta"
+        elif budget.max_log_bytes is not None and log_bytes > budget.max_log_bytes:
+            reason = "bytes de registro"
+        elif self.deadline is not None and time.monotonic() >= self.deadline:
+            reason = "tiempo"
+
+        if reason is None:
+            return None
+        return BudgetReport(reason, steps, cells, log_bytes, time.monotonic() - self.started)
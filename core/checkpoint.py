@@ -0,0 +1,177 @@
+"""
+Módulo para guardar y reanudar simulaciones largas.
+
+Este módulo proporciona la clase Checkpointer, que guarda periódicamente
+la configuración completa de una SimulationRun (estado, cache, cinta,
+cabezal, número de pasos y tamaño del registro escrito) en un archivo
+binario compacto, y la función load_checkpoint para leerlo. Una ejecución
+reanudada con Simulator.resume produce exactamente el mismo registro y
+el mismo resultado que una ejecución sin interrupciones.
+"""
+
+import hashlib
+import os
+import pickle
+import time
+
+
+# Versión del formato de los puntos de control; cambiarla invalida los existentes
+CHECKPOINT_VERSION = 1
+
+
+def machine_fingerprint(machine):
+    """
+    Calcula una huella de la definición de una máquina.
+    
+    Permite comprobar que un punto de control se reanuda con la misma
+    máquina que lo generó.
+    
+    Args:
+        machine (TuringMachine): Máquina simulada.
+    
+    Returns:
+        str: Hash SHA-256 en hexadecimal.
+    """
+    rules = sorted(repr(rule) for rule in machine.delta.items())
+    definition = repr((machine.initial_state, machine.final_state, machine.blank_symbol, rules))
+    return hashlib.sha256(definition.encode("utf-8")).hexdigest()
+
+
+def load_checkpoint(path):
+    """
+    Lee un punto de control guardado con Checkpointer.
+    
+    Args:
+        path (str): Ruta del archivo.
+    
+    Returns:
+        dict: Contenido del punto de control, o None si el archivo no
+            existe, está dañado o es de otra versión del formato.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError):
+        return None
+
+    if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+        return None
+    return data
+
+
+class Checkpointer:
+    """
+    Guarda puntos de control de una ejecución cada N pasos o T segundos.
+    
+    Attributes:
+        path (str): Ruta del archivo del punto de control.
+        every_steps (int): Pasos entre puntos de control (None sin límite).
+        every_seconds (float): Segundos entre puntos de control (None sin límite).
+        options (str): Descripción de las opciones de formato del registro;
+            solo se reanudan puntos de control con las mismas opciones.
+    """
+
+    def __init__(self, path, every_steps=None, every_seconds=None, options=""):
+        """
+        Inicializa el guardado periódico de puntos de control.
+        
+        Args:
+            path (str): Ruta del archivo del punto de control.
+            every_steps (int): Pasos entre puntos de control.
+            every_seconds (float): Segundos entre puntos de control.
+            options (str): Opciones de formato del registro.
+        
+        Raises:
+            ValueError: Si algún intervalo no es positivo.
+        """
+        for name, value in (("every_steps", every_steps), ("every_seconds", every_seconds)):
+            if value is not None and value <= 0:
+                raise ValueError(f"Intervalo de punto de control no válido para {name}: {value}")
+
+        self.path = path
+        self.every_steps = every_steps
+        self.every_seconds = every_seconds
+        self.options = options
+
+        self._next_step = every_steps if every_steps is not None else float("inf")
+        self._next_time = time.monotonic() + every_seconds if every_seconds is not None else None
+
+
+    def due(self, run):
+        """
+        Indica si corresponde guardar un punto de control de la ejecución.
+        
+        Solo se guardan puntos de control tras una transición (no durante
+        el encabezado del registro).
+        
+        Args:
+            run (SimulationRun): Ejecución en curso.
+        
+        Returns:
+            bool: True si se alcanzó el intervalo de pasos o de tiempo.
+        """
+        if run.steps == 0:
+            return False
+        if run.steps >= self._next_step:
+            return True
+        return self._next_time is not None and time.monotonic() >= self._next_time
+
+
+    def save(self, run):
+        """
+        Guarda la configuración actual de la ejecución.
+        
+        El registro debe estar escrito (y vaciado al disco) hasta
+        run.log_bytes antes de llamar a este método.
+        
+        Args:
+            run (SimulationRun): Ejecución en curso.
+        """
+        data = run.checkpoint()
+        data["version"] = CHECKPOINT_VERSION
+        data["options"] = self.options
+
+        # Escribir en un temporal y renombrar para no dejar puntos de control a medias
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.path)
+
+        if self.every_steps is not None:
+            self._next_step = run.steps + self.every_steps
+        if self.every_seconds is not None:
+            self._next_time = time.monotonic() + self.every_seconds
+
+
+    def load(self, simulator, input_str):
+        """
+        Busca un punto de control reanudable para una cadena.
+        
+        Args:
+            simulator (Simulator): Simulador que reanudará la ejecución.
+            input_str (str): Cadena de entrada de la ejecución.
+        
+        Returns:
+            dict: Punto de control válido para esta máquina, cadena y
+                opciones de formato, o None si no existe.
+        """
+        data = load_checkpoint(self.path)
+        if data is None:
+            return None
+        if (data["input"] != input_str or data["options"] != self.options
+                or data["machine"] != machine_fingerprint(simulator.machine)):
+            return None
+        return data
+
+
+    def clear(self):
+        """Elimina el punto de control (por ejemplo, al terminar la ejecución)."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,289 @@
+"""
+Módulo para la simulación con código generado para cada máquina.
+
+Este módulo proporciona la clase GeneratedSimulator, un motor alternativo
+que traduce la tabla compilada de una Máquina de Turing a código fuente
+Python especializado: un bloque por par (estado, cache) que ramifica sobre
+el símbolo leído, con las escrituras, los movimientos y los cambios de
+control escritos como constantes. El código se compila una sola vez con
+compile/exec y se guarda junto a la máquina, de modo que cada paso evita
+la consulta a la tabla, el desempaquetado de la entrada y las
+comprobaciones genéricas de movimiento.
+"""
+
+from core.simulation import Simulator
+from core.tape import Tape
+
+
+# Nombre de la función generada dentro de su espacio de nombres
+FUNCTION_NAME = "run"
+
+# Sangría del código generado
+INDENT = "    "
+
+
+def generate_source(machine):
+    """
+    Genera el código fuente del simulador especializado de una máquina.
+    
+    La función generada tiene la firma run(buffer, start, end, pos, grow)
+    y devuelve (aceptada, pasos, posición del cabezal). Recorre el buffer
+    de códigos de una Tape igual que run_fast: grow(pos) amplía la cinta
+    hasta incluir pos y devuelve el nuevo cursor, los bucles de barrido
+    avanzan toda la racha de celdas de una vez y, al aceptar, el cabezal
+    queda donde lo dejó el último movimiento, sin ampliar la cinta.
+    
+    Args:
+        machine (TuringMachine): Máquina de Turing a traducir.
+    
+    Returns:
+        str: Código fuente de la función.
+    """
+    compiled = machine.compile()
+    n_symbols = compiled.n_symbols
+
+    # Reglas agrupadas por base en orden de definición; la base inicial y
+    # las de destino tienen bloque aunque no tengan reglas (rechazan)
+    blocks = {compiled.initial_base: []}
+    for slot, entry in enumerate(compiled.table):
+        if entry is None:
+            continue
+        blocks.setdefault(slot - slot % n_symbols, []).append((slot % n_symbols, entry))
+        if not entry[3]:
+            blocks.setdefault(entry[0], [])
+
+    for rules in blocks.values():
+        rules.sort(key=lambda item: item[1][4])
+
+    lines = [
+        f"def {FUNCTION_NAME}(buffer, start, end, pos, grow):",
+        "    steps = 0",
+        f"    control = {compiled.initial_base}",
+        "    while True:",
+    ]
+
+    for number, (base, rules) in enumerate(blocks.items()):
+        state, cache = compiled.decode(base)
+        keyword = "if" if number == 0 else "elif"
+        lines.append(f"        {keyword} control == {base}:")
+        lines.append(f"            # [{state!r}, {cache!r}]")
+        lines.append("            while True:")
+        lines.append("                symbol = buffer[pos]")
+
+        # Los símbolos de un mismo bucle de barrido comparten una rama
+        sweeps = {}
+        for code, entry in rules:
+            if entry[5] is not None:
+                sweeps.setdefault(entry[5], []).append(code)
+
+        for index, (code, entry) in enumerate(rules):
+            keyword = "if" if index == 0 else "elif"
+            sweep = entry[5]
+            if sweep is None:
+                lines.append(f"                {keyword} symbol == {code}:")
+            elif code == sweeps[sweep][0]:
+                condition = " or ".join(f"symbol == {other}" for other in sweeps[sweep])
+                lines.append(f"                {keyword} {condition}:")
+            else:
+                continue
+            lines.extend(_rule_lines(compiled, base, code, entry, INDENT * 5))
+
+        lines.append("                return False, steps, pos")
+
+    return "\n".join(lines) + "\n"
+
+
+def _rule_lines(compiled, base, code, entry, indent):
+    """
+    Genera el cuerpo de la rama de una transición.
+    
+    Función privada de generate_source.
+    
+    Args:
+        compiled (CompiledMachine): Tabla compilada de la máquina.
+        base (int): Base del bloque que contiene la rama.
+        code (int): Código del símbolo leído.
+        entry (tuple): Entrada de la tabla compilada.
+        indent (str): Sangría del cuerpo.
+    
+    Returns:
+        list: Líneas de código de la rama.
+    """
+    next_base, tape_output, movement, accepts, rule, sweep = entry
+    (state, cache, symbol), (new_state, new_cache, output, move) = compiled.rules[rule]
+
+    if sweep is None:
+        lines = [f"# δ({state!r}, {cache!r}, {symbol!r}) = ({new_state!r}, {new_cache!r}, {output!r}, {move!r})"]
+    else:
+        symbols = ", ".join(repr(compiled.symbols[other]) for other in sweep)
+        lines = [f"# δ({state!r}, {cache!r}, x) = ({new_state!r}, {new_cache!r}, x, {move!r}) con x en {symbols}"]
+
+    if movement > 0:
+        bound = "pos == end"
+    else:
+        bound = "pos < start"
+
+    if sweep is not None:
+        # Bucle de barrido: recorrer de una vez la racha de celdas
+        if movement > 0:
+            lines.append("cells = buffer[pos:end]")
+            lines.append(f"run = len(cells) - len(cells.lstrip({sweep!r}))")
+            lines.append("pos += run")
+        else:
+            lines.append("cells = buffer[start:pos + 1]")
+            lines.append(f"run = len(cells) - len(cells.rstrip({sweep!r}))")
+            lines.append("pos -= run")
+        lines.append("steps += run")
+        lines.append(f"if {bound}:")
+        lines.append(f"{INDENT}buffer, start, end, pos = grow(pos)")
+        lines.append("continue")
+        return [indent + line for line in lines]
+
+    if tape_output != code:
+        lines.append(f"buffer[pos] = {tape_output}")
+    if movement > 0:
+        lines.append("pos += 1")
+    elif movement < 0:
+        lines.append("pos -= 1")
+    lines.append("steps += 1")
+
+    if accepts:
+        lines.append("return True, steps, pos")
+        return [indent + line for line in lines]
+
+    if movement:
+        lines.append(f"if {bound}:")
+        lines.append(f"{INDENT}buffer, start, end, pos = grow(pos)")
+
+    if next_base == base:
+        lines.append("continue")
+    else:
+        lines.append(f"control = {next_base}")
+        lines.append("break")
+    return [indent + line for line in lines]
+
+
+class GeneratedMachine:
+    """
+    Simulador especializado de una máquina, compilado desde su código fuente.
+    
+    Al serializarse (por ejemplo, en la caché de máquinas compiladas o al
+    enviarse a los procesos de trabajo) solo se guarda el código fuente; la
+    función se vuelve a compilar al cargarlo, sin repetir la generación.
+    
+    Attributes:
+        source (str): Código fuente generado.
+        function (function): Función compilada desde source.
+    """
+
+    def __init__(self, machine):
+        """
+        Genera y compila el simulador especializado de una máquina.
+        
+        Args:
+            machine (TuringMachine): Máquina de Turing a traducir.
+        """
+        self.source = generate_source(machine)
+        self.function = self._build(self.source)
+
+
+    @staticmethod
+    def _build(source):
+        """
+        Compila el código fuente generado.
+        
+        Args:
+            source (str): Código fuente de la función.
+        
+        Returns:
+            function: Función definida por el código.
+        """
+        namespace = {}
+        exec(compile(source, "<máquina generada>", "exec"), namespace)
+        return namespace[FUNCTION_NAME]
+
+
+    def __getstate__(self):
+        """
+        Devuelve el estado serializable (solo el código fuente).
+        
+        Returns:
+            dict: Estado del objeto sin la función compilada.
+        """
+        return {"source": self.source}
+
+
+    def __setstate__(self, state):
+        """
+        Restaura el objeto compilando de nuevo el código fuente.
+        
+        Args:
+            state (dict): Estado devuelto por __getstate__.
+        """
+        self.source = state["source"]
+        self.function = self._build(self.source)
+
+
+class GeneratedSimulator:
+    """
+    Ejecuta la Máquina de Turing con su simulador de código generado.
+    
+    El resultado de run es intercambiable con Simulator.run_fast: mismo
+    veredicto, misma cinta final y el mismo número de pasos elementales.
+    
+    Attributes:
+        machine (TuringMachine): Máquina de Turing a simular.
+    """
+
+    def __init__(self, machine):
+        """
+        Prepara el simulador, generando el código de la máquina si hace falta.
+        
+        Args:
+            machine (TuringMachine): Máquina de Turing a simular.
+        """
+        self.machine = machine
+        self._function = machine.generate().function
+
+
+    @property
+    def source(self):
+        """
+        Código fuente del simulador especializado.
+        
+        Returns:
+            str: Código generado para la máquina.
+        """
+        return self.machine.generate().source
+
+
+    def run(self, input_str):
+        """
+        Ejecuta la simulación sin registro sobre una cadena de entrada.
+        
+        Args:
+            input_str (str): Cadena de entrada a procesar por la máquina.
+        
+        Returns:
+            tuple: (aceptada, pasos, tape), con el mismo significado que en
+                Simulator.run_fast.
+        """
+        compiled = self.machine.compile()
+        tape = Tape(input_str, blank_symbol=self.machine.blank_symbol, symbols=compiled.symbols)
+
+        # Los barridos del código generado operan sobre códigos de un byte
+        if type(tape.cursor()[0]) is not bytearray:
+            return Simulator(self.machine).run_fast(input_str)
+
+        def grow(pos):
+            tape.seek(pos)
+            tape.read()
+            return tape.cursor()
+
+        buffer, start, end, pos = tape.cursor()
+        if not start <= pos < end:
+            buffer, start, end, pos = grow(pos)
+
+        accepted, steps, pos = self._function(buffer, start, end, pos, grow)
+        tape.seek(pos)
+        return accepted, steps, tape
@@ -0,0 +1,247 @@
+"""
+Módulo para el acceso aleatorio a las configuraciones de una simulación.
+
+Este módulo proporciona la clase RunHistory, que permite consultar la
+configuración de la máquina en cualquier paso de una simulación sin
+conservar el registro completo. Mientras avanza, la simulación guarda una
+copia de la configuración cada cierto número de pasos; una consulta parte
+de la copia más cercana y repite a lo sumo ese número de pasos, de modo
+que su costo depende del intervalo y no del número de paso. Los últimos
+pasos aplicados se guardan además como registros de deshacer, con los que
+la simulación puede retroceder paso a paso.
+"""
+
+from collections import deque, namedtuple
+
+from core.rendering import IDRenderer
+from core.stepper import Stepper
+from core.tape import Tape
+
+
+# Pasos entre configuraciones guardadas
+DEFAULT_INTERVAL = 1 << 12
+
+# Pasos recientes que pueden deshacerse sin volver a una configuración guardada
+DEFAULT_UNDO_DEPTH = 1 << 12
+
+
+# Configuración de la máquina tras step pasos: estado, cache, copia de la
+# cinta e ID formal (con la ventana del simulador), igual a la ID posterior
+# del paso step en el registro (o la ID inicial si step es 0)
+Configuration = namedtuple("Configuration", ["step", "state", "cache", "tape", "id"])
+
+
+class RunHistory:
+    """
+    Historial navegable de la simulación de una cadena.
+    
+    Avanza y retrocede con un Stepper sobre la tabla compilada de la
+    máquina, que conserva los registros de deshacer de los pasos
+    recientes. La simulación avanza solo hasta el paso más lejano
+    consultado, por lo que el historial sirve también para máquinas que
+    no se detienen.
+    
+    Attributes:
+        simulator (Simulator): Simulador de la máquina.
+        input_str (str): Cadena de entrada simulada.
+        interval (int): Pasos entre configuraciones guardadas.
+        step (int): Paso de la configuración actual.
+        length (int): Pasos totales de la simulación, o None mientras no
+            se haya alcanzado su final.
+        accepted (bool): Veredicto de la simulación, o None mientras no se
+            haya alcanzado su final.
+    """
+
+    def __init__(self, simulator, input_str, interval=DEFAULT_INTERVAL, undo_depth=DEFAULT_UNDO_DEPTH):
+        """
+        Prepara el historial en la configuración inicial.
+        
+        Args:
+            simulator (Simulator): Simulador de la máquina.
+            input_str (str): Cadena de entrada a simular.
+            interval (int): Pasos entre configuraciones guardadas.
+            undo_depth (int): Pasos recientes que pueden deshacerse.
+        
+        Raises:
+            ValueError: Si el intervalo no es positivo o la profundidad de
+                deshacer es negativa.
+        """
+        if interval < 1:
+            raise ValueError(f"Intervalo de historial no válido: {interval}")
+        if undo_depth < 0:
+            raise ValueError(f"Profundidad de deshacer no válida: {undo_depth}")
+
+        self.simulator = simulator
+        self.input_str = input_str
+        self.interval = interval
+
+        machine = simulator.machine
+        self._compiled = machine.compile()
+        self._undo_depth = undo_depth
+        self._stepper = Stepper(
+            self._compiled,
+            Tape(input_str, blank_symbol=machine.blank_symbol, symbols=self._compiled.symbols),
+            self._compiled.initial_base,
+            undo=deque(maxlen=undo_depth)
+        )
+
+        self.step = 0
+        self.length = None
+        self.accepted = None
+
+        # Configuración guardada k: la del paso k * interval
+        self._snapshots = [self._save()]
+
+
+    def _save(self):
+        """
+        Copia la configuración actual.
+        
+        Método privado usado para las configuraciones guardadas.
+        
+        Returns:
+            tuple: (base, códigos de las celdas usadas, cabezal, origen).
+        """
+        tape = self._stepper.tape
+        buffer, start, end, _ = tape.cursor()
+        return self._stepper.base, buffer[start:end], tape.head, tape.origin
+
+
+    def _restore(self, index):
+        """
+        Vuelve a una configuración guardada.
+        
+        Método privado. Los registros de deshacer se descartan, ya que
+        corresponden a pasos posteriores a la configuración restaurada.
+        
+        Args:
+            index (int): Índice de la configuración guardada.
+        """
+        base, codes, head, origin = self._snapshots[index]
+        tape = self._stepper.tape
+        self.step = index * self.interval
+        self._stepper = Stepper(
+            self._compiled,
+            Tape.from_codes(codes, tape.symbols, head=head, origin=origin, blank_symbol=tape.blank_symbol),
+            base, self.step, undo=deque(maxlen=self._undo_depth)
+        )
+
+
+    def _advance(self, target):
+        """
+        Aplica pasos hasta llegar al paso target o al final de la simulación.
+        
+        Método privado. Avanza el Stepper por tramos que terminan en el
+        siguiente múltiplo del intervalo y, al alcanzarlo por primera vez,
+        guarda la configuración.
+        
+        Args:
+            target (int): Paso a alcanzar.
+        """
+        stepper = self._stepper
+        snapshots = self._snapshots
+
+        while stepper.steps < target:
+            # Las configuraciones guardadas cubren todos los pasos alcanzados
+            next_snapshot = len(snapshots) * self.interval
+            finished = stepper.advance(min(target, next_snapshot))
+
+            if stepper.steps == next_snapshot:
+                snapshots.append(self._save())
+
+            if finished:
+                self.length, self.accepted = stepper.steps, stepper.accepted
+                break
+
+        self.step = stepper.steps
+
+
+    def seek(self, step):
+        """
+        Lleva el historial a la configuración de un paso.
+        
+        Usa el camino más corto entre deshacer pasos recientes, avanzar desde
+        la configuración actual y repetir desde la configuración guardada
+        más cercana; salvo la primera vez que se alcanza un paso, el costo
+        está acotado por el intervalo.
+        
+        Args:
+            step (int): Paso a alcanzar.
+        
+        Raises:
+            IndexError: Si el paso es negativo o posterior al final de la
+                simulación.
+        """
+        if step < 0 or (self.length is not None and step > self.length):
+            raise IndexError(f"La simulación no tiene el paso {step}")
+
+        if step < self.step and self.step - step <= len(self._stepper.undo):
+            while self.step > step:
+                self._stepper.undo_step()
+                self.step -= 1
+            return
+
+        nearest = min(step // self.interval, len(self._snapshots) - 1)
+        if not nearest * self.interval <= self.step <= step:
+            self._restore(nearest)
+
+        self._advance(step)
+        if self.step < step:
+            raise IndexError(f"La simulación no tiene el paso {step} (termina en el paso {self.length})")
+
+
+    def forward(self, count=1):
+        """
+        Avanza la simulación.
+        
+        Args:
+            count (int): Pasos a avanzar.
+        
+        Returns:
+            Configuration: Configuración alcanzada.
+        
+        Raises:
+            IndexError: Si la simulación termina antes.
+        """
+        self.seek(self.step + count)
+        return self.configuration()
+
+
+    def back(self, count=1):
+        """
+        Retrocede la simulación.
+        
+        Los pasos recientes se deshacen directamente; más atrás, la
+        configuración se reconstruye desde la configuración guardada más
+        cercana.
+        
+        Args:
+            count (int): Pasos a retroceder.
+        
+        Returns:
+            Configuration: Configuración alcanzada.
+        
+        Raises:
+            IndexError: Si el paso resultante es negativo.
+        """
+        self.seek(self.step - count)
+        return self.configuration()
+
+
+    def configuration(self):
+        """
+        Describe la configuración actual.
+        
+        Returns:
+            Configuration: Paso, estado, cache, copia de la cinta e ID.
+        """
+        tape = self._stepper.tape
+        buffer, start, end, _ = tape.cursor()
+        copy = Tape.from_codes(
+            buffer[start:end], tape.symbols, head=tape.head, origin=tape.origin,
+            blank_symbol=tape.blank_symbol
+        )
+
+        state, cache = self._compiled.decode(self._stepper.base)
+        id_str = IDRenderer(copy, window=self.simulator.id_window).render(copy, state, cache)
+        return Configuration(self.step, state, cache, copy, id_str)
@@ -0,0 +1,213 @@
+"""
+Módulo para la detección de ciclos en simulaciones que no se detienen.
+
+Este módulo proporciona la clase LoopDetector, que mantiene un hash
+incremental (estilo Zobrist) de la configuración completa de la máquina
+(estado, cache, posición del cabezal y contenido de la cinta) y aplica el
+algoritmo de Brent para detectar cuándo una configuración se repite. Como
+la máquina es determinista, repetir una configuración implica que nunca
+se detendrá, por lo que la cadena puede rechazarse de inmediato.
+"""
+
+from collections import namedtuple
+
+from core.tape import Tape
+
+
+# Ciclo detectado: la configuración del paso start se repite cada length
+# pasos; steps es el número de pasos aplicados al detectarlo
+LoopReport = namedtuple("LoopReport", ["start", "length", "steps"])
+
+
+def cell_hash(position, code):
+    """
+    Calcula la contribución de una celda al hash de la configuración.
+    
+    Las celdas en blanco (código 0) no contribuyen, de modo que expandir la
+    cinta no cambia el hash.
+    
+    Args:
+        position (int): Posición absoluta de la celda (0 es el inicio de la entrada).
+        code (int): Código del símbolo de la celda.
+    
+    Returns:
+        int: Contribución de la celda (0 para el blanco).
+    """
+    return hash((position, code)) if code else 0
+
+
+class LoopDetector:
+    """
+    Detecta configuraciones repetidas mediante hashing incremental.
+    
+    El hash de la cinta es el XOR de las contribuciones de sus celdas no
+    blancas y se actualiza en O(1) en cada escritura. Junto al hash se
+    guarda el control, que identifica el par (estado, cache), y la posición
+    del cabezal. Siguiendo el algoritmo de Brent, se guarda la configuración
+    de los pasos 1, 2, 4, 8... y se compara la actual con la última
+    guardada; si el hash, el control y el cabezal coinciden, se confirma la
+    igualdad comparando el contenido real de la cinta.
+    
+    Attributes:
+        tape (Tape): Cinta observada.
+        cells (int): Hash actual del contenido de la cinta.
+    """
+
+    def __init__(self, tape, control, head, steps=0):
+        """
+        Inicializa el detector con la configuración inicial.
+        
+        Args:
+            tape (Tape): Cinta observada.
+            control: Valor hashable que identifica el par (estado, cache) inicial.
+            head (int): Posición absoluta inicial del cabezal.
+            steps (int): Pasos ya aplicados en la configuración inicial.
+        """
+        self.tape = tape
+
+        self.cells = 0
+        for position, code in tape.non_blank():
+            self.cells ^= cell_hash(position, code)
+
+        self._power = 1
+        self._save(steps, control, head)
+
+
+    def _save(self, steps, control, head):
+        """
+        Guarda la configuración actual como referencia para comparar.
+        
+        Args:
+            steps (int): Pasos aplicados hasta el momento.
+            control: Identificador del par (estado, cache) actual.
+            head (int): Posición absoluta del cabezal.
+        """
+        self._saved = (self.cells, control, head)
+        self._saved_signature = self.tape.signature()
+        self._saved_step = steps
+
+
+    def state(self):
+        """
+        Devuelve la referencia guardada para reanudar la detección.
+        
+        El hash de las celdas solo combina enteros, por lo que es el mismo
+        en cualquier proceso y puede guardarse en un punto de control.
+        
+        Returns:
+            tuple: (referencia, firma de la cinta, paso, potencia) de la
+                última configuración guardada.
+        """
+        return self._saved, self._saved_signature, self._saved_step, self._power
+
+
+    @classmethod
+    def restore(cls, tape, state):
+        """
+        Reconstruye un detector a partir de una cinta y de state().
+        
+        Args:
+            tape (Tape): Cinta observada, en la configuración a reanudar.
+            state (tuple): Valor devuelto por state() en la ejecución original.
+        
+        Returns:
+            LoopDetector: Detector equivalente al original.
+        """
+        saved, signature, step, power = state
+        detector = cls(tape, saved[1], saved[2])
+        detector._saved = tuple(saved)
+        detector._saved_signature = tuple(signature)
+        detector._saved_step = step
+        detector._power = power
+        return detector
+
+
+    def write(self, position, old_code, new_code):
+        """
+        Registra la escritura de un símbolo en la cinta.
+        
+        Args:
+            position (int): Posición absoluta de la celda escrita.
+            old_code (int): Código del símbolo anterior.
+            new_code (int): Código del símbolo escrito.
+        """
+        if old_code != new_code:
+            self.cells ^= cell_hash(position, old_code) ^ cell_hash(position, new_code)
+
+
+    def observe(self, steps, control, head):
+        """
+        Compara la configuración actual con la última guardada.
+        
+        Args:
+            steps (int): Pasos aplicados hasta el momento.
+            control: Identificador del par (estado, cache) actual.
+            head (int): Posición absoluta del cabezal.
+        
+        Returns:
+            int: Longitud del ciclo si la configuración actual repite la
+                guardada, o None si aún no se detecta un ciclo.
+        """
+        if (self.cells, control, head) == self._saved:
+            if self.tape.signature() == self._saved_signature:
+                return steps - self._saved_step
+
+        if steps - self._saved_step == self._power:
+            self._save(steps, control, head)
+            self._power *= 2
+
+        return None
+
+
+def find_cycle_start(machine, input_str, length):
+    """
+    Calcula el primer paso desde el que la simulación se repite.
+    
+    Repite la simulación desde el inicio con dos cintas, una adelantada
+    length pasos respecto a la otra, y las avanza a la par hasta que sus
+    configuraciones coinciden. El costo es proporcional al inicio del ciclo
+    más su longitud.
+    
+    Args:
+        machine (TuringMachine): Máquina simulada.
+        input_str (str): Cadena de entrada de la simulación.
+        length (int): Longitud del ciclo detectado.
+    
+    Returns:
+        int: Paso en el que empieza el ciclo.
+    """
+    delta = machine.delta
+
+    def start_runner():
+        tape = Tape(input_str, blank_symbol=machine.blank_symbol)
+        control = (machine.initial_state, None)
+        return [tape, control, LoopDetector(tape, control, 0)]
+
+    def advance(runner):
+        tape, (state, cache), detector = runner
+        symbol = tape.read()
+        new_state, new_cache, tape_output, movement = delta[(state, cache, symbol)]
+
+        detector.write(tape.head - tape.origin, tape.code(symbol), tape.code(tape_output))
+        tape.write(tape_output)
+        tape.move(movement)
+        runner[1] = (new_state, new_cache)
+
+    def configuration(runner):
+        tape, control, detector = runner
+        head = tape.head - tape.origin
+        return detector.cells, control, head
+
+    behind, ahead = start_runner(), start_runner()
+    for _ in range(length):
+        advance(ahead)
+
+    start = 0
+    while True:
+        if configuration(behind) == configuration(ahead):
+            if behind[0].signature() == ahead[0].signature():
+                return start
+
+        advance(behind)
+        advance(ahead)
+        start += 1
@@ -0,0 +1,264 @@
+"""
+Módulo para la simulación por bloques de Máquinas de Turing.
+
+Este módulo proporciona la clase MacroSimulator, un motor alternativo que
+divide la cinta en bloques de k celdas y memoriza el efecto de entrar en
+un bloque con un par (estado, cache) dado. Para entradas grandes, las
+mismas combinaciones de bloque y estado se repiten muchas veces, de modo
+que la mayoría de los recorridos de un bloque se reproducen desde la
+memoria en lugar de simularse celda por celda.
+"""
+
+from collections import OrderedDict
+
+from core.simulation import Simulator
+from core.tape import Tape
+
+
+# Tamaño de bloque (celdas) y capacidad de la memoria por defecto
+DEFAULT_BLOCK_SIZE = 32
+DEFAULT_CACHE_SIZE = 65536
+
+# Formas en que termina el recorrido de un bloque
+EXIT_LEFT = 0
+EXIT_RIGHT = 1
+ACCEPT = 2
+REJECT = 3
+
+
+class MacroSimulator:
+    """
+    Ejecuta la Máquina de Turing como una macro-máquina de bloques.
+    
+    Cada macro-paso toma el bloque bajo el cabezal, el par (estado, cache)
+    y la celda de entrada, y aplica su resultado memorizado: el nuevo
+    contenido del bloque, el lado por el que sale el cabezal (o si la
+    máquina se detiene dentro), el nuevo par (estado, cache) y el número
+    de pasos elementales. La memoria tiene un tamaño máximo y descarta los
+    resultados usados hace más tiempo (LRU).
+    
+    El resultado de run es intercambiable con Simulator.run_string y
+    Simulator.run_fast: mismo veredicto, misma cinta final y el número
+    exacto de pasos elementales.
+    
+    Attributes:
+        machine (TuringMachine): Máquina de Turing a simular.
+        block_size (int): Número de celdas por bloque.
+        cache_size (int): Número máximo de resultados memorizados.
+        hits (int): Recorridos de bloque reproducidos desde la memoria.
+        misses (int): Recorridos de bloque simulados celda por celda.
+        evictions (int): Resultados descartados por falta de espacio.
+    """
+
+    def __init__(self, machine, block_size=DEFAULT_BLOCK_SIZE, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        Inicializa el motor de bloques para una Máquina de Turing.
+        
+        Args:
+            machine (TuringMachine): Máquina de Turing a simular.
+            block_size (int): Número de celdas por bloque.
+            cache_size (int): Número máximo de resultados memorizados.
+        
+        Raises:
+            ValueError: Si el tamaño de bloque o de la memoria no es positivo.
+        """
+        if block_size < 1:
+            raise ValueError(f"Tamaño de bloque no válido: {block_size}")
+        if cache_size < 1:
+            raise ValueError(f"Tamaño de memoria no válido: {cache_size}")
+
+        self.machine = machine
+        self.block_size = block_size
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def hit_rate(self):
+        """
+        Calcula la proporción de recorridos de bloque servidos por la memoria.
+        
+        Returns:
+            float: Aciertos entre consultas totales (0.0 si no hubo consultas).
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+    def cache_stats(self):
+        """
+        Resume el uso de la memoria de bloques.
+        
+        Returns:
+            dict: Aciertos, fallos, descartes, entradas actuales y tasa de
+                aciertos acumulados desde la creación del motor.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._cache),
+            "hit_rate": self.hit_rate(),
+        }
+
+
+    def run(self, input_str):
+        """
+        Ejecuta la simulación por bloques sobre una cadena de entrada.
+        
+        Args:
+            input_str (str): Cadena de entrada a procesar por la máquina.
+        
+        Returns:
+            tuple: (aceptada, pasos, tape), con el mismo significado que en
+                Simulator.run_fast.
+        """
+        compiled = self.machine.compile()
+        codes = compiled.symbol_codes
+
+        # Los bloques se guardan como bytes; sin códigos de un byte, o con
+        # símbolos ajenos a la máquina, se usa el simulador sin registro
+        if compiled.n_symbols > 256 or any(sym not in codes for sym in input_str):
+            return Simulator(self.machine).run_fast(input_str)
+
+        k = self.block_size
+        blank_block = bytes(k)
+
+        cells = bytes(codes[sym] for sym in input_str)
+        blocks = {
+            index: cells[index * k:(index + 1) * k].ljust(k, b"\0")
+            for index in range(-(-len(cells) // k))
+        }
+
+        # Rango de celdas usadas: la entrada más toda celda leída
+        low, high = 0, len(cells) - 1
+
+        block = 0
+        offset = 0
+        base = compiled.initial_base
+        steps = 0
+
+        while True:
+            contents = blocks.get(block, blank_block)
+            new_contents, outcome, base, offset, block_steps, first, last = \
+                self._lookup(compiled, base, contents, offset)
+
+            blocks[block] = new_contents
+            steps += block_steps
+
+            cell = block * k
+            if cell + first < low:
+                low = cell + first
+            if cell + last > high:
+                high = cell + last
+
+            if outcome == EXIT_RIGHT:
+                block += 1
+                offset = 0
+            elif outcome == EXIT_LEFT:
+                block -= 1
+                offset = k - 1
+            else:
+                break
+
+        final = bytearray()
+        for index in range(low // k, high // k + 1):
+            final += blocks.get(index, blank_block)
+        final = final[low - (low // k) * k:][:high - low + 1]
+
+        tape = Tape.from_codes(
+            final, compiled.symbols,
+            head=block * k + offset - low,
+            origin=-low,
+            blank_symbol=self.machine.blank_symbol
+        )
+        return outcome == ACCEPT, steps, tape
+
+
+    def _lookup(self, compiled, base, contents, offset):
+        """
+        Obtiene el resultado de recorrer un bloque, memorizándolo si es nuevo.
+        
+        Método privado que consulta la memoria LRU y, en caso de fallo,
+        simula el bloque celda por celda.
+        
+        Args:
+            compiled (CompiledMachine): Tabla compilada de la máquina.
+            base (int): Base de la tabla del par (estado, cache) de entrada.
+            contents (bytes): Contenido del bloque.
+            offset (int): Celda del bloque en la que está el cabezal.
+        
+        Returns:
+            tuple: (contenido, salida, base, celda, pasos, primera, última)
+                donde salida es EXIT_LEFT, EXIT_RIGHT, ACCEPT o REJECT, celda
+                es la posición final del cabezal relativa al bloque y
+                primera/última delimitan las celdas leídas.
+        """
+        key = (base, contents, offset)
+        cache = self._cache
+
+        result = cache.get(key)
+        if result is not None:
+            self.hits += 1
+            cache.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = self._simulate_block(compiled.table, base, contents, offset)
+
+        cache[key] = result
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+            self.evictions += 1
+
+        return result
+
+
+    def _simulate_block(self, table, base, contents, offset):
+        """
+        Simula la máquina dentro de un bloque hasta que el cabezal sale o se detiene.
+        
+        Método privado que aplica la tabla compilada sobre una copia del
+        bloque.
+        
+        Args:
+            table (list): Tabla plana de transiciones compilada.
+            base (int): Base de la tabla del par (estado, cache) de entrada.
+            contents (bytes): Contenido del bloque.
+            offset (int): Celda del bloque en la que está el cabezal.
+        
+        Returns:
+            tuple: Resultado del recorrido con el formato de _lookup.
+        """
+        cells = bytearray(contents)
+        k = len(cells)
+        pos = offset
+        first = last = offset
+        steps = 0
+
+        while True:
+            if pos < first:
+                first = pos
+            elif pos > last:
+                last = pos
+
+            entry = table[base + cells[pos]]
+
+            if entry is None:
+                return bytes(cells), REJECT, base, pos, steps, first, last
+
+            base, tape_output, movement, accepts, _, _ = entry
+
+            cells[pos] = tape_output
+            pos += movement
+            steps += 1
+
+            if accepts:
+                return bytes(cells), ACCEPT, base, pos, steps, first, last
+            if pos < 0:
+                return bytes(cells), EXIT_LEFT, base, pos, steps, first, last
+            if pos >= k:
+                return bytes(cells), EXIT_RIGHT, base, pos, steps, first, last
@@ -0,0 +1,392 @@
+"""
+Módulo para la escritura de los registros de simulación.
+
+Este módulo proporciona la clase BufferedTraceWriter, que acumula el texto
+del registro en bloques grandes y los escribe (y comprime, si corresponde)
+en un hilo en segundo plano con una cola acotada, de modo que el hilo que
+simula no espera al disco. También proporciona ResultArchive, que reúne
+los registros de todas las cadenas de una ejecución en un único archivo
+ZIP o SQLite en lugar de un archivo por cadena.
+"""
+
+import gzip
+import lzma
+import os
+import queue
+import shutil
+import sqlite3
+import threading
+import zipfile
+import zlib
+
+
+# Tamaño por defecto de cada bloque escrito por el hilo de escritura
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+# Bloques que pueden esperar en la cola antes de bloquear al simulador
+DEFAULT_QUEUE_SIZE = 8
+
+# Compresiones disponibles: nombre -> extensión del archivo
+COMPRESSIONS = {None: "", "gzip": ".gz", "lzma": ".xz"}
+
+# Formatos de archivo único disponibles: nombre -> extensión del archivo
+ARCHIVES = {"zip": ".zip", "sqlite": ".sqlite"}
+
+
+def compressed_path(path, compression=None):
+    """
+    Calcula la ruta real de un registro según su compresión.
+    
+    Args:
+        path (str): Ruta del registro sin comprimir.
+        compression (str): None, "gzip" o "lzma".
+    
+    Returns:
+        str: Ruta con la extensión de la compresión.
+    
+    Raises:
+        ValueError: Si la compresión no es válida.
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Compresión no válida: {compression}")
+    return path + COMPRESSIONS[compression]
+
+
+def open_compressed(path, compression=None):
+    """
+    Abre un archivo binario de escritura con la compresión indicada.
+    
+    Args:
+        path (str): Ruta del archivo (ya con su extensión).
+        compression (str): None, "gzip" o "lzma".
+    
+    Returns:
+        Archivo binario abierto para escritura.
+    
+    Raises:
+        ValueError: Si la compresión no es válida.
+    """
+    if compression is None:
+        return open(path, "wb")
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == "lzma":
+        return lzma.open(path, "wb")
+    raise ValueError(f"Compresión no válida: {compression}")
+
+
+class BufferedTraceWriter:
+    """
+    Escribe texto en un archivo binario desde un hilo en segundo plano.
+    
+    El texto se acumula hasta unos buffer_size caracteres y se codifica en
+    UTF-8 como un único bloque, que se entrega por una cola acotada a un
+    hilo que lo escribe en el archivo. Si el hilo falla, el error se relanza
+    en la siguiente llamada a write, flush o close.
+    
+    Attributes:
+        stream: Archivo binario de destino (se cierra al cerrar el escritor).
+        buffer_size (int): Caracteres acumulados antes de entregar un bloque.
+    """
+
+    def __init__(self, stream, buffer_size=DEFAULT_BUFFER_SIZE, queue_size=DEFAULT_QUEUE_SIZE):
+        """
+        Inicia el hilo de escritura.
+        
+        Args:
+            stream: Archivo binario de destino.
+            buffer_size (int): Caracteres acumulados antes de entregar un bloque.
+            queue_size (int): Bloques que pueden esperar en la cola.
+        """
+        self.stream = stream
+        self.buffer_size = buffer_size
+
+        self._pending = []
+        self._pending_size = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._thread = threading.Thread(target=self._drain, name="trace-writer", daemon=True)
+        self._thread.start()
+
+
+    def __enter__(self):
+        """Permite usar el escritor en un bloque with."""
+        return self
+
+
+    def __exit__(self, exc_type, exc, traceback):
+        """Cierra el escritor al salir del bloque with."""
+        self.close()
+
+
+    def _drain(self):
+        """
+        Escribe en el archivo los bloques recibidos por la cola.
+        
+        Método privado ejecutado por el hilo de escritura. Un bloque None
+        indica el final; un evento pide confirmar que todo lo anterior ya
+        se escribió.
+        """
+        while True:
+            block = self._queue.get()
+            try:
+                if block is None:
+                    return
+                if isinstance(block, threading.Event):
+                    if self._error is None:
+                        self.stream.flush()
+                    block.set()
+                elif self._error is None:
+                    self.stream.write(block)
+            except Exception as error:  # se relanza en el hilo que escribe
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+
+    def _check(self):
+        """Relanza en el hilo que escribe el error del hilo de escritura."""
+        if self._error is not None:
+            raise self._error
+
+
+    def _submit(self):
+        """Entrega a la cola el texto acumulado como un único bloque."""
+        if self._pending:
+            self._queue.put("".join(self._pending).encode("utf-8"))
+            self._pending = []
+            self._pending_size = 0
+
+
+    def write(self, text):
+        """
+        Agrega texto al registro.
+        
+        Args:
+            text (str): Texto a escribir.
+        """
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if self._pending_size >= self.buffer_size:
+            self._check()
+            self._submit()
+
+
+    def flush(self):
+        """
+        Espera a que todo el texto escrito hasta ahora llegue al archivo.
+        """
+        self._submit()
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        self._check()
+
+
+    def close(self):
+        """Escribe lo pendiente, detiene el hilo y cierra el archivo."""
+        if self._thread is None:
+            return
+
+        self._submit()
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+        self.stream.close()
+        self._check()
+
+
+class _SQLiteMember:
+    """
+    Registro de una cadena dentro de un ResultArchive en SQLite.
+    
+    Cada escritura se guarda como un fragmento (comprimido si el archivo
+    usa compresión) para no mantener el registro completo en memoria.
+    """
+
+    def __init__(self, archive, name):
+        """
+        Prepara el registro reemplazando uno anterior con el mismo nombre.
+        
+        Args:
+            archive (ResultArchive): Archivo que contiene el registro.
+            name (str): Nombre del registro.
+        """
+        self._archive = archive
+        self._name = name
+        self._seq = 0
+        archive._connection.execute("DELETE FROM traces WHERE name = ?", (name,))
+
+
+    def write(self, data):
+        """Guarda un fragmento del registro."""
+        self._archive._connection.execute(
+            "INSERT INTO traces VALUES (?, ?, ?)",
+            (self._name, self._seq, self._archive._compress(data))
+        )
+        self._seq += 1
+
+
+    def flush(self):
+        """Confirma los fragmentos guardados."""
+        self._archive._connection.commit()
+
+
+    def close(self):
+        """Confirma los fragmentos guardados."""
+        self._archive._connection.commit()
+
+
+class ResultArchive:
+    """
+    Archivo único con los registros de todas las cadenas de una ejecución.
+    
+    En formato "zip" cada registro es un miembro del ZIP (comprimido con
+    deflate si la compresión es gzip o con LZMA si es lzma). En formato
+    "sqlite" cada registro se guarda en la tabla traces como fragmentos
+    ordenados. Solo puede haber un registro abierto a la vez.
+    
+    Attributes:
+        path (str): Ruta del archivo.
+        kind (str): "zip" o "sqlite".
+        compression (str): None, "gzip" o "lzma".
+    """
+
+    def __init__(self, path, kind, compression=None):
+        """
+        Crea (o reemplaza) el archivo.
+        
+        Args:
+            path (str): Ruta del archivo.
+            kind (str): "zip" o "sqlite".
+            compression (str): None, "gzip" o "lzma".
+        
+        Raises:
+            ValueError: Si el formato o la compresión no son válidos.
+        """
+        if kind not in ARCHIVES:
+            raise ValueError(f"Formato de archivo no válido: {kind}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Compresión no válida: {compression}")
+
+        self.path = path
+        self.kind = kind
+        self.compression = compression
+
+        if kind == "zip":
+            method = {None: zipfile.ZIP_STORED, "gzip": zipfile.ZIP_DEFLATED, "lzma": zipfile.ZIP_LZMA}
+            self._zip = zipfile.ZipFile(path, "w", compression=method[compression])
+        else:
+            if os.path.exists(path):
+                os.remove(path)
+
+            # El hilo de escritura usa la conexión mientras hay un registro abierto
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS traces ("
+                " name TEXT NOT NULL,"
+                " seq INTEGER NOT NULL,"
+                " data BLOB NOT NULL,"
+                " PRIMARY KEY (name, seq))"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO info VALUES ('compression', ?)", (compression or "",)
+            )
+            self._connection.commit()
+
+
+    def __enter__(self):
+        """Permite usar el archivo en un bloque with."""
+        return self
+
+
+    def __exit__(self, exc_type, exc, traceback):
+        """Cierra el archivo al salir del bloque with."""
+        self.close()
+
+
+    def _compress(self, data):
+        """Comprime un fragmento de un registro en SQLite según la compresión."""
+        if self.compression == "gzip":
+            return zlib.compress(data)
+        if self.compression == "lzma":
+            return lzma.compress(data)
+        return data
+
+
+    def open(self, name):
+        """
+        Abre un registro nuevo dentro del archivo.
+        
+        Args:
+            name (str): Nombre del registro (por ejemplo simulation_1.txt).
+        
+        Returns:
+            Archivo binario de escritura; debe cerrarse antes de abrir otro.
+        """
+        if self.kind == "zip":
+            return self._zip.open(name, "w", force_zip64=True)
+        return _SQLiteMember(self, name)
+
+
+    def add_file(self, name, path):
+        """
+        Copia al archivo un registro ya escrito en disco.
+        
+        Args:
+            name (str): Nombre del registro dentro del archivo.
+            path (str): Ruta del registro sin comprimir.
+        """
+        member = self.open(name)
+        try:
+            with open(path, "rb") as f:
+                shutil.copyfileobj(f, member, DEFAULT_BUFFER_SIZE)
+        finally:
+            member.close()
+
+
+    def close(self):
+        """Cierra el archivo."""
+        if self.kind == "zip":
+            self._zip.close()
+        else:
+            self._connection.close()
+
+
+def read_archive(path, name):
+    """
+    Lee un registro de un archivo creado con ResultArchive.
+    
+    Args:
+        path (str): Ruta del archivo (.zip o .sqlite).
+        name (str): Nombre del registro.
+    
+    Returns:
+        str: Texto del registro.
+    
+    Raises:
+        KeyError: Si el archivo no contiene el registro.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            return archive.read(name).decode("utf-8")
+
+    connection = sqlite3.connect(path)
+    try:
+        row = connection.execute("SELECT value FROM info WHERE key = 'compression'").fetchone()
+        compression = row[0] if row and row[0] else None
+        rows = connection.execute(
+            "SELECT data FROM traces WHERE name = ? ORDER BY seq", (name,)
+        ).fetchall()
+    finally:
+        connection.close()
+
+    if not rows:
+        raise KeyError(name)
+
+    decompress = {None: bytes, "gzip": zlib.decompress, "lzma": lzma.decompress}[compression]
+    return b"".join(decompress(data) for data, in rows).decode("utf-8")
@@ -0,0 +1,448 @@
+"""
+Módulo para la cinta paginada de la Máquina de Turing.
+
+Este módulo proporciona la clase PagedTape, una alternativa a Tape para
+máquinas que se alejan mucho sobre celdas en blanco o dejan marcas muy
+separadas. La cinta se divide en páginas de tamaño fijo que se reservan
+solo al escribir en ellas un símbolo no blanco y se liberan cuando todas
+sus celdas vuelven a ser blancas; las páginas no reservadas se tratan como
+blancas sin ocupar memoria. Tiene la misma interfaz que
+Tape salvo cursor, por lo que la usan las simulaciones con registro y
+run_fast a través de delta, pero no los bucles sobre la tabla compilada.
+"""
+
+from array import array
+
+from core.tape import MOVES
+
+
+# Celdas por página
+PAGE_SIZE = 1 << 12
+
+
+class PagedTape:
+    """
+    Cinta infinita almacenada en páginas reservadas bajo demanda.
+    
+    Las posiciones absolutas se cuentan desde el inicio de la entrada (0).
+    Igual que en Tape, las celdas usadas son las que el cabezal visitó o
+    que contienen la entrada, y head y origin son relativos a la primera de
+    ellas; una celda usada puede estar en una página no reservada, en cuyo
+    caso es blanca.
+    
+    Attributes:
+        blank_symbol: Símbolo que representa las celdas vacías de la cinta.
+        page_size (int): Celdas por página.
+        tape (list): Lista de símbolos de las celdas usadas.
+        head (int): Posición del cabezal relativa a la primera celda usada.
+        origin (int): Índice en tape de la primera celda de la entrada.
+    """
+
+    def __init__(self, input_string: str, blank_symbol=None, symbols=None, page_size=PAGE_SIZE):
+        """
+        Inicializa la cinta con una cadena de entrada.
+        
+        Args:
+            input_string (str): Cadena inicial que se cargará en la cinta.
+            blank_symbol: Símbolo que representa espacios en blanco.
+            symbols (list): Símbolos a internar antes que los de la entrada,
+                igual que en Tape.
+            page_size (int): Celdas por página.
+        
+        Raises:
+            ValueError: Si el tamaño de página no es positivo.
+        """
+        if page_size < 1:
+            raise ValueError(f"Tamaño de página no válido: {page_size}")
+
+        self.blank_symbol = blank_symbol
+        self.page_size = page_size
+
+        # Tabla de internado: código -> símbolo y símbolo -> código
+        self._symbols = [blank_symbol]
+        self._codes = {blank_symbol: 0}
+        self._wide = False
+
+        # Páginas reservadas: índice de página -> códigos de sus celdas, y
+        # número de celdas no blancas de cada una (al llegar a 0 se libera)
+        self._pages = {}
+        self._marked = {}
+
+        for sym in symbols or ():
+            self._code(sym)
+
+        for position, sym in enumerate(input_string):
+            self._set(position, self._code(sym))
+
+        # Celdas usadas: posiciones absolutas [_low, _high); cabezal en _pos
+        self._low = 0
+        self._high = len(input_string)
+        self._pos = 0
+
+
+    @classmethod
+    def from_codes(cls, codes, symbols, head=0, origin=0, blank_symbol=None):
+        """
+        Construye una cinta a partir de códigos de símbolos ya internados.
+        
+        Args:
+            codes (list): Código de cada celda usada, de izquierda a derecha.
+            symbols (list): Símbolo correspondiente a cada código (el código
+                0 debe ser el blanco).
+            head (int): Posición del cabezal relativa a la primera celda.
+            origin (int): Índice de la primera celda de la entrada.
+            blank_symbol: Símbolo que representa espacios en blanco.
+        
+        Returns:
+            PagedTape: Cinta con el contenido y el cabezal indicados.
+        """
+        tape = cls("", blank_symbol=blank_symbol, symbols=symbols)
+        for index, code in enumerate(codes):
+            tape._set(index - origin, code)
+
+        tape._low = -origin
+        tape._high = len(codes) - origin
+        tape._pos = head - origin
+        return tape
+
+
+    def __len__(self):
+        """
+        Devuelve el número de celdas usadas de la cinta.
+        
+        Returns:
+            int: Cantidad de celdas visitadas o inicializadas hasta el momento.
+        """
+        return self._high - self._low
+
+
+    @property
+    def tape(self):
+        """
+        Lista de símbolos de las celdas usadas, de izquierda a derecha.
+        
+        Returns:
+            list: Símbolos de la cinta (blank_symbol en las celdas vacías).
+        """
+        symbols = self._symbols
+        return [symbols[code] for code in self.codes()]
+
+
+    @property
+    def head(self):
+        """
+        Posición del cabezal relativa a la primera celda usada.
+        
+        Returns:
+            int: Índice del cabezal en tape.
+        """
+        return self._pos - self._low
+
+
+    @head.setter
+    def head(self, position):
+        """
+        Coloca el cabezal en una posición relativa a la primera celda usada.
+        
+        Args:
+            position (int): Nuevo índice del cabezal en tape.
+        """
+        self._pos = self._low + position
+
+
+    @property
+    def origin(self):
+        """
+        Índice en tape de la primera celda de la entrada.
+        
+        Returns:
+            int: Número de celdas añadidas a la izquierda de la entrada.
+        """
+        return -self._low
+
+
+    @property
+    def symbols(self):
+        """
+        Símbolos internados por la cinta, indexados por código.
+        
+        Returns:
+            list: Símbolo correspondiente a cada código (el 0 es el blanco).
+        """
+        return self._symbols
+
+
+    @property
+    def pages(self):
+        """
+        Número de páginas reservadas.
+        
+        Returns:
+            int: Páginas con al menos una celda no blanca.
+        """
+        return len(self._pages)
+
+
+    def code(self, symbol):
+        """
+        Devuelve el código entero de un símbolo en esta cinta.
+        
+        Args:
+            symbol: Símbolo de la cinta (se interna si es nuevo).
+        
+        Returns:
+            int: Código del símbolo (0 para el blanco).
+        """
+        return self._code(symbol)
+
+
+    def codes(self):
+        """
+        Códigos de las celdas usadas, de izquierda a derecha.
+        
+        Returns:
+            bytearray | array: Copia densa de las celdas usadas.
+        """
+        cells = self._pack([0]) * (self._high - self._low)
+        size = self.page_size
+
+        for index, page in self._pages.items():
+            first = index * size
+            low = max(first, self._low)
+            high = min(first + size, self._high)
+            if low < high:
+                cells[low - self._low:high - self._low] = page[low - first:high - first]
+        return cells
+
+
+    def non_blank(self):
+        """
+        Recorre las celdas no blancas de izquierda a derecha.
+        
+        Solo visita las páginas reservadas, por lo que el costo no depende
+        de cuántas celdas en blanco haya entre las marcas.
+        
+        Yields:
+            tuple: (posición absoluta, código) de cada celda no blanca.
+        """
+        size = self.page_size
+        for index in sorted(self._pages):
+            first = index * size
+            for offset, code in enumerate(self._pages[index]):
+                if code:
+                    yield first + offset, code
+
+
+    def content(self):
+        """
+        Símbolos no blancos de la cinta, de izquierda a derecha.
+        
+        Returns:
+            list: Símbolos de las celdas no blancas.
+        """
+        symbols = self._symbols
+        pages = [self._pages[index] for index in sorted(self._pages)]
+        if not self._wide:
+            # Quitar los blancos de cada página en C antes de traducir códigos
+            return [symbols[code] for page in pages for code in page.translate(None, b"\0")]
+        return [symbols[code] for page in pages for code in page if code]
+
+
+    def count(self, symbol):
+        """
+        Cuenta las celdas usadas que contienen un símbolo.
+        
+        Solo recorre las páginas reservadas; los blancos se obtienen por
+        diferencia entre las celdas usadas y las no blancas de cada página.
+        
+        Args:
+            symbol: Símbolo a contar (blank_symbol cuenta los blancos).
+        
+        Returns:
+            int: Número de celdas usadas con ese símbolo.
+        """
+        code = self._codes.get(symbol)
+        if code is None:
+            return 0
+        if code:
+            return sum(page.count(code) for page in self._pages.values())
+
+        return len(self) - sum(self._marked.values())
+
+
+    def signature(self):
+        """
+        Resume el contenido no blanco de la cinta para compararlo con otro.
+        
+        Igual que en Tape, dos cintas con los mismos códigos tienen la misma
+        firma si y solo si sus celdas no blancas coinciden en contenido y
+        posición absoluta.
+        
+        Returns:
+            tuple: (posición de la primera celda no blanca, bytes de los
+                códigos hasta la última celda no blanca).
+        """
+        cells = list(self.non_blank())
+        if not cells:
+            return 0, b""
+
+        first = cells[0][0]
+        dense = self._pack([0]) * (cells[-1][0] - first + 1)
+        for position, code in cells:
+            dense[position - first] = code
+        return first, dense.tobytes() if self._wide else bytes(dense)
+
+
+    def read(self):
+        """
+        Lee el símbolo en la posición actual del cabezal.
+        
+        Si el cabezal está fuera de las celdas usadas, éstas se amplían
+        hasta incluirlo (sin reservar ninguna página).
+        
+        Returns:
+            Símbolo en la posición actual del cabezal.
+        """
+        pos = self._pos
+        if not self._low <= pos < self._high:
+            self._extend()
+
+        index, offset = divmod(pos, self.page_size)
+        page = self._pages.get(index)
+        if page is None:
+            return self.blank_symbol
+        return self._symbols[page[offset]]
+
+
+    def write(self, symbol):
+        """
+        Escribe un símbolo en la posición actual del cabezal.
+        
+        Escribir el blanco en una página no reservada no la reserva.
+        
+        Args:
+            symbol: Símbolo a escribir en la posición actual.
+        """
+        if not self._low <= self._pos < self._high:
+            self._extend()
+
+        code = self._codes.get(symbol)
+        if code is None:
+            code = self._code(symbol)
+        self._set(self._pos, code)
+
+
+    def move(self, direction):
+        """
+        Mueve el cabezal en la dirección especificada.
+        
+        Args:
+            direction (str): "L", "R" o "S".
+        
+        Raises:
+            ValueError: Si la dirección no es válida (L, R o S).
+        """
+        try:
+            self._pos += MOVES[direction]
+        except KeyError:
+            raise ValueError(f"Movimiento no válido: {direction}") from None
+
+
+    def snapshot(self, current_state):
+        """
+        Genera una descripción instantánea (ID) del estado actual de la cinta.
+        
+        Mismo formato que Tape.snapshot: contenido de las celdas usadas (_
+        para el blanco), marcador ^ del cabezal y estado actual.
+        
+        Args:
+            current_state: Estado actual de la máquina de Turing.
+        
+        Returns:
+            str: Representación en texto del estado de la cinta.
+        """
+        tape_str = "".join(symbol if symbol is not None else "_" for symbol in self.tape)
+        head_marker = " " * self.head + "^"
+        return f"{tape_str}\n{head_marker}\nEstado: {current_state}\n"
+
+
+    def _set(self, position, code):
+        """
+        Guarda un código en una posición absoluta, reservando su página si hace falta.
+        
+        Lleva la cuenta de las celdas no blancas de cada página y libera la
+        página cuando la escritura deja todas sus celdas en blanco.
+        
+        Args:
+            position (int): Posición absoluta de la celda.
+            code (int): Código a guardar.
+        """
+        index, offset = divmod(position, self.page_size)
+        page = self._pages.get(index)
+        if page is None:
+            if not code:
+                return
+            page = self._pages[index] = self._pack([0]) * self.page_size
+            self._marked[index] = 0
+
+        old = page[offset]
+        page[offset] = code
+        if not old:
+            if code:
+                self._marked[index] += 1
+        elif not code:
+            self._marked[index] -= 1
+            if not self._marked[index]:
+                del self._pages[index]
+                del self._marked[index]
+
+
+    def _extend(self):
+        """
+        Amplía las celdas usadas hasta incluir la posición del cabezal.
+        """
+        if self._pos < self._low:
+            self._low = self._pos
+        else:
+            self._high = self._pos + 1
+
+
+    def _pack(self, codes):
+        """
+        Construye un buffer del tipo actual a partir de una lista de códigos.
+        
+        Args:
+            codes (list): Códigos enteros de los símbolos.
+        
+        Returns:
+            bytearray | array: Buffer con los códigos dados.
+        """
+        if self._wide:
+            return array("I", codes)
+        return bytearray(codes)
+
+
+    def _code(self, symbol):
+        """
+        Devuelve el código entero de un símbolo, internándolo si es nuevo.
+        
+        Igual que en Tape, al superar los 256 símbolos distintos las páginas
+        pasan de bytearray a arrays de enteros de 32 bits.
+        
+        Args:
+            symbol: Símbolo de la cinta.
+        
+        Returns:
+            int: Código del símbolo.
+        """
+        code = self._codes.get(symbol)
+        if code is None:
+            code = len(self._symbols)
+            self._symbols.append(symbol)
+            self._codes[symbol] = code
+
+            if code == 256:
+                self._wide = True
+                for index, page in self._pages.items():
+                    self._pages[index] = array("I", list(page))
+        return code
@@ -0,0 +1,142 @@
+"""
+Módulo para el perfilado de simulaciones con registro.
+
+Este módulo proporciona la clase SimulationProfile, que acumula durante una
+ejecución el número de veces que se aplica cada regla, los pasos que la
+máquina pasa en cada estado, las visitas del cabezal a cada celda y el
+tiempo dedicado a aplicar transiciones, a generar las IDs y a construir
+las líneas del registro. El perfil puede exportarse en JSON junto al
+archivo de salida de la simulación.
+"""
+
+import json
+import time
+from collections import Counter
+
+
+class SimulationProfile:
+    """
+    Estadísticas de perfilado de una ejecución.
+    
+    Solo se crea cuando el perfilado está activado en el Simulator; si no,
+    la simulación no paga ningún costo por paso.
+    
+    Attributes:
+        steps (int): Transiciones observadas.
+        rule_hits (Counter): Aplicaciones de cada regla, indexadas por la
+            clave de delta (estado, cache, símbolo).
+        state_dwell (Counter): Pasos ejecutados desde cada estado.
+        head_heatmap (Counter): Transiciones aplicadas con el cabezal en cada
+            posición absoluta (0 es el inicio de la entrada).
+        seconds (dict): Segundos acumulados en cada temporizador: "step"
+            (paso completo, incluidas las IDs), "format_id" (generación de
+            IDs) y "log" (construcción de las líneas del registro).
+    """
+
+    def __init__(self):
+        """Inicializa un perfil vacío."""
+        self.steps = 0
+        self.rule_hits = Counter()
+        self.state_dwell = Counter()
+        self.head_heatmap = Counter()
+        self.seconds = {"step": 0.0, "format_id": 0.0, "log": 0.0}
+
+
+    def timed(self, timer, function):
+        """
+        Envuelve una función para acumular su tiempo en un temporizador.
+        
+        Args:
+            timer (str): Nombre del temporizador (clave de seconds).
+            function (callable): Función a medir.
+        
+        Returns:
+            callable: Función equivalente que mide cada llamada.
+        """
+        seconds = self.seconds
+        clock = time.perf_counter
+
+        def wrapper(*args):
+            start = clock()
+            try:
+                return function(*args)
+            finally:
+                seconds[timer] += clock() - start
+        return wrapper
+
+
+    def instrument(self, renderer):
+        """
+        Mide el tiempo de generación de IDs de un renderizador.
+        
+        Args:
+            renderer (IDRenderer): Renderizador de la ejecución perfilada.
+        """
+        renderer.render = self.timed("format_id", renderer.render)
+        renderer.write = self.timed("format_id", renderer.write)
+
+
+    def observe(self, record, head):
+        """
+        Registra una transición aplicada.
+        
+        Args:
+            record (StepRecord): Registro de la transición.
+            head (int): Posición absoluta de la celda leída en la transición.
+        """
+        self.steps += 1
+        self.rule_hits[(record.state, record.cache, record.symbol)] += 1
+        self.state_dwell[record.state] += 1
+        self.head_heatmap[head] += 1
+
+
+    def transition_seconds(self):
+        """
+        Calcula el tiempo dedicado a aplicar transiciones.
+        
+        Returns:
+            float: Tiempo de los pasos sin contar la generación de IDs.
+        """
+        return max(self.seconds["step"] - self.seconds["format_id"], 0.0)
+
+
+    def to_dict(self):
+        """
+        Resume el perfil en una estructura serializable en JSON.
+        
+        Las reglas y los estados se ordenan de más a menos usados.
+        
+        Returns:
+            dict: Pasos, tiempos, reglas, estados y mapa de calor del cabezal.
+        """
+        return {
+            "steps": self.steps,
+            "seconds": {
+                "transition": self.transition_seconds(),
+                "format_id": self.seconds["format_id"],
+                "log": self.seconds["log"],
+            },
+            "rules": [
+                {"state": state, "cache": cache, "symbol": symbol, "hits": hits}
+                for (state, cache, symbol), hits in self.rule_hits.most_common()
+            ],
+            "states": [
+                {"state": state, "steps": steps}
+                for state, steps in self.state_dwell.most_common()
+            ],
+            "heatmap": [
+                {"position": position, "visits": self.head_heatmap[position]}
+                for position in sorted(self.head_heatmap)
+            ],
+        }
+
+
+    def export(self, path):
+        """
+        Guarda el perfil en un archivo JSON.
+        
+        Args:
+            path (str): Ruta del archivo de salida.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
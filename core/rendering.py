@@ -0,0 +1,176 @@
+"""
+Módulo para la generación de descripciones instantáneas (ID).
+
+Este módulo proporciona la clase IDRenderer, que mantiene una copia de la
+cinta ya convertida a texto y la actualiza solo en las celdas que cambian,
+de modo que generar la ID de cada paso no requiere recorrer la cinta
+símbolo por símbolo.
+"""
+
+
+# Representación textual del símbolo blanco en las IDs
+BLANK_DISPLAY = "B"
+
+# Marcador que indica que la ventana recorta la cinta por ese extremo
+ELLIPSIS = "…"
+
+
+def display_symbol(symbol):
+    """
+    Convierte un símbolo de la cinta a su representación en las IDs.
+    
+    Args:
+        symbol: Símbolo de la cinta (None representa el blanco).
+    
+    Returns:
+        str: Símbolo a mostrar; el blanco se muestra como B.
+    """
+    return symbol if symbol is not None else BLANK_DISPLAY
+
+
+class IDRenderer:
+    """
+    Genera las IDs de una simulación de forma incremental.
+    
+    Conserva la representación textual de cada celda de la cinta y solo
+    modifica las celdas escritas o añadidas por la expansión de la cinta.
+    Igual que Tape, la copia textual reserva celdas libres delante de la
+    primera celda usada y las duplica al agotarlas, de modo que expandir la
+    cinta hacia la izquierda no desplaza toda la lista. Opcionalmente
+    muestra únicamente una ventana de celdas alrededor del cabezal, con lo
+    que el costo de cada ID no depende del tamaño de la cinta.
+    
+    Attributes:
+        window (int): Número de celdas a cada lado del cabezal que se
+            muestran (None muestra la cinta completa).
+        origin (int): Valor de tape.origin en la última sincronización.
+    """
+
+    def __init__(self, tape, window=None):
+        """
+        Inicializa el renderizador a partir del contenido actual de la cinta.
+        
+        Args:
+            tape (Tape): Cinta cuyas IDs se van a generar.
+            window (int): Celdas a cada lado del cabezal a mostrar
+                (None para mostrar la cinta completa).
+        
+        Raises:
+            ValueError: Si la ventana es negativa.
+        """
+        if window is not None and window < 0:
+            raise ValueError(f"Ventana de ID no válida: {window}")
+
+        self.window = window
+        self.origin = tape.origin
+
+        # Copia textual con celdas libres delante; la primera celda usada
+        # está en el índice _first
+        self._cells = [display_symbol(sym) for sym in tape.tape]
+        self._first = 0
+
+
+    @property
+    def cells(self):
+        """
+        Representación textual de cada celda de la cinta.
+        
+        Returns:
+            list: Copia de las celdas usadas, de izquierda a derecha.
+        """
+        return self._cells[self._first:]
+
+
+    def _sync(self, tape):
+        """
+        Incorpora las celdas añadidas por la expansión de la cinta.
+        
+        Método privado que compara el origen y la longitud de la cinta con
+        los de la copia textual y añade celdas en blanco por el extremo que
+        haya crecido. Por la izquierda se ocupan las celdas libres; si no
+        alcanzan, se reservan tantas como celdas tenga la copia (costo
+        amortizado constante por celda).
+        
+        Args:
+            tape (Tape): Cinta sincronizada con el renderizador.
+        """
+        blank = display_symbol(tape.blank_symbol)
+
+        grown_left = tape.origin - self.origin
+        if grown_left:
+            if grown_left > self._first:
+                margin = max(grown_left - self._first, len(self._cells))
+                self._cells[0:0] = [blank] * margin
+                self._first += margin
+            self._first -= grown_left
+            self._cells[self._first:self._first + grown_left] = [blank] * grown_left
+            self.origin = tape.origin
+
+        grown_right = len(tape) - (len(self._cells) - self._first)
+        if grown_right:
+            self._cells.extend([blank] * grown_right)
+
+
+    def write(self, tape, index, symbol):
+        """
+        Registra la escritura de un símbolo en una celda de la cinta.
+        
+        Args:
+            tape (Tape): Cinta en la que se escribió el símbolo.
+            index (int): Índice de la celda escrita.
+            symbol: Símbolo escrito (None representa el blanco).
+        """
+        self._sync(tape)
+        self._cells[self._first + index] = display_symbol(symbol)
+
+
+    def render(self, tape, state, cache):
+        """
+        Construye la ID formal de la configuración actual.
+        
+        Si el cabezal está fuera de las celdas almacenadas (antes de que la
+        cinta se expanda) la ID no incluye el marcador de estado, igual que
+        Simulator.format_id.
+        
+        Args:
+            tape (Tape): Cinta actual de la máquina.
+            state (str): Estado actual de la máquina.
+            cache: Valor actual de la memoria cache (None representa B).
+        
+        Returns:
+            str: ID formal con formato [estado,cache]símbolo...; en modo
+                ventana, los extremos recortados se indican con …
+        """
+        self._sync(tape)
+
+        cells = self._cells
+        first = self._first
+        head = tape.head
+        size = len(cells) - first
+        marker = f"[{state},{display_symbol(cache)}]"
+
+        if self.window is None:
+            if not 0 <= head < size:
+                return "".join(cells[first:])
+
+            # Insertar el marcador temporalmente en la celda del cabezal
+            current = cells[first + head]
+            cells[first + head] = marker + current
+            id_str = "".join(cells[first:])
+            cells[first + head] = current
+            return id_str
+
+        low = max(0, head - self.window)
+        high = min(size, head + self.window + 1)
+
+        visible = cells[first + low:first + high]
+        if low <= head < high:
+            visible[head - low] = marker + visible[head - low]
+
+        id_str = "".join(visible)
+        if low > 0:
+            id_str = ELLIPSIS + id_str
+        if high < size:
+            id_str += ELLIPSIS
+
+        return id_str
@@ -0,0 +1,234 @@
+"""
+Módulo para el almacenamiento persistente de resultados de simulación.
+
+Este módulo proporciona la clase ResultStore, una caché en SQLite que
+guarda el veredicto, el número de pasos y la cinta final de cada
+simulación, indexados por un hash del contenido de la máquina y por la
+cadena de entrada. main.py la consulta antes de simular cada cadena y
+omite las que conservan su archivo de salida vigente (el sello del
+registro incluye las opciones de salida y el presupuesto);
+analisis_empirico.py solo registra sus resultados, ya que debe simular
+para medir los tiempos.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from array import array
+from collections import namedtuple
+
+from core.tape import Tape
+
+
+# Resultado recuperado de la caché. trace_path es la ruta del registro
+# generado junto con el resultado (o None) y trace_stamp su sello de
+# vigencia, calculado con trace_stamp().
+StoredResult = namedtuple("StoredResult", [
+    "accepted", "steps", "tape", "trace_path", "trace_stamp",
+])
+
+
+def machine_hash(config):
+    """
+    Calcula un hash del contenido normalizado de una máquina.
+    
+    Se usa la configuración devuelta por MTConfigLoader.load sin las
+    cadenas de simulación, serializada con claves ordenadas, de modo que
+    el hash solo cambia cuando cambia la definición de la máquina.
+    
+    Args:
+        config (dict): Configuración completa de la máquina.
+    
+    Returns:
+        str: Hash SHA-256 en hexadecimal.
+    """
+    definition = {key: value for key, value in config.items() if key != "simulation_strings"}
+    normalized = json.dumps(definition, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def trace_stamp(path, options=""):
+    """
+    Genera el sello de vigencia de un archivo de registro.
+    
+    El sello combina el tamaño y la fecha de modificación del archivo con
+    las opciones que afectan a su contenido; si el archivo cambia o se
+    genera con otras opciones, el sello deja de coincidir.
+    
+    Args:
+        path (str): Ruta del archivo de registro.
+        options (str): Descripción de las opciones de formato del registro.
+    
+    Returns:
+        str: Sello del archivo, o None si el archivo no existe.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{stat.st_size}:{stat.st_mtime_ns}:{options}"
+
+
+class ResultStore:
+    """
+    Caché persistente de resultados de simulación en SQLite.
+    
+    Cada entrada se identifica por (hash de la máquina, cadena de entrada).
+    El tamaño total de las cintas almacenadas está acotado: al superarlo se
+    eliminan las entradas usadas hace más tiempo (LRU).
+    
+    Attributes:
+        path (str): Ruta del archivo SQLite.
+        max_bytes (int): Tamaño máximo de las cintas almacenadas (None
+            para no limitarlo).
+    """
+
+    def __init__(self, path, max_bytes=None):
+        """
+        Abre (o crea) la caché en la ruta indicada.
+        
+        Args:
+            path (str): Ruta del archivo SQLite.
+            max_bytes (int): Tamaño máximo de las cintas almacenadas (None
+                para no limitarlo).
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " machine TEXT NOT NULL,"
+            " input TEXT NOT NULL,"
+            " accepted INTEGER NOT NULL,"
+            " steps INTEGER NOT NULL,"
+            " symbols TEXT NOT NULL,"
+            " codes BLOB NOT NULL,"
+            " wide INTEGER NOT NULL,"
+            " head INTEGER NOT NULL,"
+            " origin INTEGER NOT NULL,"
+            " trace_path TEXT,"
+            " trace_stamp TEXT,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (machine, input))"
+        )
+        self._connection.commit()
+
+
+    def __enter__(self):
+        """Permite usar la caché en un bloque with."""
+        return self
+
+
+    def __exit__(self, exc_type, exc, traceback):
+        """Cierra la conexión al salir del bloque with."""
+        self.close()
+
+
+    def close(self):
+        """Cierra la conexión con la base de datos."""
+        self._connection.close()
+
+
+    def get(self, machine_key, input_str):
+        """
+        Busca el resultado de una simulación y lo marca como usado.
+        
+        Args:
+            machine_key (str): Hash de la máquina (machine_hash).
+            input_str (str): Cadena de entrada simulada.
+        
+        Returns:
+            StoredResult: Resultado almacenado, o None si no existe.
+        """
+        row = self._connection.execute(
+            "SELECT accepted, steps, symbols, codes, wide, head, origin, trace_path, trace_stamp"
+            " FROM results WHERE machine = ? AND input = ?",
+            (machine_key, input_str)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        accepted, steps, symbols, codes, wide, head, origin, trace_path, stamp = row
+
+        self._connection.execute(
+            "UPDATE results SET last_used = ? WHERE machine = ? AND input = ?",
+            (time.time(), machine_key, input_str)
+        )
+        self._connection.commit()
+
+        symbols = json.loads(symbols)
+        if wide:
+            cells = array("I")
+            cells.frombytes(codes)
+        else:
+            cells = codes
+
+        tape = Tape.from_codes(cells, symbols, head=head, origin=origin, blank_symbol=symbols[0])
+        return StoredResult(bool(accepted), steps, tape, trace_path, stamp)
+
+
+    def put(self, machine_key, input_str, accepted, steps, tape, trace_path=None, stamp=None):
+        """
+        Guarda (o reemplaza) el resultado de una simulación.
+        
+        Args:
+            machine_key (str): Hash de la máquina (machine_hash).
+            input_str (str): Cadena de entrada simulada.
+            accepted (bool): Veredicto de la simulación.
+            steps (int): Número de transiciones aplicadas.
+            tape (Tape | PagedTape | RunLengthTape): Cinta final.
+            trace_path (str): Ruta del registro generado, si existe.
+            stamp (str): Sello de vigencia del registro (trace_stamp).
+        """
+        codes = tape.codes()
+        wide = not isinstance(codes, bytearray)
+        codes = codes.tobytes() if wide else bytes(codes)
+
+        symbols = json.dumps(tape.symbols, ensure_ascii=False)
+
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                machine_key, input_str, int(accepted), steps, symbols, codes, int(wide),
+                tape.head, tape.origin, trace_path, stamp, len(codes) + len(symbols),
+                time.time()
+            )
+        )
+        self._evict()
+        self._connection.commit()
+
+
+    def _evict(self):
+        """
+        Elimina las entradas menos usadas hasta respetar max_bytes.
+        
+        Método privado llamado tras cada inserción.
+        """
+        if self.max_bytes is None:
+            return
+
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        oldest = self._connection.execute(
+            "SELECT rowid, size FROM results ORDER BY last_used ASC"
+        ).fetchall()
+
+        evicted = []
+        for rowid, size in oldest:
+            if total <= self.max_bytes:
+                break
+            evicted.append((rowid,))
+            total -= size
+
+        self._connection.executemany("DELETE FROM results WHERE rowid = ?", evicted)
@@ -0,0 +1,263 @@
+"""
+Módulo para el registro acotado de las últimas transiciones de una simulación.
+
+Este módulo proporciona la clase RingTrace, que simula una cadena sobre la
+tabla compilada de la máquina conservando solo los registros de deshacer de
+los últimos pasos, en un buffer circular de tamaño fijo, y la configuración
+previa a un paso de cada cierto número de pasos (muestras), también en
+número acotado. Durante la simulación no se genera ninguna ID ni línea: el
+registro se genera al pedirlo, una vez que la simulación terminó (aceptada,
+rechazada o abortada por el presupuesto), por lo que la memoria y el costo
+de formato no dependen del número de pasos.
+"""
+
+import sys
+from collections import deque, namedtuple
+
+from core.loops import LoopDetector, LoopReport, find_cycle_start
+from core.rendering import IDRenderer
+from core.simulation import StepRecord
+from core.stepper import Stepper
+from core.tape import Tape
+
+
+# Últimos pasos que se conservan
+DEFAULT_LAST = 256
+
+# Pasos entre pasos muestreados (None no toma muestras)
+DEFAULT_EVERY = 1 << 14
+
+# Muestras que se conservan (las más recientes)
+DEFAULT_SAMPLES = 64
+
+
+# Configuración previa a un paso muestreado: número del paso, base de la
+# tabla del estado y cache, códigos de las celdas usadas, cabezal y origen
+Sample = namedtuple("Sample", ["step", "base", "codes", "head", "origin"])
+
+
+class RingTrace:
+    """
+    Registro acotado de una simulación: últimos pasos y pasos muestreados.
+    
+    Avanza con un Stepper, igual que RunHistory, y, con detect_loops,
+    rechaza las simulaciones que repiten una configuración. Los registros
+    de deshacer del Stepper se guardan en un deque de longitud fija, de
+    modo que al terminar solo quedan los de los últimos pasos; lines()
+    reconstruye la configuración previa a ellos deshaciéndolos desde la
+    configuración final y los aplica de nuevo generando sus líneas. Las
+    muestras guardan una copia de las celdas usadas, por lo que su memoria
+    está acotada por max_samples veces el tamaño de la cinta.
+    
+    Attributes:
+        simulator (Simulator): Simulador de la máquina.
+        input_str (str): Cadena de entrada simulada.
+        last (int): Últimos pasos que se conservan.
+        every (int): Pasos entre pasos muestreados (None sin muestras).
+        max_samples (int): Muestras que se conservan.
+        steps (int): Pasos aplicados.
+        tape (Tape): Cinta final.
+        accepted (bool): None si la simulación no se ha ejecutado o se
+            abortó; True si la cadena fue aceptada o False si fue rechazada.
+        abort (BudgetReport): Resumen con el recurso agotado si la
+            simulación se abortó (o None).
+        loop (LoopReport): Inicio y longitud del ciclo si la simulación se
+            rechazó por repetir una configuración (o None).
+    """
+
+    def __init__(self, simulator, input_str, last=DEFAULT_LAST, every=DEFAULT_EVERY,
+                 max_samples=DEFAULT_SAMPLES, budget=None):
+        """
+        Prepara el registro acotado de una simulación, sin ejecutarla.
+        
+        Args:
+            simulator (Simulator): Simulador de la máquina.
+            input_str (str): Cadena de entrada a simular.
+            last (int): Últimos pasos que se conservan.
+            every (int): Pasos entre pasos muestreados (None sin muestras).
+            max_samples (int): Muestras que se conservan.
+            budget (Budget): Límites de recursos de la simulación (None sin
+                límites); el límite de bytes de registro no se aplica, ya que
+                el registro no crece con la simulación.
+        
+        Raises:
+            ValueError: Si last o max_samples son negativos o every no es positivo.
+        """
+        if last < 0 or max_samples < 0:
+            raise ValueError(f"Tamaño de registro no válido: {last} pasos, {max_samples} muestras")
+        if every is not None and every < 1:
+            raise ValueError(f"Intervalo de muestreo no válido: {every}")
+
+        self.simulator = simulator
+        self.input_str = input_str
+        self.last = last
+        self.every = every
+        self.max_samples = max_samples
+        self.steps = 0
+        self.tape = None
+        self.accepted = None
+        self.abort = None
+        self.loop = None
+
+        self._budget = budget
+        self._base = None
+        self._undo = deque(maxlen=last)
+        self._samples = deque(maxlen=max_samples)
+
+
+    def run(self):
+        """
+        Ejecuta la simulación guardando los últimos pasos y las muestras.
+        
+        Solo se ejecuta la primera vez; las siguientes no tienen efecto.
+        
+        Returns:
+            RingTrace: El propio registro, ya ejecutado.
+        """
+        if self.tape is not None:
+            return self
+
+        machine = self.simulator.machine
+        compiled = machine.compile()
+        clock = self._budget.start() if self._budget is not None else None
+
+        tape = Tape(self.input_str, blank_symbol=machine.blank_symbol, symbols=compiled.symbols)
+        base = compiled.initial_base
+
+        detector = None
+        if self.simulator.detect_loops:
+            detector = LoopDetector(tape, base, 0)
+
+        stepper = Stepper(compiled, tape, base, undo=self._undo, detector=detector)
+        sample = self._samples.append
+        every = self.every
+
+        # La muestra del paso n se toma con n - 1 pasos aplicados
+        next_sample = every - 1 if every is not None else sys.maxsize
+
+        abort = loop = None
+
+        while True:
+            steps = stepper.steps
+            if steps == next_sample:
+                buffer, start, end, _ = tape.cursor()
+                sample(Sample(steps + 1, stepper.base, buffer[start:end], tape.head, tape.origin))
+                next_sample += every
+
+            limit = next_sample
+            if clock is not None:
+                abort = clock.check(steps, len(tape))
+                if abort is not None:
+                    break
+                limit = min(limit, clock.next_check(steps))
+
+            # Con presupuesto, revisar el límite de celdas tras cada expansión
+            if stepper.advance(limit, stop_on_grow=clock is not None):
+                break
+
+        if stepper.cycle is not None:
+            start = find_cycle_start(machine, self.input_str, stepper.cycle)
+            loop = LoopReport(start, stepper.cycle, stepper.steps)
+
+        # La última muestra puede ser de un paso que no llegó a aplicarse
+        if self._samples and self._samples[-1].step > stepper.steps:
+            self._samples.pop()
+
+        self.tape = tape
+        self.steps = stepper.steps
+        self.accepted = stepper.accepted
+        self.abort = abort
+        self.loop = loop
+        self._base = stepper.base
+        return self
+
+
+    def lines(self):
+        """
+        Genera el registro acotado, ejecutando antes la simulación si hace falta.
+        
+        Incluye el encabezado de Simulator.header_lines, los pasos muestreados
+        anteriores a los últimos pasos y los últimos pasos; cada línea de un
+        paso es la de Simulator.format_step precedida por su número de paso.
+        
+        Yields:
+            str: Línea del registro (sin salto de línea final).
+        """
+        self.run()
+        simulator = self.simulator
+        compiled = simulator.machine.compile()
+        symbols = self.tape.symbols
+        blank_symbol = self.tape.blank_symbol
+
+        yield from simulator.header_lines(self.input_str)
+
+        first = self.steps - len(self._undo) + 1
+        samples = [item for item in self._samples if item.step < first]
+        if samples:
+            yield f"Pasos muestreados (uno cada {self.every} pasos):"
+            for item in samples:
+                tape = Tape.from_codes(
+                    item.codes, symbols, head=item.head, origin=item.origin, blank_symbol=blank_symbol
+                )
+                state, cache = compiled.decode(item.base)
+                yield from self._replay(tape, state, cache, item.step, 1)
+            yield ""
+
+        if not self._undo:
+            return
+
+        # Deshacer los últimos pasos sobre una copia de la cinta final
+        buffer, start, end, _ = self.tape.cursor()
+        tape = Tape.from_codes(
+            buffer[start:end], symbols, head=self.tape.head, origin=self.tape.origin,
+            blank_symbol=blank_symbol
+        )
+        stepper = Stepper(compiled, tape, self._base, self.steps, undo=deque(self._undo))
+        while stepper.undo:
+            stepper.undo_step()
+
+        state, cache = compiled.decode(stepper.base)
+        if first > 1:
+            yield f"Últimos {len(self._undo)} pasos de {self.steps}:"
+        yield from self._replay(tape, state, cache, first, len(self._undo))
+
+
+    def _replay(self, tape, state, cache, step, count):
+        """
+        Aplica pasos desde una configuración generando sus líneas.
+        
+        Método privado usado por lines(); aplica la función de transición
+        con la API de Tape, igual que SimulationRun, para que las IDs
+        coincidan con las del registro de texto.
+        
+        Args:
+            tape (Tape): Cinta de la configuración (se modifica).
+            state (str): Estado de la configuración.
+            cache: Cache de la configuración (None representa B).
+            step (int): Número del primer paso a aplicar.
+            count (int): Pasos a aplicar.
+        
+        Yields:
+            str: Línea de cada paso precedida por su número.
+        """
+        simulator = self.simulator
+        delta = simulator.machine.delta
+        renderer = IDRenderer(tape, window=simulator.id_window)
+
+        for number in range(step, step + count):
+            id_before = renderer.render(tape, state, cache)
+
+            symbol = tape.read()
+            new_state, new_cache, tape_output, movement = delta[(state, cache, symbol)]
+
+            tape.write(tape_output)
+            renderer.write(tape, tape.head, tape_output)
+            tape.move(movement)
+
+            line = simulator.format_step(StepRecord(
+                number, state, cache, symbol,
+                new_state, new_cache, tape_output, movement,
+                id_before, renderer.render(tape, new_state, new_cache),
+            ))
+            yield f"[{number}] {line}"
+            state, cache = new_state, new_cache
@@ -0,0 +1,512 @@
+"""
+Módulo para la cinta comprimida por rachas de la Máquina de Turing.
+
+Este módulo proporciona la clase RunLengthTape, una alternativa a Tape para
+máquinas que trabajan en notación unaria o con marcadores, cuya cinta está
+formada casi por completo por rachas largas del mismo símbolo (como la
+máquina de Fibonacci, con rachas de 1, Z, V y blancos). La cinta se guarda
+como una lista de rachas (símbolo, longitud): escribir divide la racha bajo
+el cabezal y une las rachas vecinas iguales, y la cantidad de celdas de
+cada símbolo se actualiza en cada escritura, de modo que contar el
+resultado cuesta O(1) y extraerlo O(rachas). Tiene la misma interfaz que
+Tape salvo cursor, igual que PagedTape.
+"""
+
+from array import array
+from itertools import groupby
+
+from core.tape import MOVES
+
+
+class RunLengthTape:
+    """
+    Cinta infinita almacenada como rachas de celdas con el mismo símbolo.
+    
+    Las rachas cubren exactamente las celdas usadas (las que el cabezal
+    visitó o que contienen la entrada), incluidas las rachas de blancos, y
+    dos rachas vecinas nunca tienen el mismo símbolo. La racha bajo el
+    cabezal y la posición dentro de ella se actualizan en cada movimiento,
+    por lo que leer, escribir y mover no recorren la lista de rachas salvo
+    al partir o unir rachas.
+    
+    Attributes:
+        blank_symbol: Símbolo que representa las celdas vacías de la cinta.
+        tape (list): Lista de símbolos de las celdas usadas.
+        head (int): Posición del cabezal relativa a la primera celda usada.
+        origin (int): Índice en tape de la primera celda de la entrada.
+    """
+
+    def __init__(self, input_string: str, blank_symbol=None, symbols=None):
+        """
+        Inicializa la cinta con una cadena de entrada.
+        
+        Args:
+            input_string (str): Cadena inicial que se cargará en la cinta.
+            blank_symbol: Símbolo que representa espacios en blanco.
+            symbols (list): Símbolos a internar antes que los de la entrada,
+                igual que en Tape.
+        """
+        self.blank_symbol = blank_symbol
+
+        # Tabla de internado (código -> símbolo y símbolo -> código) y
+        # número de celdas usadas con cada código
+        self._symbols = [blank_symbol]
+        self._codes = {blank_symbol: 0}
+        self._counts = [0]
+
+        for sym in symbols or ():
+            self._code(sym)
+
+        self._load([self._code(sym) for sym in input_string])
+
+        # Celdas usadas: posiciones absolutas [_low, _high); cabezal en _pos
+        self._low = 0
+        self._high = len(input_string)
+        self._pos = 0
+
+
+    @classmethod
+    def from_codes(cls, codes, symbols, head=0, origin=0, blank_symbol=None):
+        """
+        Construye una cinta a partir de códigos de símbolos ya internados.
+        
+        Args:
+            codes (list): Código de cada celda usada, de izquierda a derecha.
+            symbols (list): Símbolo correspondiente a cada código (el código
+                0 debe ser el blanco).
+            head (int): Posición del cabezal relativa a la primera celda.
+            origin (int): Índice de la primera celda de la entrada.
+            blank_symbol: Símbolo que representa espacios en blanco.
+        
+        Returns:
+            RunLengthTape: Cinta con el contenido y el cabezal indicados.
+        """
+        tape = cls("", blank_symbol=blank_symbol, symbols=symbols)
+        tape._load(list(codes))
+
+        tape._low = -origin
+        tape._high = len(codes) - origin
+        tape._pos = head - origin
+        return tape
+
+
+    def _load(self, codes):
+        """
+        Reemplaza las rachas por las de una secuencia de códigos.
+        
+        Método privado usado por los constructores; deja el cabezal sin
+        ubicar (se ubica en la siguiente lectura o escritura).
+        
+        Args:
+            codes (list): Código de cada celda usada.
+        """
+        self._run_codes = []
+        self._run_lengths = []
+        counts = self._counts
+
+        for code, group in groupby(codes):
+            length = sum(1 for _ in group)
+            self._run_codes.append(code)
+            self._run_lengths.append(length)
+            counts[code] += length
+
+        # Racha bajo el cabezal y posición dentro de ella (None sin ubicar)
+        self._run = None
+        self._offset = 0
+
+
+    def __len__(self):
+        """
+        Devuelve el número de celdas usadas de la cinta.
+        
+        Returns:
+            int: Cantidad de celdas visitadas o inicializadas hasta el momento.
+        """
+        return self._high - self._low
+
+
+    @property
+    def tape(self):
+        """
+        Lista de símbolos de las celdas usadas, de izquierda a derecha.
+        
+        Returns:
+            list: Símbolos de la cinta (blank_symbol en las celdas vacías).
+        """
+        symbols = self._symbols
+        cells = []
+        for code, length in zip(self._run_codes, self._run_lengths):
+            cells += [symbols[code]] * length
+        return cells
+
+
+    @property
+    def head(self):
+        """
+        Posición del cabezal relativa a la primera celda usada.
+        
+        Returns:
+            int: Índice del cabezal en tape.
+        """
+        return self._pos - self._low
+
+
+    @head.setter
+    def head(self, position):
+        """
+        Coloca el cabezal en una posición relativa a la primera celda usada.
+        
+        Args:
+            position (int): Nuevo índice del cabezal en tape.
+        """
+        self._pos = self._low + position
+        self._run = None
+
+
+    @property
+    def origin(self):
+        """
+        Índice en tape de la primera celda de la entrada.
+        
+        Returns:
+            int: Número de celdas añadidas a la izquierda de la entrada.
+        """
+        return -self._low
+
+
+    @property
+    def symbols(self):
+        """
+        Símbolos internados por la cinta, indexados por código.
+        
+        Returns:
+            list: Símbolo correspondiente a cada código (el 0 es el blanco).
+        """
+        return self._symbols
+
+
+    def runs(self):
+        """
+        Rachas de la cinta, de izquierda a derecha.
+        
+        Returns:
+            list: Pares (símbolo, longitud) que cubren las celdas usadas.
+        """
+        symbols = self._symbols
+        return [(symbols[code], length) for code, length in zip(self._run_codes, self._run_lengths)]
+
+
+    def count(self, symbol):
+        """
+        Cuenta las celdas usadas que contienen un símbolo.
+        
+        El conteo se mantiene en cada escritura, por lo que no recorre la
+        cinta.
+        
+        Args:
+            symbol: Símbolo a contar (blank_symbol cuenta los blancos).
+        
+        Returns:
+            int: Número de celdas usadas con ese símbolo.
+        """
+        code = self._codes.get(symbol)
+        return 0 if code is None else self._counts[code]
+
+
+    def code(self, symbol):
+        """
+        Devuelve el código entero de un símbolo en esta cinta.
+        
+        Args:
+            symbol: Símbolo de la cinta (se interna si es nuevo).
+        
+        Returns:
+            int: Código del símbolo (0 para el blanco).
+        """
+        return self._code(symbol)
+
+
+    def codes(self):
+        """
+        Códigos de las celdas usadas, de izquierda a derecha.
+        
+        Returns:
+            bytearray | array: Copia densa de las celdas usadas.
+        """
+        if len(self._symbols) > 256:
+            cells = array("I")
+            for code, length in zip(self._run_codes, self._run_lengths):
+                cells.extend([code] * length)
+            return cells
+
+        return bytearray(b"".join(bytes((code,)) * length for code, length in zip(self._run_codes, self._run_lengths)))
+
+
+    def non_blank(self):
+        """
+        Recorre las celdas no blancas de izquierda a derecha.
+        
+        Las rachas de blancos se saltan sin recorrer sus celdas.
+        
+        Yields:
+            tuple: (posición absoluta, código) de cada celda no blanca.
+        """
+        position = self._low
+        for code, length in zip(self._run_codes, self._run_lengths):
+            if code:
+                for cell in range(position, position + length):
+                    yield cell, code
+            position += length
+
+
+    def content(self):
+        """
+        Símbolos no blancos de la cinta, de izquierda a derecha.
+        
+        Returns:
+            list: Símbolos de las celdas no blancas.
+        """
+        symbols = self._symbols
+        cells = []
+        for code, length in zip(self._run_codes, self._run_lengths):
+            if code:
+                cells += [symbols[code]] * length
+        return cells
+
+
+    def signature(self):
+        """
+        Resume el contenido no blanco de la cinta para compararlo con otro.
+        
+        Igual que en Tape, dos cintas con los mismos códigos tienen la misma
+        firma si y solo si sus celdas no blancas coinciden en contenido y
+        posición absoluta.
+        
+        Returns:
+            tuple: (posición de la primera celda no blanca, bytes de los
+                códigos hasta la última celda no blanca).
+        """
+        codes = self._run_codes
+        lengths = self._run_lengths
+
+        marked = [index for index, code in enumerate(codes) if code]
+        if not marked:
+            return 0, b""
+
+        first, last = marked[0], marked[-1]
+        cells = self.codes()[sum(lengths[:first]):sum(lengths[:last + 1])]
+        position = self._low + sum(lengths[:first])
+        return position, cells.tobytes() if isinstance(cells, array) else bytes(cells)
+
+
+    def read(self):
+        """
+        Lee el símbolo en la posición actual del cabezal.
+        
+        Si el cabezal está fuera de las celdas usadas, éstas se amplían
+        hasta incluirlo.
+        
+        Returns:
+            Símbolo en la posición actual del cabezal.
+        """
+        if self._run is None:
+            self._locate()
+        return self._symbols[self._run_codes[self._run]]
+
+
+    def write(self, symbol):
+        """
+        Escribe un símbolo en la posición actual del cabezal.
+        
+        La racha bajo el cabezal se divide si hace falta y la celda escrita
+        se une a las rachas vecinas con el mismo símbolo.
+        
+        Args:
+            symbol: Símbolo a escribir en la posición actual.
+        """
+        if self._run is None:
+            self._locate()
+
+        code = self._codes.get(symbol)
+        if code is None:
+            code = self._code(symbol)
+
+        codes = self._run_codes
+        lengths = self._run_lengths
+        run = self._run
+        offset = self._offset
+        old = codes[run]
+
+        if old == code:
+            return
+
+        self._counts[old] -= 1
+        self._counts[code] += 1
+
+        length = lengths[run]
+        last = len(codes) - 1
+
+        if length == 1:
+            # La racha entera cambia de símbolo; unirla con sus vecinas
+            codes[run] = code
+            if run < last and codes[run + 1] == code:
+                lengths[run] += lengths[run + 1]
+                del codes[run + 1], lengths[run + 1]
+            if run > 0 and codes[run - 1] == code:
+                self._offset = lengths[run - 1]
+                lengths[run - 1] += lengths[run]
+                del codes[run], lengths[run]
+                self._run = run - 1
+
+        elif offset == 0:
+            # Primera celda: pasa a la racha izquierda o a una nueva
+            lengths[run] -= 1
+            if run > 0 and codes[run - 1] == code:
+                self._run = run - 1
+                self._offset = lengths[run - 1]
+                lengths[run - 1] += 1
+            else:
+                codes.insert(run, code)
+                lengths.insert(run, 1)
+
+        elif offset == length - 1:
+            # Última celda: pasa a la racha derecha o a una nueva
+            lengths[run] -= 1
+            self._run = run + 1
+            self._offset = 0
+            if run < last and codes[run + 1] == code:
+                lengths[run + 1] += 1
+            else:
+                codes.insert(run + 1, code)
+                lengths.insert(run + 1, 1)
+
+        else:
+            # Celda interior: dividir la racha en tres
+            lengths[run] = offset
+            codes[run + 1:run + 1] = [code, old]
+            lengths[run + 1:run + 1] = [1, length - offset - 1]
+            self._run = run + 1
+            self._offset = 0
+
+
+    def move(self, direction):
+        """
+        Mueve el cabezal en la dirección especificada.
+        
+        Args:
+            direction (str): "L", "R" o "S".
+        
+        Raises:
+            ValueError: Si la dirección no es válida (L, R o S).
+        """
+        try:
+            step = MOVES[direction]
+        except KeyError:
+            raise ValueError(f"Movimiento no válido: {direction}") from None
+
+        if not step:
+            return
+        self._pos += step
+
+        run = self._run
+        if run is None:
+            return
+
+        offset = self._offset + step
+        if 0 <= offset < self._run_lengths[run]:
+            self._offset = offset
+        elif step > 0:
+            # Pasar a la racha siguiente (o salir por la derecha)
+            if run + 1 < len(self._run_lengths):
+                self._run, self._offset = run + 1, 0
+            else:
+                self._run = None
+        elif run > 0:
+            self._run, self._offset = run - 1, self._run_lengths[run - 1] - 1
+        else:
+            self._run = None
+
+
+    def snapshot(self, current_state):
+        """
+        Genera una descripción instantánea (ID) del estado actual de la cinta.
+        
+        Mismo formato que Tape.snapshot: contenido de las celdas usadas (_
+        para el blanco), marcador ^ del cabezal y estado actual. El contenido
+        se construye repitiendo cada racha, sin recorrer celda por celda.
+        
+        Args:
+            current_state: Estado actual de la máquina de Turing.
+        
+        Returns:
+            str: Representación en texto del estado de la cinta.
+        """
+        tape_str = "".join(
+            (symbol if symbol is not None else "_") * length for symbol, length in self.runs()
+        )
+        head_marker = " " * self.head + "^"
+        return f"{tape_str}\n{head_marker}\nEstado: {current_state}\n"
+
+
+    def _locate(self):
+        """
+        Ubica la racha bajo el cabezal, ampliando las celdas usadas si hace falta.
+        
+        Método privado. Las celdas nuevas se añaden como blancos a la
+        racha del extremo correspondiente (o a una racha nueva); si el
+        cabezal ya está dentro de las celdas usadas, se recorre la lista de
+        rachas.
+        """
+        codes = self._run_codes
+        lengths = self._run_lengths
+        pos = self._pos
+
+        if pos >= self._high:
+            grown = pos - self._high + 1
+            if codes and codes[-1] == 0:
+                lengths[-1] += grown
+            else:
+                codes.append(0)
+                lengths.append(grown)
+            self._counts[0] += grown
+            self._high = pos + 1
+            self._run, self._offset = len(codes) - 1, lengths[-1] - 1
+            return
+
+        if pos < self._low:
+            grown = self._low - pos
+            if codes and codes[0] == 0:
+                lengths[0] += grown
+            else:
+                codes.insert(0, 0)
+                lengths.insert(0, grown)
+            self._counts[0] += grown
+            self._low = pos
+            self._run, self._offset = 0, 0
+            return
+
+        offset = pos - self._low
+        for run, length in enumerate(lengths):
+            if offset < length:
+                self._run, self._offset = run, offset
+                return
+            offset -= length
+
+
+    def _code(self, symbol):
+        """
+        Devuelve el código entero de un símbolo, internándolo si es nuevo.
+        
+        Args:
+            symbol: Símbolo de la cinta.
+        
+        Returns:
+            int: Código del símbolo.
+        """
+        code = self._codes.get(symbol)
+        if code is None:
+            code = len(self._symbols)
+            self._symbols.append(symbol)
+            self._codes[symbol] = code
+            self._counts.append(0)
+        return code
@@ -5,7 +5,37 @@ Este módulo proporciona la clase Simulator que ejecuta simulaciones
 de Máquinas de Turing y genera registros detallados de cada transición.
 """
 
-from core.tape import Tape
+import time
+from array import array
+from collections import namedtuple
+
+from core.checkpoint import machine_fingerprint
+from core.history import RunHistory
+from core.loops import LoopDetector, LoopReport, find_cycle_start
+from core.profiling import SimulationProfile
+from core.rendering import IDRenderer
+from core.paged_tape import PagedTape
+from core.rle_tape import RunLengthTape
+from core.tape import MOVES, Tape
+
+
+# Representaciones de la cinta disponibles: nombre -> clase
+TAPE_TYPES = {
+    "dense": Tape,
+    "paged": PagedTape,
+    "runs": RunLengthTape,
+}
+
+
+# Registro estructurado de una transición aplicada durante la simulación.
+# step es el número de la transición (empezando en 1); state, cache y symbol
+# describen la configuración leída y new_state, new_cache, tape_output y
+# movement la salida de delta. id_before e id_after son las IDs formales.
+StepRecord = namedtuple("StepRecord", [
+    "step", "state", "cache", "symbol",
+    "new_state", "new_cache", "tape_output", "movement",
+    "id_before", "id_after",
+])
 
 
 class Simulator:
@@ -18,16 +48,52 @@ class Simulator:
     
     Attributes:
         machine (TuringMachine): Instancia de la Máquina de Turing a simular.
+        id_window (int): Celdas a cada lado del cabezal que se muestran en las
+            IDs del registro (None muestra la cinta completa).
+        budget (Budget): Límites de recursos por defecto de cada simulación
+            (None para no limitarlas).
+        detect_loops (bool): Si es True, las simulaciones que repiten una
+            configuración completa se rechazan en cuanto se detecta el ciclo.
+        profile (bool): Si es True, cada ejecución con registro acumula un
+            SimulationProfile (reglas, estados, cabezal y tiempos).
+        tape_type (str): Representación de la cinta (clave de TAPE_TYPES):
+            "dense" (Tape), "paged" (PagedTape, que solo reserva memoria
+            para las zonas con símbolos no blancos) o "runs" (RunLengthTape,
+            que guarda rachas de símbolos iguales).
+        loop (LoopReport): Inicio y longitud del ciclo con el que se rechazó
+            la última ejecución de run_fast (o None si no se detectó ciclo).
     """
 
-    def __init__(self, machine):
+    def __init__(self, machine, id_window=None, budget=None, detect_loops=False, profile=False, tape_type="dense"):
         """
         Inicializa el simulador con una Máquina de Turing.
         
         Args:
             machine (TuringMachine): Máquina de Turing configurada que se va a simular.
+            id_window (int): Celdas a cada lado del cabezal a mostrar en las IDs
+                del registro (None para mostrar la cinta completa).
+            budget (Budget): Límites de recursos por defecto de cada simulación.
+            detect_loops (bool): Rechazar las simulaciones que entran en un ciclo.
+            profile (bool): Perfilar las ejecuciones con registro.
+            tape_type (str): Representación de la cinta de las simulaciones
+                con registro y de run_fast.
+        
+        Raises:
+            ValueError: Si la representación de la cinta no es válida.
         """
+        if tape_type not in TAPE_TYPES:
+            raise ValueError(f"Tipo de cinta no válido: {tape_type}")
+
         self.machine = machine
+        self.id_window = id_window
+        self.budget = budget
+        self.detect_loops = detect_loops
+        self.profile = profile
+        self.tape_type = tape_type
+        self.loop = None
+
+        # Historial de la última cadena consultada con configuration_at
+        self._history = None
 
 
     def format_id(self, tape, state, cache):
@@ -47,89 +113,728 @@ class Simulator:
             str: ID formal con formato [estado,cache]símbolo...
                 Ejemplo: [q0,B]aab#aab (cuando el cabezal está al inicio)
         """
-        symbols = tape.tape
-        head = tape.head
+        return IDRenderer(tape).render(tape, state, cache)
+
+
+    def header_lines(self, input_str):
+        """
+        Genera las líneas de encabezado del registro de una simulación.
+        
+        Args:
+            input_str (str): Cadena de entrada simulada.
+        
+        Returns:
+            list: Lista de strings con el encabezado, en el mismo formato
+                que las primeras entradas del log de run_string.
+        """
+        return [
+            "-"*50 + f"\nSimulación para la cadena: {input_str}\n" + "-"*50 + "\n",
+            "Para esta cadena, las transiciones son:\n",
+        ]
+
+
+    def format_rule(self, record):
+        """
+        Construye la regla formal aplicada en un paso de la simulación.
+        
+        Args:
+            record (StepRecord): Registro del paso.
+        
+        Returns:
+            str: Regla con formato δ([q, c], a) = ([q', c'], b, D).
+        """
+        # Cambiar representación B
+        sym_in = record.symbol if record.symbol is not None else "B"
+        sym_out = record.tape_output if record.tape_output is not None else "B"
 
-        mem_display = cache if cache is not None else "B"
+        mem_before = record.cache if record.cache is not None else "B"
+        mem_after = record.new_cache if record.new_cache is not None else "B"
 
-        id_str = ""
+        return (
+            f"δ([{record.state}, {mem_before}], {sym_in}) = "
+            f"([{record.new_state}, {mem_after}], {sym_out}, {record.movement})"
+        )
 
-        for i, sym in enumerate(symbols):
-            s = sym if sym is not None else "B"
 
-            if i == head:
-                id_str += f"[{state},{mem_display}]{s}"
-            else:
-                id_str += s
+    def format_step(self, record):
+        """
+        Construye la línea de log correspondiente a un paso de la simulación.
+        
+        Args:
+            record (StepRecord): Registro del paso.
+        
+        Returns:
+            str: Línea con la regla formal, el ID anterior y el ID posterior.
+        """
+        rule_str = self.format_rule(record)
+        return f"{rule_str:<40} {record.id_before:<20} ⊢   {record.id_after}"
+
+
+    def iter_steps(self, input_str, budget=None):
+        """
+        Prepara una ejecución perezosa de la máquina sobre una cadena.
+        
+        A diferencia de run_string, no acumula el registro en memoria: la
+        ejecución devuelta produce un StepRecord por transición a medida
+        que se itera sobre ella.
+        
+        Args:
+            input_str (str): Cadena de entrada a procesar por la máquina.
+            budget (Budget): Límites de recursos de esta ejecución (None usa
+                el presupuesto del simulador).
+        
+        Returns:
+            SimulationRun: Ejecución iterable; al agotarse, sus atributos
+                accepted y tape contienen el veredicto y la cinta final, abort
+                el resumen si se superó el presupuesto y loop el ciclo
+                detectado si la ejecución se rechazó por repetirse.
+        """
+        return SimulationRun(self, input_str, budget if budget is not None else self.budget)
+
+
+    def resume(self, checkpoint, budget=None):
+        """
+        Reanuda una ejecución desde un punto de control.
+        
+        La ejecución continúa desde la transición siguiente a la guardada,
+        sin repetir el encabezado, y produce las mismas líneas de registro
+        que habría producido la ejecución original.
+        
+        Args:
+            checkpoint (dict): Punto de control (SimulationRun.checkpoint o
+                load_checkpoint).
+            budget (Budget): Límites de recursos de esta ejecución (None usa
+                el presupuesto del simulador); el tiempo ya consumido se
+                descuenta del límite de tiempo.
+        
+        Returns:
+            SimulationRun: Ejecución iterable en la configuración guardada.
+        
+        Raises:
+            ValueError: Si el punto de control corresponde a otra máquina.
+        """
+        if checkpoint["machine"] != machine_fingerprint(self.machine):
+            raise ValueError("El punto de control corresponde a otra máquina")
+
+        return SimulationRun.restore(self, checkpoint, budget if budget is not None else self.budget)
+
+
+    def history(self, input_str, interval=None, undo_depth=None):
+        """
+        Crea un historial navegable de la simulación de una cadena.
+        
+        El historial permite ir a cualquier paso (seek), avanzar (forward) y
+        retroceder (back), obteniendo en cada caso la configuración completa.
+        
+        Args:
+            input_str (str): Cadena de entrada a simular.
+            interval (int): Pasos entre configuraciones guardadas (None usa
+                el valor por defecto de RunHistory).
+            undo_depth (int): Pasos recientes que pueden deshacerse sin
+                repetir la simulación (None usa el valor por defecto).
+        
+        Returns:
+            RunHistory: Historial en la configuración inicial.
+        """
+        options = {}
+        if interval is not None:
+            options["interval"] = interval
+        if undo_depth is not None:
+            options["undo_depth"] = undo_depth
+        return RunHistory(self, input_str, **options)
+
+
+    def ring_trace(self, input_str, last=None, every=None, max_samples=None, budget=None):
+        """
+        Prepara un registro acotado de la simulación de una cadena.
+        
+        El registro conserva solo los últimos pasos y un paso de cada cierto
+        número de pasos, y genera sus líneas al terminar la simulación, por
+        lo que su memoria y su costo de formato no dependen de la duración
+        de la ejecución.
+        
+        Args:
+            input_str (str): Cadena de entrada a simular.
+            last (int): Últimos pasos que se conservan (None usa el valor
+                por defecto de RingTrace).
+            every (int): Pasos entre pasos muestreados (None usa el valor
+                por defecto; 0 no toma muestras).
+            max_samples (int): Muestras que se conservan (None usa el valor
+                por defecto).
+            budget (Budget): Límites de recursos de esta ejecución (None usa
+                el presupuesto del simulador).
+        
+        Returns:
+            RingTrace: Registro sin ejecutar; run() simula la cadena y
+                lines() genera el registro.
+        """
+        from core.ring_trace import RingTrace
 
-        return id_str
+        options = {}
+        if last is not None:
+            options["last"] = last
+        if every is not None:
+            options["every"] = every or None
+        if max_samples is not None:
+            options["max_samples"] = max_samples
+        return RingTrace(self, input_str, budget=budget if budget is not None else self.budget, **options)
 
 
-    def run_string(self, input_str):
+    def configuration_at(self, input_str, step):
+        """
+        Reconstruye la configuración de la máquina tras un número de pasos.
+        
+        Conserva el historial de la última cadena consultada, de modo que
+        las consultas sucesivas sobre la misma cadena parten de la
+        configuración guardada más cercana en lugar de simular desde el
+        inicio: solo la primera consulta de un paso posterior a todos los
+        anteriores cuesta tantos pasos como su número.
+        
+        Args:
+            input_str (str): Cadena de entrada simulada.
+            step (int): Número de pasos aplicados (0 es la configuración inicial).
+        
+        Returns:
+            Configuration: Paso, estado, cache, cinta e ID; la ID coincide
+                con la ID posterior del paso en el registro.
+        
+        Raises:
+            IndexError: Si el paso es negativo o la simulación termina antes.
+        """
+        if self._history is None or self._history.input_str != input_str:
+            self._history = self.history(input_str)
+
+        self._history.seek(step)
+        return self._history.configuration()
+
+
+    def run_string(self, input_str, budget=None):
         """
         Ejecuta la simulación de la Máquina de Turing sobre una cadena de entrada.
         
         Simula paso a paso la ejecución de la máquina sobre la cadena proporcionada,
         registrando cada transición con su función delta, ID antes y después.
-        La simulación continúa hasta alcanzar el estado final o hasta que no
-        exista una transición válida.
+        La simulación continúa hasta alcanzar el estado final, hasta que no
+        exista una transición válida o hasta agotar el presupuesto de recursos.
         
         Args:
             input_str (str): Cadena de entrada a procesar por la máquina.
+            budget (Budget): Límites de recursos de esta ejecución (None usa
+                el presupuesto del simulador).
         
         Returns:
             tuple: (aceptada, log, tape) donde:
-                - aceptada (bool): True si la cadena fue aceptada (llegó al estado final) / False si fue rechazada (no hay transición válida).
+                - aceptada (bool): True si la cadena fue aceptada (llegó al estado final) / False si fue rechazada (no hay transición válida) / None si se abortó por exceder el presupuesto.
                 - log (list): Lista de strings con el registro detallado de la simulación, incluyendo cada transición en formato formal.
                 - tape (Tape): Estado final de la cinta después de la simulación.
         """
-        tape = Tape(input_str, blank_symbol=self.machine.blank_symbol)
+        run = self.iter_steps(input_str, budget)
+        log = list(run.lines())  # Lista de líneas formateadas para el archivo
+
+        return run.accepted, log, run.tape
+
+
+    def run_fast(self, input_str, budget=None):
+        """
+        Ejecuta la simulación sin generar registro de transiciones.
+        
+        Variante de run_string pensada para mediciones y análisis: aplica
+        exactamente las mismas transiciones, pero omite la construcción de
+        IDs, reglas formales y líneas de log. Usa la tabla compilada de la
+        máquina y opera directamente sobre los códigos de la cinta, por lo
+        que cada paso es un acceso a lista y una escritura en el buffer.
+        Los bucles de barrido se ejecutan como un único macro-paso que
+        recorre toda la racha de celdas, sumando un paso por celda. Con
+        detect_loops, la simulación se rechaza al repetirse una configuración
+        y el inicio y la longitud del ciclo quedan en el atributo loop.
+        Con una cinta distinta de la densa, la simulación consulta delta
+        sobre esa representación.
+        
+        Args:
+            input_str (str): Cadena de entrada a procesar por la máquina.
+            budget (Budget): Límites de recursos de esta ejecución (None usa
+                el presupuesto del simulador).
+        
+        Returns:
+            tuple: (aceptada, pasos, tape) donde:
+                - aceptada (bool): True si la cadena fue aceptada / False si fue rechazada / None si se abortó por exceder el presupuesto.
+                - pasos (int): Número de transiciones aplicadas (líneas ⊢ del log).
+                - tape (Tape): Estado final de la cinta después de la simulación.
+        """
+        self.loop = None
+        if budget is None:
+            budget = self.budget
+        clock = budget.start() if budget is not None else None
+
+        compiled = self.machine.compile()
+        tape_class = TAPE_TYPES[self.tape_type]
+        if tape_class is not Tape:
+            # Los bucles compilados requieren el buffer contiguo de Tape
+            return self._run_delta(tape_class(input_str, blank_symbol=self.machine.blank_symbol), input_str, clock)
+
+        tape = Tape(input_str, blank_symbol=self.machine.blank_symbol, symbols=compiled.symbols)
+
+        # Los símbolos de la entrada ajenos a la máquina no tienen columna en la tabla
+        if len(tape.symbols) > compiled.n_symbols:
+            return self._run_delta(tape, input_str, clock)
+
+        if self.detect_loops:
+            return self._run_detecting(tape, input_str, clock)
+
+        table = compiled.table
+        base = compiled.initial_base
+        buffer, start, end, pos = tape.cursor()
+
+        steps = 0
+        # Con presupuesto, el primer control ocurre antes del primer paso
+        limit = 0 if clock is not None else float("inf")
+
+        while True:
+            if steps >= limit:
+                if clock.check(steps, len(tape)) is not None:
+                    tape.seek(pos)
+                    return None, steps, tape
+                limit = clock.next_check(steps)
+
+            if not start <= pos < end:
+                # Expandir la cinta; el buffer puede haberse reubicado
+                tape.seek(pos)
+                tape.read()
+                buffer, start, end, pos = tape.cursor()
+
+                # Revisar el límite de celdas antes del siguiente paso
+                if clock is not None:
+                    limit = min(limit, steps + 1)
+
+            entry = table[base + buffer[pos]]
+
+            if entry is None:
+                tape.seek(pos)
+                return False, steps, tape
+
+            base, tape_output, movement, accepts, _, sweep = entry
+
+            if sweep is not None and type(buffer) is bytearray:
+                # Recorrer de una vez la racha de celdas del bucle de barrido
+                if movement > 0:
+                    cells = buffer[pos:end]
+                    run = len(cells) - len(cells.lstrip(sweep))
+                else:
+                    cells = buffer[start:pos + 1]
+                    run = len(cells) - len(cells.rstrip(sweep))
+
+                if steps + run > limit:
+                    run = limit - steps
+
+                pos += run * movement
+                steps += run
+                continue
+
+            buffer[pos] = tape_output
+            pos += movement
+            steps += 1
+
+            if accepts:
+                tape.seek(pos)
+                return True, steps, tape
+
+
+    def _run_detecting(self, tape, input_str, clock=None):
+        """
+        Ejecuta la tabla compilada vigilando si la configuración se repite.
+        
+        Método privado usado por run_fast con detect_loops. Igual que el
+        bucle principal, pero sin macro-pasos de barrido (cada paso debe
+        observarse) y actualizando el hash de la configuración en cada
+        escritura; el control se identifica por la base de la tabla. Al
+        detectar un ciclo guarda su inicio y su longitud en self.loop.
+        
+        Args:
+            tape (Tape): Cinta inicial de la simulación.
+            input_str (str): Cadena de entrada, para localizar el inicio del ciclo.
+            clock (BudgetClock): Reloj del presupuesto (None sin límites).
+        
+        Returns:
+            tuple: (aceptada, pasos, tape), igual que run_fast; aceptada es
+                False si se detectó un ciclo.
+        """
+        compiled = self.machine.compile()
+        table = compiled.table
+        base = compiled.initial_base
+
+        detector = LoopDetector(tape, base, 0)
+        observe = detector.observe
+        write = detector.write
+
+        buffer, start, end, pos = tape.cursor()
+        offset = start + tape.origin
+
+        steps = 0
+        limit = 0 if clock is not None else float("inf")
+
+        while True:
+            if steps >= limit:
+                if clock.check(steps, len(tape)) is not None:
+                    tape.seek(pos)
+                    return None, steps, tape
+                limit = clock.next_check(steps)
+
+            if not start <= pos < end:
+                tape.seek(pos)
+                tape.read()
+                buffer, start, end, pos = tape.cursor()
+                offset = start + tape.origin
+
+                if clock is not None:
+                    limit = min(limit, steps + 1)
+
+            code = buffer[pos]
+            entry = table[base + code]
+
+            if entry is None:
+                tape.seek(pos)
+                return False, steps, tape
+
+            base, tape_output, movement, accepts, _, _ = entry
+
+            write(pos - offset, code, tape_output)
+            buffer[pos] = tape_output
+            pos += movement
+            steps += 1
+
+            if accepts:
+                tape.seek(pos)
+                return True, steps, tape
+
+            length = observe(steps, base, pos - offset)
+            if length is not None:
+                tape.seek(pos)
+                self.loop = LoopReport(find_cycle_start(self.machine, input_str, length), length, steps)
+                return False, steps, tape
+
+
+    def _run_delta(self, tape, input_str, clock=None):
+        """
+        Ejecuta la simulación sin registro consultando directamente delta.
+        
+        Método privado usado por run_fast cuando la cinta contiene símbolos
+        que no aparecen en la tabla compilada o la cinta no es una Tape.
+        Respeta detect_loops, guardando el ciclo detectado en self.loop.
+        
+        Args:
+            tape (Tape | PagedTape | RunLengthTape): Cinta inicial de la simulación.
+            input_str (str): Cadena de entrada, para localizar el inicio del ciclo.
+            clock (BudgetClock): Reloj del presupuesto (None sin límites).
+        
+        Returns:
+            tuple: (aceptada, pasos, tape), igual que run_fast.
+        """
         state = self.machine.initial_state
         cache = None
 
-        log = []  # Lista de líneas formateadas para el archivo
+        delta = self.machine.delta
+        final_state = self.machine.final_state
 
-        log.append("-"*50 + f"\nSimulación para la cadena: {input_str}\n" + "-"*50 + "\n")
-        log.append("Para esta cadena, las transiciones son:\n")
-
-        step = 0
+        steps = 0
+        detector = LoopDetector(tape, (state, cache), 0) if self.detect_loops else None
 
         while True:
-            id_before = self.format_id(tape, state, cache)
+            if clock is not None and clock.check(steps, len(tape)) is not None:
+                return None, steps, tape
 
             symbol = tape.read()
-            key = (state, cache, symbol)
+            rule = delta.get((state, cache, symbol))
 
-            if key not in self.machine.delta:
-                return False, log, tape
+            if rule is None:
+                return False, steps, tape
 
-            new_state, new_cache, tape_output, movement = self.machine.delta[key]
+            state, cache, tape_output, movement = rule
 
-            # Cambiar representación B
-            sym_in = symbol if symbol is not None else "B"
-            sym_out = tape_output if tape_output is not None else "B"
+            if detector is not None:
+                detector.write(tape.head - tape.origin, tape.code(symbol), tape.code(tape_output))
 
-            mem_before = cache if cache is not None else "B"
-            mem_after = new_cache if new_cache is not None else "B"
+            tape.write(tape_output)
+            tape.move(movement)
+            steps += 1
 
-            # Regla formal:
-            rule_str = (
-                f"δ([{state}, {mem_before}], {sym_in}) = "
-                f"([{new_state}, {mem_after}], {sym_out}, {movement})"
-            )
+            if state == final_state:
+                return True, steps, tape
+
+            if detector is not None:
+                length = detector.observe(steps, (state, cache), tape.head - tape.origin)
+                if length is not None:
+                    self.loop = LoopReport(find_cycle_start(self.machine, input_str, length), length, steps)
+                    return False, steps, tape
+
+
+class SimulationRun:
+    """
+    Ejecución paso a paso de la Máquina de Turing sobre una cadena.
+    
+    Se itera sobre la instancia para obtener un StepRecord por cada
+    transición aplicada, sin conservar los pasos anteriores, o sobre
+    lines() para obtener directamente las líneas del registro. Cuando la
+    iteración termina, accepted indica el veredicto y tape la cinta final.
+    
+    Attributes:
+        simulator (Simulator): Simulador que creó la ejecución.
+        input_str (str): Cadena de entrada simulada.
+        tape (Tape): Cinta de la ejecución.
+        renderer (IDRenderer): Generador incremental de las IDs del registro.
+        state (str): Estado actual de la máquina.
+        cache: Valor actual de la memoria cache (None representa B).
+        steps (int): Número de transiciones aplicadas hasta el momento.
+        log_bytes (int): Bytes (UTF-8) de las líneas producidas por lines().
+        clock (BudgetClock): Reloj del presupuesto (None sin límites).
+        accepted (bool): None mientras la ejecución no termina o si se
+            abortó; True si la cadena fue aceptada o False si fue rechazada.
+        abort (BudgetReport): Resumen con el recurso agotado y las
+            estadísticas parciales si la ejecución se abortó (o None).
+        loop (LoopReport): Inicio y longitud del ciclo si la ejecución se
+            rechazó por repetir una configuración (o None).
+        profile (SimulationProfile): Perfil de la ejecución si el simulador
+            tiene activado el perfilado (o None).
+    """
+
+    def __init__(self, simulator, input_str, budget=None):
+        """
+        Inicializa la ejecución con la configuración inicial de la máquina.
+        
+        Args:
+            simulator (Simulator): Simulador cuya máquina se ejecuta.
+            input_str (str): Cadena de entrada a procesar.
+            budget (Budget): Límites de recursos de la ejecución (None sin límites).
+        """
+        self.simulator = simulator
+        self.input_str = input_str
+
+        machine = simulator.machine
+        tape_class = TAPE_TYPES[simulator.tape_type]
+        self.tape = tape_class(input_str, blank_symbol=machine.blank_symbol)
+        self.renderer = IDRenderer(self.tape, window=simulator.id_window)
+        self.profile = SimulationProfile() if simulator.profile else None
+        if self.profile is not None:
+            self.profile.instrument(self.renderer)
+        self.state = machine.initial_state
+        self.cache = None
+        self.steps = 0
+        self.log_bytes = 0
+        self.clock = budget.start() if budget is not None else None
+        self.accepted = None
+        self.abort = None
+        self.loop = None
+
+        self._detector = None
+        if simulator.detect_loops:
+            self._detector = LoopDetector(self.tape, (self.state, self.cache), 0)
+
+
+    @classmethod
+    def restore(cls, simulator, checkpoint, budget=None):
+        """
+        Reconstruye una ejecución a partir de un punto de control.
+        
+        Args:
+            simulator (Simulator): Simulador cuya máquina se ejecuta.
+            checkpoint (dict): Valor devuelto por checkpoint().
+            budget (Budget): Límites de recursos de la ejecución (None sin límites).
+        
+        Returns:
+            SimulationRun: Ejecución en la configuración guardada.
+        """
+        run = cls(simulator, checkpoint["input"])
+
+        symbols = checkpoint["symbols"]
+        if checkpoint["wide"]:
+            codes = array("I")
+            codes.frombytes(checkpoint["codes"])
+        else:
+            codes = checkpoint["codes"]
+
+        run.tape = type(run.tape).from_codes(
+            codes, symbols, head=checkpoint["head"], origin=checkpoint["origin"],
+            blank_symbol=symbols[0]
+        )
+        run.renderer = IDRenderer(run.tape, window=simulator.id_window)
+        if run.profile is not None:
+            run.profile.instrument(run.renderer)
+        run.state = checkpoint["state"]
+        run.cache = checkpoint["cache"]
+        run.steps = checkpoint["steps"]
+        run.log_bytes = checkpoint["log_bytes"]
+        run.clock = budget.start(checkpoint["elapsed"]) if budget is not None else None
+
+        if simulator.detect_loops:
+            if checkpoint["loops"] is not None:
+                run._detector = LoopDetector.restore(run.tape, checkpoint["loops"])
+            else:
+                head = run.tape.head - run.tape.origin
+                run._detector = LoopDetector(run.tape, (run.state, run.cache), head, run.steps)
+        else:
+            run._detector = None
+        return run
+
+
+    def checkpoint(self):
+        """
+        Resume la configuración completa de la ejecución para reanudarla.
+        
+        Returns:
+            dict: Máquina (huella), cadena, estado, cache, cinta (códigos,
+                símbolos, cabezal y origen), pasos, bytes de registro
+                producidos, tiempo consumido y estado del detector de ciclos.
+        """
+        codes = self.tape.codes()
+        wide = not isinstance(codes, bytearray)
+
+        elapsed = 0.0
+        if self.clock is not None:
+            elapsed = time.monotonic() - self.clock.started
+
+        return {
+            "machine": machine_fingerprint(self.simulator.machine),
+            "input": self.input_str,
+            "state": self.state,
+            "cache": self.cache,
+            "symbols": list(self.tape.symbols),
+            "codes": codes.tobytes() if wide else bytes(codes),
+            "wide": wide,
+            "head": self.tape.head,
+            "origin": self.tape.origin,
+            "steps": self.steps,
+            "log_bytes": self.log_bytes,
+            "elapsed": elapsed,
+            "loops": self._detector.state() if self._detector is not None else None,
+        }
+
+
+    def lines(self):
+        """
+        Avanza la simulación produciendo las líneas del registro.
+        
+        Incluye el encabezado (salvo en una ejecución reanudada) y una línea
+        por transición, y contabiliza su tamaño para el límite de bytes de
+        registro del presupuesto.
+        
+        Yields:
+            str: Línea del registro (sin salto de línea final).
+        """
+        simulator = self.simulator
+
+        format_step = simulator.format_step
+        if self.profile is not None:
+            format_step = self.profile.timed("log", format_step)
+
+        if self.log_bytes == 0:
+            for line in simulator.header_lines(self.input_str):
+                self.log_bytes += len(line.encode("utf-8")) + 1
+                yield line
+
+        for record in self:
+            line = format_step(record)
+            self.log_bytes += len(line.encode("utf-8")) + 1
+            yield line
+
+
+    def __iter__(self):
+        """
+        Avanza la simulación produciendo un registro por transición.
+        
+        Si la ejecución tiene perfil, cada paso se cronometra y se registra
+        en él; sin perfil, la iteración no tiene ningún costo adicional.
+        
+        Returns:
+            iterator: Iterador de StepRecord, uno por transición aplicada.
+        """
+        if self.profile is not None:
+            return self._profiled_steps()
+        return self._steps()
+
+
+    def _profiled_steps(self):
+        """
+        Avanza la simulación registrando cada paso en el perfil.
+        
+        Método privado usado por __iter__ cuando el perfilado está activado.
+        
+        Yields:
+            StepRecord: Registro de la transición recién aplicada.
+        """
+        profile = self.profile
+        seconds = profile.seconds
+        clock = time.perf_counter
+        tape = self.tape
+        steps = self._steps()
+
+        while True:
+            start = clock()
+            record = next(steps, None)
+            seconds["step"] += clock() - start
+
+            if record is None:
+                return
+
+            profile.observe(record, tape.head - tape.origin - MOVES[record.movement])
+            yield record
+
+
+    def _steps(self):
+        """
+        Avanza la simulación produciendo un registro por transición.
+        
+        Método privado con el bucle principal de la ejecución.
+        
+        Yields:
+            StepRecord: Registro de la transición recién aplicada.
+        """
+        machine = self.simulator.machine
+        renderer = self.renderer
+        clock = self.clock
+        tape = self.tape
+        detector = self._detector
+
+        while self.accepted is None and self.abort is None:
+            if clock is not None:
+                self.abort = clock.check(self.steps, len(tape), self.log_bytes)
+                if self.abort is not None:
+                    return
+
+            state = self.state
+            cache = self.cache
+
+            id_before = renderer.render(tape, state, cache)
+
+            symbol = tape.read()
+            rule = machine.delta.get((state, cache, symbol))
+
+            if rule is None:
+                self.accepted = False
+                return
+
+            new_state, new_cache, tape_output, movement = rule
+
+            if detector is not None:
+                detector.write(tape.head - tape.origin, tape.code(symbol), tape.code(tape_output))
 
             # Aplicar transición
             tape.write(tape_output)
-            cache = new_cache
+            renderer.write(tape, tape.head, tape_output)
             tape.move(movement)
-            state = new_state
+            self.state = new_state
+            self.cache = new_cache
+            self.steps += 1
 
-            id_after = self.format_id(tape, state, cache)
+            if new_state == machine.final_state:
+                self.accepted = True
+            elif detector is not None:
+                length = detector.observe(self.steps, (new_state, new_cache), tape.head - tape.origin)
+                if length is not None:
+                    start = find_cycle_start(machine, self.input_str, length)
+                    self.loop = LoopReport(start, length, self.steps)
+                    self.accepted = False
 
-            # Registrar transición formal
-            log.append(f"{rule_str:<40} {id_before:<20} ⊢   {id_after}")
-
-            if state == self.machine.final_state:
-                return True, log, tape
-
-            step += 1
+            yield StepRecord(
+                self.steps, state, cache, symbol,
+                new_state, new_cache, tape_output, movement,
+                id_before, renderer.render(tape, new_state, new_cache),
+            )
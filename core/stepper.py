@@ -0,0 +1,167 @@
+"""
+Módulo para el avance reversible sobre la tabla compilada.
+
+Este módulo proporciona la clase Stepper, que aplica los pasos de una
+simulación sobre la tabla compilada de la máquina y el buffer de una Tape
+dejando un registro de deshacer por paso, y que deshace esos pasos. Es la
+base de los registros que reconstruyen configuraciones anteriores de una
+simulación (RunHistory y RingTrace).
+"""
+
+from collections import deque
+
+
+class Stepper:
+    """
+    Avance paso a paso, con registros de deshacer, sobre la tabla compilada.
+    
+    Cada paso lee la celda del cabezal sin expandir la cinta (si no hay
+    transición, la configuración final conserva sus celdas usadas), la
+    expande solo si la transición existe y guarda en undo el registro
+    (base, posición relativa al inicio de la entrada, código leído y
+    extremo por el que se expandió la cinta). Los símbolos de la entrada
+    ajenos a la máquina no tienen columna en la tabla, por lo que la
+    simulación se rechaza al leerlos. No hay macro-pasos de barrido, ya
+    que cada paso debe poder deshacerse.
+    
+    Attributes:
+        compiled (CompiledMachine): Tabla compilada de la máquina.
+        tape (Tape): Cinta de la simulación (se modifica).
+        base (int): Base de la tabla del estado y cache actuales.
+        steps (int): Pasos aplicados.
+        undo (deque): Registros de deshacer de los últimos pasos aplicados.
+        detector (LoopDetector): Detector de ciclos (None sin detección).
+        accepted (bool): None mientras la simulación no termine; True si
+            alcanzó el estado final o False si no hubo transición o se
+            detectó un ciclo.
+        cycle (int): Longitud del ciclo detectado (o None).
+    """
+
+    def __init__(self, compiled, tape, base, steps=0, undo=None, detector=None):
+        """
+        Prepara el avance desde una configuración.
+        
+        Args:
+            compiled (CompiledMachine): Tabla compilada de la máquina.
+            tape (Tape): Cinta de la configuración, con los códigos de compiled.
+            base (int): Base de la tabla del estado y cache de la configuración.
+            steps (int): Número de paso de la configuración.
+            undo (deque): Registros de deshacer de los pasos que llevaron a
+                la configuración (None para empezar sin registros); su
+                longitud máxima acota los pasos que pueden deshacerse.
+            detector (LoopDetector): Detector de ciclos ya inicializado con
+                la configuración (None para no detectar ciclos).
+        """
+        self.compiled = compiled
+        self.tape = tape
+        self.base = base
+        self.steps = steps
+        self.undo = undo if undo is not None else deque()
+        self.detector = detector
+        self.accepted = None
+        self.cycle = None
+
+
+    def advance(self, limit, stop_on_grow=False):
+        """
+        Aplica pasos hasta el paso limit o hasta que la simulación termine.
+        
+        Args:
+            limit (int): Paso en el que detenerse.
+            stop_on_grow (bool): Detenerse también tras un paso que expandió
+                la cinta, para revisar el límite de celdas del presupuesto.
+        
+        Returns:
+            bool: True si la simulación terminó.
+        """
+        if self.accepted is not None:
+            return True
+
+        compiled = self.compiled
+        table = compiled.table
+        n_symbols = compiled.n_symbols
+        record = self.undo.append
+        detector = self.detector
+
+        tape = self.tape
+        base = self.base
+        steps = self.steps
+        buffer, start, end, pos = tape.cursor()
+        offset = start + tape.origin
+
+        while steps < limit:
+            # Leer sin expandir la cinta: si no hay transición, la
+            # configuración final debe conservar sus celdas usadas
+            if start <= pos < end:
+                code = buffer[pos]
+                grown = 0
+            else:
+                code = 0
+                grown = 1 if pos >= end else -1
+
+            # Los símbolos de la entrada ajenos a la máquina no tienen columna en la tabla
+            entry = table[base + code] if code < n_symbols else None
+
+            if entry is None:
+                self.accepted = False
+                break
+
+            if grown:
+                # Expandir la cinta; el buffer puede haberse reubicado
+                tape.seek(pos)
+                tape.read()
+                buffer, start, end, pos = tape.cursor()
+                offset = start + tape.origin
+
+            record((base, pos - offset, code, grown))
+
+            base, tape_output, movement, accepts, _, _ = entry
+            if detector is not None:
+                detector.write(pos - offset, code, tape_output)
+
+            buffer[pos] = tape_output
+            pos += movement
+            steps += 1
+
+            if accepts:
+                self.accepted = True
+                break
+
+            if detector is not None:
+                length = detector.observe(steps, base, pos - offset)
+                if length is not None:
+                    self.accepted = False
+                    self.cycle = length
+                    break
+
+            if grown and stop_on_grow:
+                break
+
+        tape.seek(pos)
+        self.base = base
+        self.steps = steps
+        return self.accepted is not None
+
+
+    def undo_step(self):
+        """
+        Deshace el último paso aplicado con su registro de deshacer.
+        
+        Debe haber al menos un registro disponible. El detector de ciclos
+        no se deshace, por lo que no debe usarse junto con undo_step.
+        """
+        base, position, code, grown = self.undo.pop()
+
+        tape = self.tape
+        buffer, start, _, _ = tape.cursor()
+        pos = start + tape.origin + position
+
+        buffer[pos] = code
+        if grown:
+            tape.retract(grown)
+        tape.seek(pos)
+
+        self.base = base
+        self.steps -= 1
+        self.accepted = None
+        self.cycle = None
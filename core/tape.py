@@ -1,3 +1,13 @@
+from array import array
+
+
+# Desplazamiento del cabezal asociado a cada movimiento válido
+MOVES = {"L": -1, "R": 1, "S": 0}
+
+# Celdas en blanco reservadas a cada lado de la entrada al crear la cinta
+INITIAL_MARGIN = 16
+
+
 class Tape:
     """
     Modela la cinta de la Máquina de Turing.
@@ -6,23 +16,274 @@ class Tape:
     según sea necesario. La cinta contiene símbolos y mantiene un cabezal
     de lectura/escritura que puede moverse en ambas direcciones.
     
+    Internamente los símbolos se guardan como códigos enteros en un buffer
+    compacto (bytearray) con espacio libre a ambos lados de las celdas
+    usadas. Cuando el cabezal sale del buffer éste se duplica y se recentra,
+    por lo que crecer hacia cualquiera de los dos lados cuesta O(1)
+    amortizado. Las celdas fuera del buffer usado contienen el código del
+    blanco (0).
+    
     Attributes:
         blank_symbol: Símbolo que representa las celdas vacías de la cinta.
-        tape (list): Lista de símbolos en la cinta.
-        head (int): Posición actual del cabezal de lectura/escritura.
+        tape (list): Lista de símbolos en la cinta (vista calculada a partir
+            del buffer, desde la celda visitada más a la izquierda).
+        head (int): Posición actual del cabezal de lectura/escritura,
+            relativa a la primera celda de tape.
+        origin (int): Índice en tape de la primera celda de la entrada;
+            aumenta cada vez que la cinta se expande hacia la izquierda.
     """
 
-    def __init__(self, input_string: str, blank_symbol=None):
+    def __init__(self, input_string: str, blank_symbol=None, symbols=None):
         """
         Inicializa la cinta con una cadena de entrada.
         
         Args:
             input_string (str): Cadena inicial que se cargará en la cinta.
             blank_symbol: Símbolo que representa espacios en blanco (por defecto None).
+            symbols (list): Símbolos a internar antes que los de la entrada,
+                en orden de código (por ejemplo CompiledMachine.symbols, cuyo
+                primer elemento es el blanco). Permite que la cinta comparta
+                los códigos de una tabla de transiciones compilada.
         """
         self.blank_symbol = blank_symbol
-        self.tape = list(input_string)
-        self.head = 0
+
+        # Tabla de internado: código -> símbolo y símbolo -> código
+        self._symbols = [blank_symbol]
+        self._codes = {blank_symbol: 0}
+        self._wide = False
+
+        for sym in symbols or ():
+            self._code(sym)
+
+        codes = [self._code(sym) for sym in input_string]
+        margin = self._pack([0]) * INITIAL_MARGIN
+        self._buffer = margin + self._pack(codes) + margin
+
+        # Celdas usadas: buffer[_start:_end]; cabezal en buffer[_pos]
+        self._input_start = INITIAL_MARGIN
+        self._start = INITIAL_MARGIN
+        self._end = INITIAL_MARGIN + len(codes)
+        self._pos = INITIAL_MARGIN
+
+
+    @classmethod
+    def from_codes(cls, codes, symbols, head=0, origin=0, blank_symbol=None):
+        """
+        Construye una cinta a partir de códigos de símbolos ya internados.
+        
+        Permite a los motores que trabajan directamente con códigos (por
+        ejemplo, con la tabla compilada de la máquina) devolver una cinta
+        equivalente a la que habría producido la simulación paso a paso.
+        
+        Args:
+            codes (list): Código de cada celda usada, de izquierda a derecha.
+            symbols (list): Símbolo correspondiente a cada código (el código
+                0 debe ser el blanco).
+            head (int): Posición del cabezal relativa a la primera celda.
+            origin (int): Índice de la primera celda de la entrada.
+            blank_symbol: Símbolo que representa espacios en blanco.
+        
+        Returns:
+            Tape: Cinta con el contenido y el cabezal indicados.
+        """
+        tape = cls("", blank_symbol=blank_symbol, symbols=symbols)
+
+        margin = tape._pack([0]) * INITIAL_MARGIN
+        tape._buffer = margin + tape._pack(codes) + margin
+        tape._start = INITIAL_MARGIN
+        tape._end = INITIAL_MARGIN + len(codes)
+        tape._input_start = INITIAL_MARGIN + origin
+        tape._pos = INITIAL_MARGIN + head
+        return tape
+
+
+    def __len__(self):
+        """
+        Devuelve el número de celdas almacenadas en la cinta.
+        
+        Returns:
+            int: Cantidad de celdas visitadas o inicializadas hasta el momento.
+        """
+        return self._end - self._start
+
+
+    @property
+    def tape(self):
+        """
+        Lista de símbolos de las celdas usadas, de izquierda a derecha.
+        
+        Returns:
+            list: Símbolos de la cinta (blank_symbol en las celdas vacías).
+        """
+        symbols = self._symbols
+        return [symbols[code] for code in self._buffer[self._start:self._end]]
+
+
+    @property
+    def head(self):
+        """
+        Posición del cabezal relativa a la primera celda usada.
+        
+        Returns:
+            int: Índice del cabezal en tape (-1 o len(tape) cuando el cabezal
+                acaba de salir de las celdas usadas).
+        """
+        return self._pos - self._start
+
+
+    @head.setter
+    def head(self, position):
+        """
+        Coloca el cabezal en una posición relativa a la primera celda usada.
+        
+        Args:
+            position (int): Nuevo índice del cabezal en tape.
+        """
+        self._pos = self._start + position
+
+
+    @property
+    def origin(self):
+        """
+        Índice en tape de la primera celda de la entrada.
+        
+        Returns:
+            int: Número de celdas añadidas a la izquierda de la entrada.
+        """
+        return self._input_start - self._start
+
+
+    @property
+    def symbols(self):
+        """
+        Símbolos internados por la cinta, indexados por código.
+        
+        Returns:
+            list: Símbolo correspondiente a cada código (el 0 es el blanco).
+        """
+        return self._symbols
+
+
+    def code(self, symbol):
+        """
+        Devuelve el código entero de un símbolo en esta cinta.
+        
+        Args:
+            symbol: Símbolo de la cinta (se interna si es nuevo).
+        
+        Returns:
+            int: Código del símbolo (0 para el blanco).
+        """
+        return self._code(symbol)
+
+
+    def signature(self):
+        """
+        Resume el contenido no blanco de la cinta para compararlo con otro.
+        
+        Dos cintas con los mismos códigos de símbolos tienen la misma firma
+        si y solo si sus celdas no blancas coinciden en contenido y posición
+        absoluta (relativa al inicio de la entrada), sin importar cuántos
+        blancos se hayan visitado a cada lado.
+        
+        Returns:
+            tuple: (desplazamiento en bytes, bytes del contenido sin blancos
+                en los extremos).
+        """
+        cells = self._buffer[self._start:self._end]
+        itemsize = cells.itemsize if self._wide else 1
+        raw = cells.tobytes() if self._wide else bytes(cells)
+
+        content = raw.lstrip(b"\0")
+        if not content:
+            return 0, b""
+        offset = (self._start - self._input_start) * itemsize + len(raw) - len(content)
+        return offset, content.rstrip(b"\0")
+
+
+    def codes(self):
+        """
+        Códigos de las celdas usadas, de izquierda a derecha.
+        
+        Returns:
+            bytearray | array: Copia de las celdas usadas.
+        """
+        return self._buffer[self._start:self._end]
+
+
+    def non_blank(self):
+        """
+        Recorre las celdas no blancas de izquierda a derecha.
+        
+        Yields:
+            tuple: (posición absoluta, código) de cada celda no blanca;
+                la posición 0 es el inicio de la entrada.
+        """
+        offset = self._input_start
+        buffer = self._buffer
+        for pos in range(self._start, self._end):
+            code = buffer[pos]
+            if code:
+                yield pos - offset, code
+
+
+    def content(self):
+        """
+        Símbolos no blancos de la cinta, de izquierda a derecha.
+        
+        Returns:
+            list: Símbolos de las celdas no blancas.
+        """
+        cells = self._buffer[self._start:self._end]
+        if not self._wide:
+            # Descartar los blancos (código 0) en C antes de traducir
+            cells = cells.translate(None, b"\0")
+
+        symbols = self._symbols
+        return [symbols[code] for code in cells if code]
+
+
+    def count(self, symbol):
+        """
+        Cuenta las celdas usadas que contienen un símbolo.
+        
+        Args:
+            symbol: Símbolo a contar (blank_symbol cuenta los blancos).
+        
+        Returns:
+            int: Número de celdas usadas con ese símbolo.
+        """
+        code = self._codes.get(symbol)
+        if code is None:
+            return 0
+        return self._buffer[self._start:self._end].count(code)
+
+
+    def cursor(self):
+        """
+        Expone el buffer y sus índices para bucles de simulación compilados.
+        
+        Las celdas usadas son buffer[start:end] y el cabezal está en
+        buffer[pos]. El buffer puede reemplazarse al expandir la cinta, por
+        lo que debe volver a obtenerse después de llamar a read o write.
+        
+        Returns:
+            tuple: (buffer, start, end, pos).
+        """
+        return self._buffer, self._start, self._end, self._pos
+
+
+    def seek(self, pos):
+        """
+        Coloca el cabezal en una posición del buffer obtenida con cursor.
+        
+        No expande la cinta: si la posición queda fuera de las celdas usadas,
+        la expansión ocurre en el siguiente read o write, igual que tras move.
+        
+        Args:
+            pos (int): Posición del cabezal en el buffer.
+        """
+        self._pos = pos
 
 
     def read(self):
@@ -35,11 +296,10 @@ class Tape:
         Returns:
             Símbolo en la posición actual del cabezal.
         """
-        if self.head < 0:
-            self._expand_left()
-        if self.head >= len(self.tape):
-            self.tape.append(self.blank_symbol)
-        return self.tape[self.head]
+        pos = self._pos
+        if not self._start <= pos < self._end:
+            pos = self._extend()
+        return self._symbols[self._buffer[pos]]
 
 
     def write(self, symbol):
@@ -52,12 +312,14 @@ class Tape:
         Args:
             symbol: Símbolo a escribir en la posición actual.
         """
-        if self.head < 0:
-            self._expand_left()
-        if self.head >= len(self.tape):
-            self.tape.append(self.blank_symbol)
+        pos = self._pos
+        if not self._start <= pos < self._end:
+            pos = self._extend()
 
-        self.tape[self.head] = symbol
+        code = self._codes.get(symbol)
+        if code is None:
+            code = self._code(symbol)
+        self._buffer[pos] = code
 
 
     def move(self, direction):
@@ -73,26 +335,117 @@ class Tape:
         Raises:
             ValueError: Si la dirección no es válida (L, R o S).
         """
-        if direction == "L":
-            self.head -= 1
-        elif direction == "R":
-            self.head += 1
-        elif direction == "S":
-            pass
+        try:
+            self._pos += MOVES[direction]
+        except KeyError:
+            raise ValueError(f"Movimiento no válido: {direction}") from None
+
+
+    def retract(self, side):
+        """
+        Descarta la celda de un extremo de las celdas usadas.
+        
+        Deshace una expansión de la cinta al retroceder un paso de la
+        simulación (ver core/stepper.py). La celda descartada debe contener
+        el blanco, igual que cualquier celda fuera de las usadas.
+        
+        Args:
+            side (int): -1 para el extremo izquierdo o 1 para el derecho.
+        """
+        if side < 0:
+            self._start += 1
         else:
-            raise ValueError(f"Movimiento no válido: {direction}")
+            self._end -= 1
 
 
-    def _expand_left(self):
+    def _pack(self, codes):
         """
-        Expande la cinta hacia la izquierda.
+        Construye un buffer del tipo actual a partir de una lista de códigos.
         
-        Añade un símbolo en blanco al inicio de la cinta y ajusta
-        la posición del cabezal. Método privado usado internamente
-        cuando el cabezal intenta acceder a posiciones negativas.
+        Args:
+            codes (list): Códigos enteros de los símbolos.
+        
+        Returns:
+            bytearray | array: Buffer con los códigos dados.
+        """
+        if self._wide:
+            return array("I", codes)
+        return bytearray(codes)
+
+
+    def _code(self, symbol):
+        """
+        Devuelve el código entero de un símbolo, internándolo si es nuevo.
+        
+        Método privado que asigna códigos consecutivos a los símbolos en el
+        orden en que aparecen. Si se superan los 256 símbolos distintos, el
+        buffer pasa de bytearray a un array de enteros de 32 bits.
+        
+        Args:
+            symbol: Símbolo de la cinta.
+        
+        Returns:
+            int: Código del símbolo.
         """
-        self.tape.insert(0, self.blank_symbol)
-        self.head = 0
+        code = self._codes.get(symbol)
+        if code is None:
+            code = len(self._symbols)
+            self._symbols.append(symbol)
+            self._codes[symbol] = code
+
+            if code == 256:
+                self._wide = True
+                if hasattr(self, "_buffer"):
+                    self._buffer = array("I", list(self._buffer))
+        return code
+
+
+    def _extend(self):
+        """
+        Expande las celdas usadas hasta incluir la posición del cabezal.
+        
+        Método privado usado internamente cuando el cabezal accede a una
+        celda fuera de las usadas. Si la posición cae fuera del buffer, éste
+        se reserva de nuevo con el doble de capacidad y las celdas usadas
+        quedan centradas.
+        
+        Returns:
+            int: Posición del cabezal en el buffer tras la expansión.
+        """
+        if not 0 <= self._pos < len(self._buffer):
+            self._grow()
+
+        pos = self._pos
+        if pos < self._start:
+            self._start = pos
+        else:
+            self._end = pos + 1
+        return pos
+
+
+    def _grow(self):
+        """
+        Duplica el buffer dejando las celdas usadas en el centro.
+        
+        Método privado que reubica el contenido y ajusta todos los índices
+        internos según el desplazamiento aplicado.
+        """
+        buffer = self._buffer
+        used = self._end - self._start
+        span = max(self._end, self._pos + 1) - min(self._start, self._pos)
+        capacity = max(2 * len(buffer), 2 * span + 2 * INITIAL_MARGIN)
+
+        new_start = (capacity - used) // 2
+        shift = new_start - self._start
+
+        grown = self._pack([0]) * capacity
+        grown[new_start:new_start + used] = buffer[self._start:self._end]
+
+        self._buffer = grown
+        self._start += shift
+        self._end += shift
+        self._pos += shift
+        self._input_start += shift
 
 
     def snapshot(self, current_state):
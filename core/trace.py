@@ -0,0 +1,600 @@
+"""
+Módulo para el registro binario compacto de simulaciones.
+
+Este módulo proporciona la función record_trace, que simula una cadena
+sobre la tabla compilada de la máquina y guarda cada transición como un
+único entero (regla aplicada y desplazamiento del cabezal) de ancho fijo,
+junto con un índice de configuraciones completas tomadas cada cierto número
+de pasos. La clase TraceReader abre el registro con mmap y reconstruye bajo
+demanda cualquier rango de pasos en el mismo formato de texto que
+Simulator.format_step, partiendo de la configuración del índice más cercana.
+
+Formato del archivo .trace:
+    TRACE_MAGIC, longitud del encabezado (4 bytes, little-endian), el
+    encabezado en JSON (UTF-8), relleno hasta múltiplo de 4 bytes y un
+    código por paso: regla * 3 + desplazamiento + 1.
+
+Formato del índice (.trace.idx): secuencia de entradas, una por
+configuración guardada, terminada por un resumen final con el veredicto de
+la simulación. Cada entrada es la longitud de sus campos y la de sus
+códigos de cinta (4 bytes cada una, little-endian), los campos en JSON
+(UTF-8) y los códigos en bytes. Ningún archivo del registro usa pickle,
+por lo que abrir un registro ajeno no ejecuta código.
+"""
+
+import bisect
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+from core.budget import BudgetReport
+from core.checkpoint import machine_fingerprint
+from core.loops import LoopDetector, LoopReport, find_cycle_start
+from core.rendering import IDRenderer
+from core.simulation import StepRecord
+from core.tape import MOVES, Tape
+
+
+# Identificador y versión del formato del registro binario
+TRACE_MAGIC = b"MTTRACE2"
+TRACE_VERSION = 2
+
+# Extensión del índice que acompaña a cada registro binario
+INDEX_SUFFIX = ".idx"
+
+# Longitudes de los campos y de los códigos de cada entrada del índice
+INDEX_ENTRY = struct.Struct("<II")
+
+# Pasos entre configuraciones completas guardadas en el índice
+DEFAULT_SNAPSHOT_INTERVAL = 1 << 16
+
+# Pasos acumulados en memoria antes de escribirlos en el registro
+FLUSH_STEPS = 1 << 16
+
+
+# Resultado de record_trace, con los mismos campos que SimulationRun:
+# veredicto (None si se abortó), pasos, cinta final, resumen del
+# presupuesto agotado (o None) y ciclo detectado (o None)
+TraceResult = namedtuple("TraceResult", ["accepted", "steps", "tape", "abort", "loop"])
+
+
+def step_typecode(n_rules):
+    """
+    Elige el tipo de array con el que se guardan los códigos de los pasos.
+    
+    Args:
+        n_rules (int): Número de reglas de la máquina.
+    
+    Returns:
+        str: "B" (1 byte por paso), "H" (2 bytes) o "I" (4 bytes).
+    """
+    if n_rules * 3 <= 1 << 8:
+        return "B"
+    if n_rules * 3 <= 1 << 16:
+        return "H"
+    return "I"
+
+
+def _write_entry(f, fields, codes=b""):
+    """
+    Escribe una entrada del índice.
+    
+    Args:
+        f (file): Índice abierto en modo binario.
+        fields (dict): Campos de la entrada (serializables en JSON).
+        codes (bytes): Códigos de cinta de la entrada.
+    """
+    data = json.dumps(fields, ensure_ascii=False).encode("utf-8")
+    f.write(INDEX_ENTRY.pack(len(data), len(codes)) + data + codes)
+
+
+def _read_entry(f):
+    """
+    Lee una entrada del índice.
+    
+    Args:
+        f (file): Índice abierto en modo binario.
+    
+    Returns:
+        dict: Campos de la entrada con sus códigos en "codes", o None si
+            el índice termina (o está truncado) antes de una entrada
+            completa.
+    """
+    prefix = f.read(INDEX_ENTRY.size)
+    if len(prefix) < INDEX_ENTRY.size:
+        return None
+
+    size, n_codes = INDEX_ENTRY.unpack(prefix)
+    data = f.read(size)
+    codes = f.read(n_codes)
+    if len(data) < size or len(codes) < n_codes:
+        return None
+
+    try:
+        entry = json.loads(data.decode("utf-8"))
+    except ValueError:
+        return None
+
+    entry["codes"] = codes
+    return entry
+
+
+def _trace_table(compiled, typecode):
+    """
+    Adapta la tabla compilada para el registro binario.
+    
+    Función privada usada por record_trace. Cada entrada conserva los campos
+    de CompiledMachine.table, con el índice de la regla reemplazado por el
+    código del paso, y agrega en los bucles de barrido el código del paso de
+    cada símbolo de la racha: una tabla para bytes.translate si los códigos
+    ocupan un byte, o una lista indexada por símbolo si no.
+    
+    Args:
+        compiled (CompiledMachine): Máquina compilada.
+        typecode (str): Tipo de los códigos de los pasos (step_typecode).
+    
+    Returns:
+        list: Tabla con entradas (base_siguiente, símbolo_escrito,
+            desplazamiento, acepta, código, barrido, códigos_barrido) o None.
+    """
+    n_symbols = compiled.n_symbols
+    table = []
+    for slot, entry in enumerate(compiled.table):
+        if entry is None:
+            table.append(None)
+            continue
+
+        sweep_codes = None
+        sweep = entry[5]
+        if sweep is not None:
+            base = slot - slot % n_symbols
+            codes = [0] * 256
+            for symbol in sweep:
+                rule = compiled.table[base + symbol]
+                codes[symbol] = rule[4] * 3 + rule[2] + 1
+            sweep_codes = bytes(codes) if typecode == "B" else codes
+
+        table.append(entry[:4] + (entry[4] * 3 + entry[2] + 1, sweep, sweep_codes))
+    return table
+
+
+def _snapshot(compiled, base, tape, steps):
+    """
+    Resume la configuración de un registro binario en curso.
+    
+    Función privada usada por record_trace; el diccionario tiene los mismos
+    campos de configuración que SimulationRun.checkpoint, salvo los códigos
+    de la cinta, que se devuelven aparte.
+    
+    Args:
+        compiled (CompiledMachine): Máquina compilada.
+        base (int): Base de la tabla del estado y cache actuales.
+        tape (Tape): Cinta con el cabezal ya sincronizado.
+        steps (int): Pasos aplicados.
+    
+    Returns:
+        tuple: (pasos, estado, cache, cabezal y origen, códigos de la cinta).
+    """
+    buffer, start, end, _ = tape.cursor()
+    codes = buffer[start:end]
+    wide = not isinstance(codes, bytearray)
+    state, cache = compiled.decode(base)
+
+    fields = {
+        "steps": steps,
+        "state": state,
+        "cache": cache,
+        "wide": wide,
+        "head": tape.head,
+        "origin": tape.origin,
+    }
+    return fields, codes.tobytes() if wide else bytes(codes)
+
+
+def record_trace(simulator, input_str, path, interval=DEFAULT_SNAPSHOT_INTERVAL, budget=None):
+    """
+    Simula una cadena y guarda su registro binario con su índice.
+    
+    Aplica las mismas transiciones que run_fast, incluidos los macro-pasos
+    de barrido (escriben de una vez un código por celda recorrida) y, con
+    detect_loops, el rechazo de las simulaciones que repiten una
+    configuración. El límite de bytes de registro del presupuesto se aplica
+    al tamaño del registro binario.
+    
+    Args:
+        simulator (Simulator): Simulador de la máquina.
+        input_str (str): Cadena de entrada a simular.
+        path (str): Ruta del registro (.trace); el índice se guarda en
+            path + INDEX_SUFFIX.
+        interval (int): Pasos entre configuraciones guardadas en el índice.
+        budget (Budget): Límites de recursos de esta ejecución (None usa el
+            presupuesto del simulador).
+    
+    Returns:
+        TraceResult: Veredicto, pasos, cinta final, presupuesto agotado y ciclo.
+    
+    Raises:
+        ValueError: Si el intervalo del índice no es positivo.
+    """
+    if interval < 1:
+        raise ValueError(f"Intervalo de índice no válido: {interval}")
+
+    if budget is None:
+        budget = simulator.budget
+    clock = budget.start() if budget is not None else None
+
+    machine = simulator.machine
+    compiled = machine.compile()
+    tape = Tape(input_str, blank_symbol=machine.blank_symbol, symbols=compiled.symbols)
+
+    n_symbols = compiled.n_symbols
+    typecode = step_typecode(len(compiled.rules))
+    table = _trace_table(compiled, typecode)
+
+    header = json.dumps({
+        "version": TRACE_VERSION,
+        "machine": machine_fingerprint(machine),
+        "input": input_str,
+        "symbols": list(tape.symbols),
+        "typecode": typecode,
+        "byteorder": sys.byteorder,
+        "interval": interval,
+    }, ensure_ascii=False).encode("utf-8")
+    padding = -(len(TRACE_MAGIC) + 4 + len(header)) % 4
+
+    base = compiled.initial_base
+    buffer, start, end, pos = tape.cursor()
+
+    detector = None
+    if simulator.detect_loops:
+        detector = LoopDetector(tape, base, 0)
+        offset = start + tape.origin
+    sweeps = detector is None
+
+    steps = 0
+    accepted = abort = loop = None
+    next_snapshot = 0
+    written = 0
+    limit = 0
+
+    out = array(typecode)
+    append = out.append
+
+    with open(path, "wb") as trace, open(path + INDEX_SUFFIX, "wb") as index:
+        trace.write(TRACE_MAGIC + struct.pack("<I", len(header)) + header + b"\0" * padding)
+
+        while True:
+            if steps >= limit:
+                # Vaciar los pasos acumulados y guardar la configuración si toca
+                out.tofile(trace)
+                written += len(out) * out.itemsize
+                del out[:]
+
+                if steps >= next_snapshot:
+                    tape.seek(pos)
+                    _write_entry(index, *_snapshot(compiled, base, tape, steps))
+                    next_snapshot += interval
+
+                limit = min(next_snapshot, steps + FLUSH_STEPS)
+                if clock is not None:
+                    abort = clock.check(steps, len(tape), written)
+                    if abort is not None:
+                        break
+                    limit = min(limit, clock.next_check(steps))
+
+            if not start <= pos < end:
+                # Expandir la cinta; el buffer puede haberse reubicado
+                tape.seek(pos)
+                tape.read()
+                buffer, start, end, pos = tape.cursor()
+                if detector is not None:
+                    offset = start + tape.origin
+
+                # Revisar el límite de celdas antes del siguiente paso
+                if clock is not None:
+                    limit = min(limit, steps + 1)
+
+            code = buffer[pos]
+
+            # Los símbolos de la entrada ajenos a la máquina no tienen columna en la tabla
+            entry = table[base + code] if code < n_symbols else None
+
+            if entry is None:
+                accepted = False
+                break
+
+            base, tape_output, movement, accepts, step_code, sweep, sweep_codes = entry
+
+            if sweep is not None and sweeps and type(buffer) is bytearray:
+                # Recorrer de una vez la racha de celdas del bucle de barrido
+                if movement > 0:
+                    cells = buffer[pos:end]
+                    run = min(len(cells) - len(cells.lstrip(sweep)), limit - steps)
+                    cells = cells[:run]
+                else:
+                    cells = buffer[start:pos + 1]
+                    run = min(len(cells) - len(cells.rstrip(sweep)), limit - steps)
+                    cells = cells[len(cells) - run:][::-1]
+
+                # Cada símbolo de la racha tiene su propia regla
+                if typecode == "B":
+                    out.frombytes(cells.translate(sweep_codes))
+                else:
+                    out.extend(map(sweep_codes.__getitem__, cells))
+                pos += run * movement
+                steps += run
+                continue
+
+            if detector is not None:
+                detector.write(pos - offset, code, tape_output)
+
+            buffer[pos] = tape_output
+            pos += movement
+            steps += 1
+            append(step_code)
+
+            if accepts:
+                accepted = True
+                break
+
+            if detector is not None:
+                length = detector.observe(steps, base, pos - offset)
+                if length is not None:
+                    loop = LoopReport(find_cycle_start(machine, input_str, length), length, steps)
+                    accepted = False
+                    break
+
+        tape.seek(pos)
+        out.tofile(trace)
+
+        _write_entry(index, {
+            "steps": steps,
+            "accepted": accepted,
+            "abort": abort._asdict() if abort is not None else None,
+            "loop": loop._asdict() if loop is not None else None,
+            "end": True,
+        })
+
+    return TraceResult(accepted, steps, tape, abort, loop)
+
+
+class TraceReader:
+    """
+    Lector de un registro binario creado con record_trace.
+    
+    El registro se proyecta en memoria con mmap, por lo que abrirlo no lee
+    los pasos y el código de cualquier paso se obtiene en tiempo constante.
+    Del índice solo se cargan las posiciones de las configuraciones
+    guardadas; cada una se lee al reconstruir un rango de pasos.
+    
+    Attributes:
+        path (str): Ruta del registro.
+        header (dict): Encabezado del registro (máquina, entrada, símbolos,
+            tipo de los códigos e intervalo del índice).
+        input_str (str): Cadena de entrada simulada.
+        result (dict): Resumen final (pasos, accepted, abort y loop), o None
+            si la simulación que escribió el registro no terminó.
+    """
+
+    def __init__(self, path):
+        """
+        Abre un registro binario y su índice.
+        
+        Args:
+            path (str): Ruta del registro (.trace).
+        
+        Raises:
+            ValueError: Si el archivo no es un registro binario compatible.
+        """
+        self.path = path
+
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            prefix = len(TRACE_MAGIC) + 4
+            if self._map[:len(TRACE_MAGIC)] != TRACE_MAGIC:
+                raise ValueError(f"No es un registro binario: {path}")
+
+            (size,) = struct.unpack("<I", self._map[len(TRACE_MAGIC):prefix])
+            try:
+                self.header = json.loads(self._map[prefix:prefix + size].decode("utf-8"))
+            except ValueError:
+                raise ValueError(f"Encabezado de registro dañado: {path}") from None
+            if self.header["version"] != TRACE_VERSION:
+                raise ValueError(f"Versión de registro no compatible: {self.header['version']}")
+
+            typecode = self.header["typecode"]
+            itemsize = array(typecode).itemsize
+            data = prefix + size + (-(prefix + size) % 4)
+
+            # Un registro interrumpido puede terminar con un código incompleto
+            count = (len(self._map) - data) // itemsize
+            self._view = memoryview(self._map)[data:data + count * itemsize]
+            self._codes = self._view.cast(typecode)
+
+            if itemsize > 1 and self.header["byteorder"] != sys.byteorder:
+                # Escrito en otra arquitectura: copiar e invertir los bytes
+                codes = array(typecode, self._codes)
+                codes.byteswap()
+                self._codes.release()
+                self._codes = codes
+        except Exception:
+            self.close()
+            raise
+
+        self.input_str = self.header["input"]
+        self._load_index()
+
+
+    def __enter__(self):
+        """Permite usar el lector en un bloque with."""
+        return self
+
+
+    def __exit__(self, exc_type, exc, traceback):
+        """Cierra el lector al salir del bloque with."""
+        self.close()
+
+
+    def __len__(self):
+        """
+        Devuelve el número de pasos guardados en el registro.
+        
+        Returns:
+            int: Cantidad de transiciones registradas.
+        """
+        return len(self._codes)
+
+
+    def _load_index(self):
+        """
+        Lee las posiciones de las configuraciones guardadas en el índice.
+        
+        Método privado. Un índice truncado (simulación interrumpida) se lee
+        hasta la última configuración completa.
+        """
+        self._snapshot_steps = []
+        self._snapshot_offsets = []
+        self.result = None
+
+        with open(self.path + INDEX_SUFFIX, "rb") as f:
+            while True:
+                offset = f.tell()
+                entry = _read_entry(f)
+                if entry is None:
+                    break
+
+                if entry.get("end"):
+                    if entry["abort"] is not None:
+                        entry["abort"] = BudgetReport(**entry["abort"])
+                    if entry["loop"] is not None:
+                        entry["loop"] = LoopReport(**entry["loop"])
+                    self.result = entry
+                    break
+
+                # Las configuraciones posteriores al último paso escrito no sirven
+                if entry["steps"] <= len(self._codes):
+                    self._snapshot_steps.append(entry["steps"])
+                    self._snapshot_offsets.append(offset)
+
+
+    def step(self, number):
+        """
+        Decodifica un paso del registro.
+        
+        Args:
+            number (int): Número del paso (empezando en 1).
+        
+        Returns:
+            tuple: (índice de la regla en CompiledMachine.rules, desplazamiento
+                del cabezal: -1, 0 o 1).
+        
+        Raises:
+            IndexError: Si el registro no contiene el paso.
+        """
+        if not 1 <= number <= len(self._codes):
+            raise IndexError(f"El registro no contiene el paso {number}")
+
+        rule, move = divmod(self._codes[number - 1], 3)
+        return rule, move - 1
+
+
+    def snapshot(self, steps):
+        """
+        Lee la configuración guardada más cercana anterior a un paso.
+        
+        Args:
+            steps (int): Número de pasos aplicados de la configuración buscada.
+        
+        Returns:
+            dict: Configuración guardada con pasos <= steps.
+        """
+        position = bisect.bisect_right(self._snapshot_steps, steps) - 1
+        with open(self.path + INDEX_SUFFIX, "rb") as f:
+            f.seek(self._snapshot_offsets[position])
+            return _read_entry(f)
+
+
+    def lines(self, simulator, first=1, last=None):
+        """
+        Reconstruye un rango de pasos en el formato del registro de texto.
+        
+        Parte de la configuración guardada más cercana y aplica las reglas
+        del registro, generando las IDs con la ventana del simulador solo
+        para los pasos pedidos.
+        
+        Args:
+            simulator (Simulator): Simulador de la máquina que generó el registro.
+            first (int): Primer paso a reconstruir (empezando en 1).
+            last (int): Último paso a reconstruir (None hasta el final).
+        
+        Yields:
+            str: Línea de cada paso, igual a la de Simulator.format_step.
+        
+        Raises:
+            ValueError: Si el registro corresponde a otra máquina, el rango
+                no es válido o los pasos no concuerdan con la máquina.
+        """
+        machine = simulator.machine
+        if self.header["machine"] != machine_fingerprint(machine):
+            raise ValueError("El registro corresponde a otra máquina")
+
+        if last is None:
+            last = len(self._codes)
+        if not 1 <= first <= last + 1 or last > len(self._codes):
+            raise ValueError(f"Rango de pasos no válido: {first}-{last}")
+
+        snapshot = self.snapshot(first - 1)
+        symbols = self.header["symbols"]
+        if snapshot["wide"]:
+            codes = array("I")
+            codes.frombytes(snapshot["codes"])
+        else:
+            codes = snapshot["codes"]
+
+        tape = Tape.from_codes(
+            codes, symbols, head=snapshot["head"], origin=snapshot["origin"],
+            blank_symbol=machine.blank_symbol
+        )
+        renderer = IDRenderer(tape, window=simulator.id_window)
+        state, cache = snapshot["state"], snapshot["cache"]
+
+        rules = machine.compile().rules
+        step_codes = self._codes
+
+        for number in range(snapshot["steps"] + 1, last + 1):
+            rule, move = divmod(step_codes[number - 1], 3)
+            (rule_state, rule_cache, rule_symbol), (new_state, new_cache, tape_output, movement) = rules[rule]
+
+            shown = number >= first
+            if shown:
+                id_before = renderer.render(tape, state, cache)
+
+            symbol = tape.read()
+            if (rule_state, rule_cache, rule_symbol) != (state, cache, symbol) or MOVES[movement] != move - 1:
+                raise ValueError(f"El paso {number} del registro no concuerda con la máquina")
+
+            tape.write(tape_output)
+            renderer.write(tape, tape.head, tape_output)
+            tape.move(movement)
+
+            if shown:
+                yield simulator.format_step(StepRecord(
+                    number, state, cache, symbol,
+                    new_state, new_cache, tape_output, movement,
+                    id_before, renderer.render(tape, new_state, new_cache),
+                ))
+
+            state, cache = new_state, new_cache
+
+
+    def close(self):
+        """Libera la proyección en memoria del registro."""
+        for view in (getattr(self, "_codes", None), getattr(self, "_view", None)):
+            if isinstance(view, memoryview):
+                view.release()
+        self._map.close()
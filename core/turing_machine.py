@@ -1,3 +1,6 @@
+from core.tape import MOVES
+
+
 class TuringMachine:
     """
     Representa la Máquina de Turing según la configuración cargada.
@@ -60,3 +63,216 @@ class TuringMachine:
                 o["tape_output"],
                 o["tape_displacement"]
             )
+
+        self._compiled = None
+        self._generated = None
+
+
+    def compile(self):
+        """
+        Devuelve la tabla de transiciones compilada de la máquina.
+        
+        La compilación se realiza una sola vez, la primera vez que se
+        solicita; las llamadas posteriores reutilizan el resultado.
+        
+        Returns:
+            CompiledMachine: Máquina con estados, cache y símbolos internados
+                como enteros y delta como tabla indexada.
+        
+        Raises:
+            ValueError: Si alguna transición tiene un movimiento no válido.
+        """
+        if self._compiled is None:
+            self._compiled = CompiledMachine(self)
+        return self._compiled
+
+
+    def generate(self):
+        """
+        Devuelve el simulador de código generado para la máquina.
+        
+        Igual que compile, el código se genera y se compila una sola vez
+        y se conserva junto a la máquina (también en la caché de máquinas
+        compiladas).
+        
+        Returns:
+            GeneratedMachine: Código fuente especializado y su función.
+        
+        Raises:
+            ValueError: Si alguna transición tiene un movimiento no válido.
+        """
+        if self._generated is None:
+            from core.codegen import GeneratedMachine
+            self._generated = GeneratedMachine(self)
+        return self._generated
+
+
+class CompiledMachine:
+    """
+    Representación de la función de transición como tabla de enteros.
+    
+    Interna los estados, los valores de cache y los símbolos de la cinta
+    como enteros pequeños y construye una tabla plana indexada por
+    (estado, cache, símbolo), de modo que cada paso de la simulación es
+    un acceso a lista en lugar de hashear una tupla de strings.
+    
+    El índice de una configuración es (estado * n_caches + cache) * n_symbols
+    + símbolo; a la parte (estado * n_caches + cache) * n_symbols se le llama
+    base. Cada entrada de la tabla es None si no hay transición, o una tupla
+    (base_siguiente, símbolo_escrito, desplazamiento, acepta, regla, barrido)
+    donde desplazamiento es -1, 1 o 0 y regla es el índice en rules.
+    
+    barrido es None salvo en los bucles de barrido: reglas que conservan
+    estado, cache y símbolo y mueven el cabezal, como δ([3,B],1) = ([3,B],1,L).
+    En ellas contiene los bytes de todos los símbolos que, desde la misma
+    base y en la misma dirección, también son bucles de barrido, de modo que
+    un simulador puede recorrer de una vez toda la racha de celdas con esos
+    símbolos (cada celda cuenta como un paso elemental).
+    
+    Attributes:
+        states (list): Estados por código.
+        caches (list): Valores de cache por código (el código 0 es None).
+        symbols (list): Símbolos de la cinta por código (el código 0 es el
+            blanco), en el orden que debe usar Tape para compartir códigos.
+        state_codes (dict): Código de cada estado.
+        cache_codes (dict): Código de cada valor de cache.
+        symbol_codes (dict): Código de cada símbolo.
+        n_caches (int): Número de valores de cache distintos.
+        n_symbols (int): Número de símbolos distintos.
+        rules (list): Pares (clave, valor) de delta en orden de definición.
+        table (list): Tabla plana de transiciones.
+        sweeps (int): Número de entradas marcadas como bucles de barrido.
+        initial_base (int): Base de la configuración inicial (cache vacía).
+        final_state (int): Código del estado final.
+    """
+
+    def __init__(self, machine):
+        """
+        Compila la función de transición de una Máquina de Turing.
+        
+        Args:
+            machine (TuringMachine): Máquina a compilar.
+        
+        Raises:
+            ValueError: Si alguna transición tiene un movimiento no válido.
+        """
+        self.rules = list(machine.delta.items())
+
+        states = list(machine.states) + [machine.initial_state, machine.final_state]
+        caches = [None]
+        symbols = [machine.blank_symbol] + list(machine.tape_alphabet) + list(machine.alphabet)
+
+        for (state, cache, symbol), (new_state, new_cache, tape_output, _) in self.rules:
+            states += [state, new_state]
+            caches += [cache, new_cache]
+            symbols += [symbol, tape_output]
+
+        self.states, self.state_codes = self._intern(states)
+        self.caches, self.cache_codes = self._intern(caches)
+        self.symbols, self.symbol_codes = self._intern(symbols)
+
+        self.n_caches = len(self.caches)
+        self.n_symbols = len(self.symbols)
+
+        self.table = [None] * (len(self.states) * self.n_caches * self.n_symbols)
+
+        for index, ((state, cache, symbol), (new_state, new_cache, tape_output, movement)) in enumerate(self.rules):
+            if movement not in MOVES:
+                raise ValueError(f"Movimiento no válido: {movement}")
+
+            slot = self.base(state, cache) + self.symbol_codes[symbol]
+            self.table[slot] = (
+                self.base(new_state, new_cache),
+                self.symbol_codes[tape_output],
+                MOVES[movement],
+                new_state == machine.final_state,
+                index,
+                None
+            )
+
+        self.sweeps = self._mark_sweeps()
+
+        self.initial_base = self.base(machine.initial_state, None)
+        self.final_state = self.state_codes[machine.final_state]
+
+
+    def _mark_sweeps(self):
+        """
+        Detecta los bucles de barrido y los anota en la tabla.
+        
+        Método privado que agrupa, por base y dirección, los símbolos cuyas
+        reglas dejan intacta la configuración salvo por el movimiento del
+        cabezal. Solo se aplica cuando los códigos caben en un byte, que es
+        el formato del buffer de Tape.
+        
+        Returns:
+            int: Número de entradas anotadas.
+        """
+        if self.n_symbols > 256:
+            return 0
+
+        loops = {}
+        for slot, entry in enumerate(self.table):
+            if entry is None:
+                continue
+
+            next_base, tape_output, movement, accepts, _, _ = entry
+            base = slot - slot % self.n_symbols
+
+            if next_base == base and tape_output == slot - base and movement and not accepts:
+                loops.setdefault((base, movement), bytearray()).append(tape_output)
+
+        marked = 0
+        for (base, _), symbols in loops.items():
+            sweep = bytes(symbols)
+            for symbol in symbols:
+                self.table[base + symbol] = self.table[base + symbol][:5] + (sweep,)
+                marked += 1
+
+        return marked
+
+
+    @staticmethod
+    def _intern(values):
+        """
+        Asigna códigos consecutivos a los valores en orden de aparición.
+        
+        Args:
+            values (list): Valores a internar (con posibles repeticiones).
+        
+        Returns:
+            tuple: (lista de valores por código, diccionario valor -> código).
+        """
+        codes = {}
+        for value in values:
+            if value not in codes:
+                codes[value] = len(codes)
+        return list(codes), codes
+
+
+    def base(self, state, cache):
+        """
+        Calcula la base de la tabla para un par (estado, cache).
+        
+        Args:
+            state (str): Estado de la máquina.
+            cache: Valor de la memoria cache (None representa B).
+        
+        Returns:
+            int: Índice de la tabla correspondiente al símbolo de código 0.
+        """
+        return (self.state_codes[state] * self.n_caches + self.cache_codes[cache]) * self.n_symbols
+
+
+    def decode(self, base):
+        """
+        Recupera el par (estado, cache) correspondiente a una base.
+        
+        Args:
+            base (int): Base de la tabla.
+        
+        Returns:
+            tuple: (estado, cache) representados por la base.
+        """
+        state, cache = divmod(base // self.n_symbols, self.n_caches)
+        return self.states[state], self.caches[cache]
@@ -1,8 +1,410 @@
+import argparse
+import json
 import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 from parser.loader import MTConfigLoader
-from core.turing_machine import TuringMachine
 from core.simulation import Simulator
-from config import CONFIGURACION, OUTPUT_DIR, PRINT_RESULT, PRINT_LENGTH
+from core.budget import Budget
+from core.checkpoint import Checkpointer
+from core.trace import TRACE_VERSION, record_trace
+from core.output import ARCHIVES, BufferedTraceWriter, ResultArchive, compressed_path, open_compressed
+from core.result_store import ResultStore, machine_hash, trace_stamp
+from config import CONFIGURACION, OUTPUT_DIR, PRINT_RESULT, PRINT_LENGTH, ID_WINDOW
+from config import RESULT_CACHE_PATH, RESULT_CACHE_MAX_BYTES, MACHINE_CACHE_DIR
+from config import MAX_STEPS, MAX_TAPE_CELLS, MAX_LOG_BYTES, MAX_SECONDS, DETECT_LOOPS
+from config import CHECKPOINT_STEPS, CHECKPOINT_SECONDS, PROFILE
+from config import OUTPUT_COMPRESSION, OUTPUT_ARCHIVE, OUTPUT_BUFFER_SIZE, OUTPUT_QUEUE_SIZE
+from config import TRACE_FORMAT, TRACE_SNAPSHOT_STEPS, TAPE_TYPE
+from config import TRACE_RING_STEPS, TRACE_SAMPLE_STEPS, TRACE_RING_SAMPLES
+
+# Opciones que determinan el contenido de los archivos de salida; incluyen
+# el presupuesto, ya que con otros límites la simulación podría abortarse
+TRACE_OPTIONS = f"{ID_WINDOW}|{PRINT_RESULT}|{PRINT_LENGTH}|{DETECT_LOOPS}|{TRACE_FORMAT}"
+TRACE_OPTIONS += f"|{MAX_STEPS}|{MAX_TAPE_CELLS}|{MAX_LOG_BYTES}|{MAX_SECONDS}"
+if TRACE_FORMAT == "binary":
+    TRACE_OPTIONS += f"|{TRACE_VERSION}"
+elif TRACE_FORMAT == "ring":
+    TRACE_OPTIONS += f"|{TRACE_RING_STEPS}|{TRACE_SAMPLE_STEPS}|{TRACE_RING_SAMPLES}"
+
+# Límites de recursos de cada simulación
+BUDGET = Budget(
+    max_steps=MAX_STEPS,
+    max_cells=MAX_TAPE_CELLS,
+    max_log_bytes=MAX_LOG_BYTES,
+    max_seconds=MAX_SECONDS
+)
+
+# Extensión del punto de control que acompaña a cada archivo de salida
+CHECKPOINT_SUFFIX = ".ckpt"
+
+# Extensión del registro binario que acompaña a cada archivo de salida
+# (con TRACE_FORMAT = "binary"); su índice añade ".idx"
+TRACE_SUFFIX = ".trace"
+
+# Extensión del perfil que acompaña a cada archivo de salida (con PROFILE)
+PROFILE_SUFFIX = ".profile.json"
+
+# Nombre (sin extensión) del archivo único con todos los registros (con OUTPUT_ARCHIVE)
+ARCHIVE_NAME = "simulaciones"
+
+# Extensión de los registros parciales que los procesos del pool escriben
+# antes de agregarlos al archivo único
+PART_SUFFIX = ".part"
+
+# Cadenas que se envían juntas a un proceso del pool al leerlas de un
+# archivo (--inputs), y grupos en curso por proceso: acotan la memoria sin
+# dejar procesos inactivos ni pagar la comunicación por cada cadena
+STREAM_CHUNK = 64
+STREAM_WINDOW = 4
+
+# Veredicto de cada registro JSONL según el resultado de la simulación
+VERDICTS = {True: "accepted", False: "rejected", None: "aborted"}
+
+# Simulador de cada proceso del pool (se crea una vez por proceso)
+_worker_simulator = None
+
+
+def clean_tape_content(tape):
+    """Extrae el contenido de la cinta sin blanks y sin símbolos de control."""
+    # Recorrer solo las celdas no blancas (content salta las páginas no
+    # reservadas de PagedTape y repite de una vez las rachas de RunLengthTape)
+    content = ''.join(map(str, tape.content()))
+
+    if PRINT_LENGTH:
+        # Longitud del string desde los conteos por símbolo (incrementales
+        # en RunLengthTape), sin volver a recorrer el contenido
+        length = sum(len(str(sym)) * tape.count(sym) for sym in tape.symbols[1:])
+        return content.strip() + f" = {length}"
+
+    return content.strip()
+
+
+def write_simulation(simulator, input_str, output_path, archive=None, compression=None):
+    """
+    Simula una cadena y escribe su registro completo en un archivo.
+    
+    Cada transición se produce en este hilo y se escribe en bloques grandes
+    desde un hilo en segundo plano (BufferedTraceWriter), por lo que la
+    memoria usada no depende del número de pasos y la simulación no espera
+    al disco ni a la compresión. Si hay puntos de control activados (solo
+    en registros sin comprimir y fuera de un archivo único), la
+    configuración se guarda periódicamente junto al archivo de salida y, si
+    existe un punto de control válido de una ejecución interrumpida, la
+    simulación se reanuda desde él. Con PROFILE (solo en el registro de
+    texto), el perfil de la ejecución se guarda junto al archivo de salida.
+    
+    Con TRACE_FORMAT = "binary", las transiciones se guardan en un registro
+    binario (.trace, ver core/trace.py) junto al archivo de salida, que solo
+    contiene el encabezado, la referencia al registro y el resultado. Con
+    TRACE_FORMAT = "ring", el archivo de salida solo contiene los últimos
+    pasos y los pasos muestreados (Simulator.ring_trace), generados al
+    terminar la simulación.
+    
+    Args:
+        simulator (Simulator): Simulador de la máquina.
+        input_str (str): Cadena de entrada a simular.
+        output_path (str): Ruta del archivo de salida sin comprimir; dentro
+            de un archivo único, el registro toma su nombre.
+        archive (ResultArchive): Archivo único donde escribir el registro
+            (None para escribirlo en su propio archivo).
+        compression (str): Compresión del archivo de salida (None, "gzip"
+            o "lzma"); se ignora si se usa un archivo único.
+    
+    Returns:
+        tuple: (aceptada, pasos, tape) de la simulación; aceptada es None si
+            la simulación se abortó por exceder el presupuesto.
+    """
+    binary = TRACE_FORMAT == "binary"
+    ring = TRACE_FORMAT == "ring"
+
+    checkpointer = None
+    if (TRACE_FORMAT == "text" and archive is None and compression is None
+            and (CHECKPOINT_STEPS is not None or CHECKPOINT_SECONDS is not None)):
+        checkpointer = Checkpointer(
+            output_path + CHECKPOINT_SUFFIX, CHECKPOINT_STEPS, CHECKPOINT_SECONDS, TRACE_OPTIONS
+        )
+
+    checkpoint = checkpointer.load(simulator, input_str) if checkpointer is not None else None
+    if (checkpoint is not None and os.path.exists(output_path)
+            and os.path.getsize(output_path) >= checkpoint["log_bytes"]):
+        print(f"Reanudando desde el paso {checkpoint['steps']}: {output_path}")
+        run = simulator.resume(checkpoint)
+
+        # Descartar lo escrito después del punto de control
+        with open(output_path, "r+b") as f:
+            f.truncate(checkpoint["log_bytes"])
+        stream = open(output_path, "ab")
+    else:
+        if binary:
+            # Simular de una vez, guardando los pasos en el registro binario
+            trace_path = os.path.splitext(output_path)[0] + TRACE_SUFFIX
+            run = record_trace(simulator, input_str, trace_path, TRACE_SNAPSHOT_STEPS)
+        elif ring:
+            # Simular de una vez, conservando solo los pasos a mostrar
+            run = simulator.ring_trace(
+                input_str, TRACE_RING_STEPS, TRACE_SAMPLE_STEPS or 0, TRACE_RING_SAMPLES
+            ).run()
+        else:
+            run = simulator.iter_steps(input_str)
+
+        if archive is not None:
+            stream = archive.open(os.path.basename(output_path))
+        else:
+            stream = open_compressed(compressed_path(output_path, compression), compression)
+
+    # Escribir cada transición a medida que se produce
+    with BufferedTraceWriter(stream, OUTPUT_BUFFER_SIZE, OUTPUT_QUEUE_SIZE) as f:
+        if binary:
+            lines = simulator.header_lines(input_str) + [
+                f"Registro binario: {os.path.basename(trace_path)} ({run.steps} pasos)"
+            ]
+        else:
+            lines = run.lines()
+
+        for line in lines:
+            f.write(line + "\n")
+
+            if checkpointer is not None and checkpointer.due(run):
+                # El registro debe estar en disco hasta el punto guardado
+                f.flush()
+                checkpointer.save(run)
+
+        accepted, final_tape = run.accepted, run.tape
+
+        f.write("\n" + "-"*40 + "\n")
+        if PRINT_RESULT:
+            final_content = clean_tape_content(final_tape)
+            f.write(f"RESULTADO FINAL: {final_content}\n")
+        else:
+            f.write("RESULTADO FINAL:\n")
+
+        if run.abort is not None:
+            report = run.abort
+            f.write(f"Cadena ABORTADA (presupuesto excedido: {report.reason}) ⚠\n")
+            f.write(
+                f"Pasos: {report.steps}, celdas: {report.cells}, "
+                f"bytes de registro: {report.log_bytes}, tiempo: {report.elapsed:.3f} s\n"
+            )
+        elif accepted:
+            f.write("Cadena ACEPTADA ✔\n")
+        else:
+            f.write("Cadena RECHAZADA ✘\n")
+            if run.loop is not None:
+                f.write(
+                    f"Ciclo detectado: la configuración del paso {run.loop.start} "
+                    f"se repite cada {run.loop.length} pasos\n"
+                )
+        f.write("-"*40 + "\n")
+
+    if checkpointer is not None:
+        checkpointer.clear()
+
+    if TRACE_FORMAT == "text" and run.profile is not None:
+        run.profile.export(os.path.splitext(output_path)[0] + PROFILE_SUFFIX)
+
+    return accepted, run.steps, final_tape
+
+
+def make_simulator(machine):
+    """
+    Crea un simulador con las opciones de config.py.
+    
+    Args:
+        machine (TuringMachine): Máquina a simular.
+    
+    Returns:
+        Simulator: Simulador configurado.
+    """
+    return Simulator(
+        machine, id_window=ID_WINDOW, budget=BUDGET,
+        detect_loops=DETECT_LOOPS, profile=PROFILE, tape_type=TAPE_TYPE
+    )
+
+
+def _init_worker(machine):
+    """
+    Inicializa un proceso del pool con la máquina ya compilada.
+    
+    Args:
+        machine (TuringMachine): Máquina recibida una sola vez por proceso.
+    """
+    global _worker_simulator
+    _worker_simulator = make_simulator(machine)
+
+
+def _simulate_job(job):
+    """
+    Ejecuta una simulación dentro de un proceso del pool.
+    
+    Args:
+        job (tuple): (cadena de entrada, ruta del archivo de salida, compresión).
+    
+    Returns:
+        tuple: (aceptada, pasos, tape) de la simulación.
+    """
+    input_str, output_path, compression = job
+    return write_simulation(_worker_simulator, input_str, output_path, compression=compression)
+
+
+def simulate_record(simulator, input_str, budget=None):
+    """
+    Simula una cadena sin registro y resume el resultado para JSONL.
+    
+    Args:
+        simulator (Simulator): Simulador configurado.
+        input_str (str): Cadena de entrada.
+        budget (Budget): Límites de esta simulación (None usa los del
+            simulador).
+    
+    Returns:
+        dict: input, verdict ("accepted", "rejected" o "aborted"), steps,
+            result_length (celdas no blancas de la cinta final), loop
+            (start y length del ciclo detectado, o None) y seconds.
+    """
+    start = time.perf_counter()
+    accepted, steps, tape = simulator.run_fast(input_str, budget)
+    seconds = time.perf_counter() - start
+    loop = simulator.loop
+
+    return {
+        "input": input_str,
+        "verdict": VERDICTS[accepted],
+        "steps": steps,
+        "result_length": len(tape) - tape.count(tape.blank_symbol),
+        "loop": {"start": loop.start, "length": loop.length} if loop is not None else None,
+        "seconds": seconds,
+    }
+
+
+def _simulate_records(inputs):
+    """
+    Ejecuta simulate_record dentro de un proceso del pool.
+    
+    Args:
+        inputs (list): Grupo de cadenas de entrada.
+    
+    Returns:
+        list: Registro JSONL de cada cadena, en orden.
+    """
+    return [simulate_record(_worker_simulator, input_str) for input_str in inputs]
+
+
+def read_inputs(source):
+    """
+    Lee cadenas de entrada de forma perezosa, una por línea.
+    
+    Args:
+        source (file): Archivo de texto abierto (o sys.stdin).
+    
+    Yields:
+        str: Cada línea sin el salto de línea final.
+    """
+    for line in source:
+        yield line.rstrip("\r\n")
+
+
+def stream_records(machine, inputs, workers):
+    """
+    Simula una secuencia de cadenas y produce sus registros en orden.
+    
+    Las cadenas se consumen a medida que se simulan: con varios procesos
+    se envían en grupos de STREAM_CHUNK y solo hay STREAM_WINDOW grupos
+    pendientes por proceso, de modo que la memoria no depende del número
+    de cadenas.
+    
+    Args:
+        machine (TuringMachine): Máquina a simular, ya compilada.
+        inputs (iterable): Cadenas de entrada.
+        workers (int): Número de procesos (1 para simular en este proceso).
+    
+    Yields:
+        dict: Registro de cada cadena, en el orden de inputs.
+    """
+    if workers == 1:
+        simulator = make_simulator(machine)
+        for input_str in inputs:
+            yield simulate_record(simulator, input_str)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(machine,)
+    ) as executor:
+        inputs = iter(inputs)
+        pending = deque()
+        while True:
+            chunk = list(islice(inputs, STREAM_CHUNK))
+            if chunk:
+                pending.append(executor.submit(_simulate_records, chunk))
+            if not pending:
+                return
+            if not chunk or len(pending) >= workers * STREAM_WINDOW:
+                yield from pending.popleft().result()
+
+
+def run_stream(machine, inputs_path, output_path, workers):
+    """
+    Simula las cadenas de un archivo y escribe un registro JSONL por cadena.
+    
+    Cada registro se escribe y se vacía en cuanto termina su simulación,
+    por lo que la salida puede encadenarse con otras herramientas.
+    
+    Args:
+        machine (TuringMachine): Máquina a simular, ya compilada.
+        inputs_path (str): Archivo con una cadena por línea ("-" para stdin).
+        output_path (str): Archivo JSONL de salida ("-" para stdout).
+        workers (int): Número de procesos.
+    """
+    source = sys.stdin if inputs_path == "-" else open(inputs_path, encoding="utf-8")
+    target = sys.stdout if output_path == "-" else open(output_path, "w", encoding="utf-8")
+
+    try:
+        for record in stream_records(machine, read_inputs(source), workers):
+            target.write(json.dumps(record, ensure_ascii=False) + "\n")
+            target.flush()
+    except BrokenPipeError:
+        # El consumidor cerró la salida (por ejemplo, head): terminar sin
+        # error, evitando que Python vuelva a vaciar stdout al salir
+        if target is not sys.stdout:
+            raise
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+
+def parse_args():
+    """
+    Interpreta los argumentos de línea de comandos.
+    
+    Returns:
+        argparse.Namespace: Argumentos con el número de procesos (jobs) y,
+            en modo de flujo, los archivos de cadenas (inputs) y de
+            resultados (jsonl).
+    """
+    parser = argparse.ArgumentParser(description="Simulador de Máquinas de Turing")
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="Número de procesos para simular las cadenas en paralelo (por defecto 1)"
+    )
+    parser.add_argument(
+        "--inputs", default=None,
+        help="Leer las cadenas de este archivo, una por línea (\"-\" para stdin), en lugar de "
+             "simulation_strings, y escribir un resultado JSONL por cadena sin registro de transiciones"
+    )
+    parser.add_argument(
+        "--jsonl", default="-",
+        help="Archivo de resultados JSONL con --inputs (por defecto stdout)"
+    )
+    return parser.parse_args()
+
 
 def main():
     """
@@ -11,63 +413,135 @@ def main():
     Esta función:
     1. Carga la configuración de la Máquina de Turing desde un archivo YAML
     2. Inicializa la máquina y el simulador
-    3. Ejecuta simulaciones para cada cadena especificada en la configuración
+    3. Ejecuta simulaciones para cada cadena especificada en la configuración,
+       en secuencia o repartidas en un pool de procesos (--jobs N)
     4. Genera archivos de salida con los resultados en el directorio 'outputs'
+       (opcionalmente comprimidos, o reunidos en un único archivo ZIP o SQLite)
+    
+    Con --inputs, las cadenas se leen de un archivo o de stdin y cada
+    resultado se escribe como una línea JSONL (run_stream).
     
     Raises:
         FileNotFoundError: Si el archivo de configuración no existe.
-        ValueError: Si la configuración es inválida o incompleta.
+        ValueError: Si la configuración es inválida o incompleta, si el
+            número de procesos no es positivo, si el formato de registro
+            no es válido o si PROFILE se combina con un registro que no es
+            de texto.
     """
+    args = parse_args()
+    if args.jobs < 1:
+        raise ValueError(f"Número de procesos no válido: {args.jobs}")
+    if TRACE_FORMAT not in ("text", "binary", "ring"):
+        raise ValueError(f"Formato de registro no válido: {TRACE_FORMAT}")
+    if PROFILE and TRACE_FORMAT != "text":
+        # Solo SimulationRun acumula el perfil; los registros binario y
+        # acotado simulan sobre la tabla compilada sin perfilar
+        raise ValueError(f"PROFILE requiere TRACE_FORMAT = \"text\" (actual: \"{TRACE_FORMAT}\")")
+
     # Cambiar el nombre del archivo para usar una configuración diferente
     loader = MTConfigLoader(CONFIGURACION)
-    config = loader.load()
+    config, machine = loader.load_compiled(MACHINE_CACHE_DIR)
 
-    machine = TuringMachine(config)
-    simulator = Simulator(machine)
+    if args.inputs is not None:
+        run_stream(machine, args.inputs, args.jsonl, args.jobs)
+        return
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    simulation_counter = 1
-
-    def clean_tape_content(tape):
-        """Extrae el contenido de la cinta sin blanks y sin símbolos de control."""
-        # Eliminar B's que representan blanks
-        content = ''.join([str(sym) for sym in tape.tape if sym is not None])
-        # Calcular la longitud del string
-        length = len(content)
-        if PRINT_LENGTH:
-            return content.strip() + f" = {length}"
-        
-        return content.strip()
-
-    for s in config["simulation_strings"]:
-        accepted, log_lines, final_tape = simulator.run_string(str(s))
-
-        output_path = os.path.join(
-            OUTPUT_DIR,
-            f"simulation_{simulation_counter}.txt"
-        )
+    # Los nombres de salida dependen solo de la posición de cada cadena
+    jobs = [
+        (str(s), os.path.join(OUTPUT_DIR, f"simulation_{simulation_counter}.txt"))
+        for simulation_counter, s in enumerate(config["simulation_strings"], start=1)
+    ]
+
+    store = None
+    if RESULT_CACHE_PATH is not None:
+        store = ResultStore(RESULT_CACHE_PATH, max_bytes=RESULT_CACHE_MAX_BYTES)
+    machine_key = machine_hash(config)
+
+    # El archivo único se reescribe completo en cada ejecución
+    archive = None
+    if OUTPUT_ARCHIVE is not None:
+        archive_path = os.path.join(OUTPUT_DIR, ARCHIVE_NAME + ARCHIVES[OUTPUT_ARCHIVE])
+        archive = ResultArchive(archive_path, OUTPUT_ARCHIVE, OUTPUT_COMPRESSION)
+
+    # Omitir sin simular las cadenas cuyo archivo de salida sigue vigente en
+    # la caché: misma máquina, misma cadena y mismas opciones y presupuesto
+    pending = []
+    for input_str, output_path in jobs:
+        trace_path = compressed_path(output_path, OUTPUT_COMPRESSION)
+        if store is not None and archive is None:
+            cached = store.get(machine_key, input_str)
+            if (cached is not None and cached.trace_path == trace_path
+                    and cached.trace_stamp is not None
+                    and cached.trace_stamp == trace_stamp(trace_path, TRACE_OPTIONS)):
+                print(f"Archivo vigente (caché): {trace_path}")
+                continue
+        pending.append((input_str, output_path))
+
+    results = run_jobs(machine, pending, args.jobs, archive)
+    for (input_str, output_path), (accepted, steps, final_tape) in zip(pending, results):
+        if archive is not None:
+            print(f"Registro agregado: {archive.path}:{os.path.basename(output_path)}")
+            trace_path, stamp = None, None
+        else:
+            trace_path = compressed_path(output_path, OUTPUT_COMPRESSION)
+            stamp = trace_stamp(trace_path, TRACE_OPTIONS)
+            print(f"Archivo generado: {trace_path}")
+
+        # Los resultados abortados dependen del presupuesto: no se guardan
+        if store is not None and accepted is not None:
+            store.put(machine_key, input_str, accepted, steps, final_tape, trace_path, stamp)
+
+    if archive is not None:
+        archive.close()
+
+    if store is not None:
+        store.close()
+
+
+def run_jobs(machine, jobs, workers, archive=None):
+    """
+    Ejecuta las simulaciones en secuencia o en un pool de procesos.
+    
+    Con un archivo único y varios procesos, cada proceso escribe su registro
+    sin comprimir en un archivo parcial y este proceso lo agrega al archivo
+    único (que solo admite un escritor) en el orden de jobs.
+    
+    Args:
+        machine (TuringMachine): Máquina a simular, ya compilada.
+        jobs (list): Pares (cadena de entrada, ruta del archivo de salida).
+        workers (int): Número de procesos (1 para simular en este proceso).
+        archive (ResultArchive): Archivo único de los registros (o None).
+    
+    Yields:
+        tuple: (aceptada, pasos, tape) de cada simulación, en el orden de jobs.
+    """
+    if workers == 1:
+        simulator = make_simulator(machine)
+        for input_str, output_path in jobs:
+            yield write_simulation(simulator, input_str, output_path, archive, OUTPUT_COMPRESSION)
+        return
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            for line in log_lines:
-                f.write(line + "\n")
-
-            f.write("\n" + "-"*40 + "\n")
-            if PRINT_RESULT:
-                final_content = clean_tape_content(final_tape)
-                f.write(f"RESULTADO FINAL: {final_content}\n")
-            else:
-                f.write("RESULTADO FINAL:\n")
-            
-            if accepted:
-                f.write("Cadena ACEPTADA ✔\n")
-            else:
-                f.write("Cadena RECHAZADA ✘\n")
-            f.write("-"*40 + "\n")
-
-        print(f"Archivo generado: {output_path}")
-        simulation_counter += 1
+    if archive is None:
+        tasks = [(input_str, output_path, OUTPUT_COMPRESSION) for input_str, output_path in jobs]
+    else:
+        tasks = [
+            (input_str, os.path.splitext(output_path)[0] + PART_SUFFIX, None)
+            for input_str, output_path in jobs
+        ]
 
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(machine,)
+    ) as executor:
+        # map conserva el orden de entrada al reportar los resultados
+        for (_, output_path), (_, task_path, _), result in zip(jobs, tasks, executor.map(_simulate_job, tasks)):
+            if archive is not None:
+                archive.add_file(os.path.basename(output_path), task_path)
+                os.remove(task_path)
+            yield result
 
 if __name__ == "__main__":
     main()
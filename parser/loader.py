@@ -5,8 +5,22 @@ Este módulo proporciona la clase MTConfigLoader que permite cargar archivos
 YAML con las especificaciones de una Máquina de Turing y validar su estructura.
 """
 
+import hashlib
+import os
+import pickle
+
 import yaml
 
+from core.turing_machine import TuringMachine
+
+
+# Cargador YAML en C (libyaml) si está disponible; si no, el de Python puro
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Versión del formato de la caché de máquinas compiladas; cambiarla
+# invalida todas las entradas existentes
+CACHE_VERSION = 2
+
 
 class MTConfigLoader:
     """
@@ -50,12 +64,72 @@ class MTConfigLoader:
                 requeridos o si falta el estado inicial o final.
         """
         with open(self.path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=YAML_LOADER)
 
         self._validate_structure(data)
         return data
 
 
+    def load_compiled(self, cache_dir=None):
+        """
+        Carga la configuración y construye la máquina compilada, usando caché.
+        
+        La máquina validada y compilada, junto con el código fuente de su
+        simulador generado, se guarda en un archivo binario (pickle) dentro
+        de cache_dir, identificado por el hash del contenido del YAML. En
+        un arranque posterior con el mismo archivo se lee esa caché y se
+        omiten el análisis del YAML y la construcción de delta.
+        
+        Args:
+            cache_dir (str): Directorio de la caché (None para no usarla).
+        
+        Returns:
+            tuple: (config, machine) donde config es el diccionario que
+                devolvería load y machine la TuringMachine ya compilada y
+                con su código generado.
+        
+        Raises:
+            FileNotFoundError: Si el archivo especificado no existe.
+            yaml.YAMLError: Si el archivo no tiene un formato YAML válido.
+            ValueError: Si la configuración no es válida.
+        """
+        if cache_dir is None:
+            config = self.load()
+            machine = TuringMachine(config)
+            machine.compile()
+            machine.generate()
+            return config, machine
+
+        with open(self.path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+
+        name = os.path.splitext(os.path.basename(self.path))[0]
+        cache_path = os.path.join(cache_dir, f"{name}-v{CACHE_VERSION}-{digest[:16]}.pickle")
+
+        try:
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            pass
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError):
+            # Caché dañada o de otra versión del código: se regenera
+            pass
+
+        config = self.load()
+        machine = TuringMachine(config)
+        machine.compile()
+        machine.generate()
+
+        # Escribir en un temporal y renombrar para no dejar cachés a medias
+        os.makedirs(cache_dir, exist_ok=True)
+        temporary = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            pickle.dump((config, machine), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, cache_path)
+
+        return config, machine
+
+
     def _validate_structure(self, data):
         """
         Valida que la estructura de datos contenga todos los campos requeridos.
@@ -0,0 +1,577 @@
+"""
+Servidor local de simulación de Máquinas de Turing.
+
+Este script mantiene cargadas y compiladas las máquinas del directorio
+machines/ y atiende solicitudes de simulación por HTTP en localhost (o por
+un socket Unix), de modo que cada simulación evita el arranque del
+intérprete, el análisis del YAML y la construcción de delta. Cuando el YAML
+de una máquina cambia, la siguiente solicitud la recarga y la reemplaza de
+forma atómica: las simulaciones en curso terminan con la versión anterior.
+Las simulaciones se reparten entre un pool de procesos y el servidor
+reporta la latencia de cada solicitud y la profundidad de la cola.
+
+Uso:
+    python server.py                                  # http://127.0.0.1:8765
+    python server.py --port 9000 --workers 4
+    python server.py --socket /tmp/mt.sock
+
+    curl -s localhost:8765/simulate -d '{"machine": "fibonacci_config", "input": "1111"}'
+    curl -s localhost:8765/machines
+    curl -s localhost:8765/metrics
+
+Cuerpo de POST /simulate (JSON):
+    machine     Nombre de la máquina, sin extensión (por defecto la de CONFIGURACION)
+    input       Cadena de entrada
+    max_steps   Límite de pasos de esta simulación (opcional)
+    max_seconds Límite de tiempo de esta simulación (opcional)
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import pickle
+import signal
+import socketserver
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from parser.loader import MTConfigLoader
+from core.budget import Budget
+from core.result_store import machine_hash
+from main import BUDGET, make_simulator, simulate_record
+from config import CONFIGURACION, MACHINE_CACHE_DIR
+from config import SERVER_HOST, SERVER_PORT, SERVER_WORKERS
+
+
+# Directorio con las definiciones de las máquinas que se sirven
+MACHINES_DIR = "machines"
+
+# Solicitudes recientes sobre las que se calculan los percentiles de latencia
+METRICS_WINDOW = 1024
+
+# Versiones de máquinas que conserva cada proceso del pool
+WORKER_CACHE_SIZE = 8
+
+
+# Versión cargada de una máquina: version es el hash de su definición,
+# blob la máquina compilada serializada (se envía a un proceso del pool solo
+# si aún no tiene esa versión) y stamp la marca (mtime, tamaño) del YAML
+# del que se cargó
+MachineEntry = namedtuple("MachineEntry", ["name", "path", "version", "machine", "blob", "stamp", "loaded_at"])
+
+
+class MachineRegistry:
+    """
+    Máquinas compiladas en memoria, recargadas cuando cambia su YAML.
+    
+    Cada consulta compara la marca del archivo con la de la versión cargada
+    y, si cambió, carga y compila la máquina de nuevo antes de reemplazar
+    la entrada; quien ya obtuvo la versión anterior la sigue usando. Si la
+    recarga falla (por ejemplo, un YAML a medio editar), se conserva la
+    versión anterior y el error se reporta en describe.
+    
+    Attributes:
+        directory (str): Directorio de las máquinas.
+        reloads (int): Recargas realizadas desde el arranque.
+    """
+
+    def __init__(self, directory):
+        """
+        Prepara el registro y carga todas las máquinas del directorio.
+        
+        Args:
+            directory (str): Directorio con los archivos YAML.
+        """
+        self.directory = directory
+        self.reloads = 0
+
+        self._entries = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+        for filename in sorted(os.listdir(directory)):
+            name, extension = os.path.splitext(filename)
+            if extension in (".yaml", ".yml"):
+                try:
+                    self.get(name)
+                except (LookupError, ValueError):
+                    pass
+
+
+    def _path(self, name):
+        """
+        Localiza el archivo YAML de una máquina.
+        
+        Args:
+            name (str): Nombre de la máquina, sin extensión.
+        
+        Returns:
+            str: Ruta del archivo, o None si no existe.
+        """
+        # El nombre no puede salir del directorio de máquinas
+        if not name or os.path.basename(name) != name:
+            return None
+
+        for extension in (".yaml", ".yml"):
+            path = os.path.join(self.directory, name + extension)
+            if os.path.isfile(path):
+                return path
+        return None
+
+
+    def get(self, name):
+        """
+        Devuelve la versión vigente de una máquina, recargándola si cambió.
+        
+        Args:
+            name (str): Nombre de la máquina, sin extensión.
+        
+        Returns:
+            MachineEntry: Versión vigente de la máquina.
+        
+        Raises:
+            LookupError: Si la máquina no existe.
+            ValueError: Si la máquina nunca pudo cargarse.
+        """
+        path = self._path(name)
+        if path is None:
+            raise LookupError(f"Máquina desconocida: {name}")
+
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry.stamp == stamp:
+                return entry
+            if entry is None and self._errors.get(name, (None,))[0] == stamp:
+                raise ValueError(self._errors[name][1])
+
+            try:
+                config, machine = MTConfigLoader(path).load_compiled(MACHINE_CACHE_DIR)
+            except Exception as exc:
+                # Conservar la versión anterior hasta que el archivo vuelva a cambiar
+                self._errors[name] = (stamp, f"{type(exc).__name__}: {exc}")
+                if entry is None:
+                    raise ValueError(self._errors[name][1]) from exc
+                self._entries[name] = entry._replace(stamp=stamp)
+                return entry
+
+            self._errors.pop(name, None)
+            if entry is not None:
+                self.reloads += 1
+
+            entry = MachineEntry(
+                name, path, machine_hash(config), machine,
+                pickle.dumps(machine, protocol=pickle.HIGHEST_PROTOCOL),
+                stamp, time.time()
+            )
+            self._entries[name] = entry
+            return entry
+
+
+    def describe(self):
+        """
+        Resume las máquinas cargadas.
+        
+        Returns:
+            list: Un diccionario por máquina con name, version, loaded_at
+                y, si la última recarga falló, error.
+        """
+        with self._lock:
+            names = sorted(set(self._entries) | set(self._errors))
+            machines = []
+            for name in names:
+                entry = self._entries.get(name)
+                description = {"name": name}
+                if entry is not None:
+                    description["version"] = entry.version[:16]
+                    description["loaded_at"] = entry.loaded_at
+                if name in self._errors:
+                    description["error"] = self._errors[name][1]
+                machines.append(description)
+            return machines
+
+
+class ServerMetrics:
+    """
+    Métricas de latencia y de cola del servidor.
+    
+    Las solicitudes en curso son las enviadas al pool que aún no terminan;
+    las que exceden el número de procesos esperan en la cola. Los
+    percentiles se calculan sobre las últimas METRICS_WINDOW solicitudes.
+    
+    Attributes:
+        workers (int): Procesos del pool.
+    """
+
+    def __init__(self, workers):
+        """
+        Inicializa las métricas en cero.
+        
+        Args:
+            workers (int): Procesos del pool.
+        """
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._started = time.time()
+
+        self._requests = 0
+        self._errors = 0
+        self._in_flight = 0
+        self._max_queue = 0
+        self._latencies = deque(maxlen=METRICS_WINDOW)
+        self._waits = deque(maxlen=METRICS_WINDOW)
+
+
+    def submitted(self):
+        """
+        Registra una solicitud enviada al pool.
+        
+        Returns:
+            int: Solicitudes que esperan en la cola tras el envío.
+        """
+        with self._lock:
+            self._in_flight += 1
+            queued = max(0, self._in_flight - self.workers)
+            self._max_queue = max(self._max_queue, queued)
+            return queued
+
+
+    def finished(self, latency, wait=None, ok=True):
+        """
+        Registra una solicitud terminada.
+        
+        Args:
+            latency (float): Segundos desde la recepción hasta la respuesta.
+            wait (float): Segundos que la simulación esperó en la cola
+                (None si no llegó a ejecutarse).
+            ok (bool): False si la solicitud terminó con error.
+        """
+        with self._lock:
+            self._in_flight -= 1
+            self._requests += 1
+            if not ok:
+                self._errors += 1
+            self._latencies.append(latency)
+            if wait is not None:
+                self._waits.append(wait)
+
+
+    def snapshot(self):
+        """
+        Resume las métricas actuales.
+        
+        Returns:
+            dict: Solicitudes atendidas y con error, solicitudes en curso,
+                profundidad actual y máxima de la cola, percentiles de
+                latencia y espera media en la cola (en milisegundos).
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            waits = list(self._waits)
+            in_flight = self._in_flight
+
+            return {
+                "uptime_seconds": time.time() - self._started,
+                "workers": self.workers,
+                "requests": self._requests,
+                "errors": self._errors,
+                "in_flight": in_flight,
+                "queue_depth": max(0, in_flight - self.workers),
+                "max_queue_depth": self._max_queue,
+                "latency_ms": {
+                    "p50": _percentile(latencies, 0.50) * 1e3,
+                    "p95": _percentile(latencies, 0.95) * 1e3,
+                    "p99": _percentile(latencies, 0.99) * 1e3,
+                    "max": (latencies[-1] if latencies else 0.0) * 1e3,
+                },
+                "queue_wait_ms": (sum(waits) / len(waits) if waits else 0.0) * 1e3,
+            }
+
+
+def _percentile(values, fraction):
+    """
+    Percentil de una lista ordenada (el valor más cercano por debajo).
+    
+    Args:
+        values (list): Valores ordenados.
+        fraction (float): Percentil entre 0 y 1.
+    
+    Returns:
+        float: Valor del percentil (0.0 si la lista está vacía).
+    """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+# Simuladores de cada proceso del pool, por versión, del menos al más
+# recientemente usado
+_worker_simulators = OrderedDict()
+
+
+def _simulate(version, input_str, budget, submitted_at, blob=None):
+    """
+    Ejecuta una simulación dentro de un proceso del pool.
+    
+    Las tareas solo llevan la versión de la máquina: si el proceso no la
+    tiene, devuelve None sin simular y el servidor repite la tarea con la
+    máquina serializada, que se deserializa una sola vez. Al superar
+    WORKER_CACHE_SIZE versiones se descarta la usada hace más tiempo.
+    
+    Args:
+        version (str): Hash de la definición de la máquina.
+        input_str (str): Cadena de entrada.
+        budget (Budget): Presupuesto de la solicitud (None para usar el de
+            config.py).
+        submitted_at (float): Instante (time.time) en que se envió la tarea.
+        blob (bytes): Máquina compilada serializada (None si el servidor
+            supone que el proceso ya la tiene).
+    
+    Returns:
+        tuple: (registro de la simulación, segundos de espera en la cola),
+            o None si el proceso no tiene la versión y blob es None.
+    """
+    wait = time.time() - submitted_at
+
+    simulator = _worker_simulators.get(version)
+    if simulator is not None:
+        _worker_simulators.move_to_end(version)
+    elif blob is None:
+        return None
+    else:
+        simulator = _worker_simulators[version] = make_simulator(pickle.loads(blob))
+        if len(_worker_simulators) > WORKER_CACHE_SIZE:
+            _worker_simulators.popitem(last=False)
+
+    return simulate_record(simulator, input_str, budget), wait
+
+
+class SimulationHandler(BaseHTTPRequestHandler):
+    """
+    Atiende las solicitudes HTTP del servidor de simulación.
+    
+    El servidor debe tener los atributos registry, metrics, executor y
+    default_machine.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    # Acumular cabeceras y cuerpo en una sola escritura: con conexiones
+    # persistentes, dos escrituras pequeñas esperan el ACK retardado del cliente
+    wbufsize = -1
+
+    def do_GET(self):
+        """Responde /machines y /metrics."""
+        if self.path == "/machines":
+            self._reply(200, {"machines": self.server.registry.describe(), "reloads": self.server.registry.reloads})
+        elif self.path == "/metrics":
+            self._reply(200, self.server.metrics.snapshot())
+        else:
+            self._reply(404, {"error": f"Ruta desconocida: {self.path}"})
+
+
+    def do_POST(self):
+        """Responde /simulate con el resultado de una simulación."""
+        received = time.perf_counter()
+        if self.path != "/simulate":
+            self._reply(404, {"error": f"Ruta desconocida: {self.path}"})
+            return
+
+        try:
+            request, budget = self._read_request()
+            entry = self.server.registry.get(request.get("machine", self.server.default_machine))
+        except LookupError as exc:
+            self._reply(404, {"error": str(exc)})
+            return
+        except ValueError as exc:
+            self._reply(400, {"error": str(exc)})
+            return
+
+        metrics = self.server.metrics
+        queued = metrics.submitted()
+
+        try:
+            executor = self.server.executor
+            input_str = str(request["input"])
+            submitted_at = time.time()
+            result = executor.submit(_simulate, entry.version, input_str, budget, submitted_at).result()
+            if result is None:
+                # El proceso no tenía esta versión: repetir con la máquina
+                result = executor.submit(
+                    _simulate, entry.version, input_str, budget, submitted_at, entry.blob
+                ).result()
+            record, wait = result
+        except Exception as exc:
+            metrics.finished(time.perf_counter() - received, ok=False)
+            self._reply(500, {"error": f"{type(exc).__name__}: {exc}"})
+            return
+
+        latency = time.perf_counter() - received
+        metrics.finished(latency, wait)
+
+        record.update({
+            "machine": entry.name,
+            "version": entry.version[:16],
+            "queue_depth": queued,
+            "queue_seconds": wait,
+            "latency_seconds": latency,
+        })
+        self._reply(200, record)
+
+
+    def _read_request(self):
+        """
+        Lee y valida el cuerpo JSON de una solicitud de simulación.
+        
+        Los límites max_steps y max_seconds de la solicitud reemplazan a
+        los del presupuesto de config.py; los demás se conservan.
+        
+        Returns:
+            tuple: (solicitud con al menos la clave input, presupuesto de la
+                simulación o None para usar el de config.py).
+        
+        Raises:
+            ValueError: Si el cuerpo no es un objeto JSON válido, le falta
+                la cadena de entrada o algún campo tiene un tipo o valor no
+                válido.
+        """
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"JSON no válido: {exc}") from None
+
+        if not isinstance(request, dict) or "input" not in request:
+            raise ValueError("La solicitud debe ser un objeto JSON con la clave 'input'")
+        if isinstance(request["input"], bool) or not isinstance(request["input"], (str, int)):
+            raise ValueError("La cadena de entrada debe ser un texto o un número")
+        if not isinstance(request.get("machine", ""), str):
+            raise ValueError("El nombre de la máquina debe ser un texto")
+
+        limits = {}
+        for key in ("max_steps", "max_seconds"):
+            value = request.get(key)
+            if value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"Límite no válido para {key}: {value!r}")
+            limits[key] = value
+
+        if not limits:
+            return request, None
+
+        budget = Budget(
+            max_steps=limits.get("max_steps", BUDGET.max_steps),
+            max_cells=BUDGET.max_cells,
+            max_log_bytes=BUDGET.max_log_bytes,
+            max_seconds=limits.get("max_seconds", BUDGET.max_seconds)
+        )
+        return request, budget
+
+
+    def _reply(self, status, body):
+        """
+        Envía una respuesta JSON.
+        
+        Args:
+            status (int): Código de estado HTTP.
+            body (dict): Contenido de la respuesta.
+        """
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+    def log_message(self, format, *args):
+        """Omite el registro por solicitud (las métricas lo reemplazan)."""
+
+
+    def address_string(self):
+        """Identifica al cliente (los sockets Unix no tienen dirección)."""
+        return self.client_address[0] if self.client_address else "unix"
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Servidor HTTP con un hilo por conexión sobre un socket Unix."""
+
+    daemon_threads = True
+
+
+def parse_args():
+    """
+    Interpreta los argumentos de línea de comandos.
+    
+    Returns:
+        argparse.Namespace: Opciones del servidor.
+    """
+    parser = argparse.ArgumentParser(description="Servidor local de simulación de Máquinas de Turing")
+    parser.add_argument("--host", default=SERVER_HOST, help="Dirección en la que escuchar (por defecto SERVER_HOST)")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="Puerto HTTP (por defecto SERVER_PORT)")
+    parser.add_argument("--socket", default=None, help="Escuchar en este socket Unix en lugar de TCP")
+    parser.add_argument(
+        "--workers", type=int, default=SERVER_WORKERS,
+        help="Procesos que atienden las simulaciones (por defecto uno por CPU)"
+    )
+    parser.add_argument("--machines", default=MACHINES_DIR, help="Directorio de las máquinas")
+    return parser.parse_args()
+
+
+def main():
+    """
+    Carga las máquinas y atiende solicitudes hasta recibir Ctrl+C o SIGTERM.
+    
+    Raises:
+        ValueError: Si el número de procesos no es positivo.
+    """
+    args = parse_args()
+    workers = args.workers if args.workers is not None else os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"Número de procesos no válido: {workers}")
+
+    registry = MachineRegistry(args.machines)
+
+    # Terminar igual que con Ctrl+C, cerrando el socket y el pool
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    if args.socket is not None:
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        server = UnixHTTPServer(args.socket, SimulationHandler)
+        address = f"unix:{args.socket}"
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), SimulationHandler)
+        address = f"http://{args.host}:{server.server_address[1]}"
+
+    server.registry = registry
+    server.metrics = ServerMetrics(workers)
+    server.default_machine = os.path.splitext(os.path.basename(CONFIGURACION))[0]
+
+    # Procesos iniciados desde cero: con fork heredarían el socket del
+    # servidor y lo mantendrían abierto si el servidor termina de forma abrupta
+    context = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        server.executor = executor
+        loaded = ", ".join(machine["name"] for machine in registry.describe())
+        print(f"Servidor escuchando en {address} con {workers} procesos (máquinas: {loaded})", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if args.socket is not None and os.path.exists(args.socket):
+                os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Visor de registros binarios de simulación.
+
+Este script abre un registro binario (.trace) generado con
+TRACE_FORMAT = "binary" y muestra un rango de sus pasos en el mismo formato
+de texto que los archivos de salida, reconstruyéndolos desde la
+configuración guardada más cercana sin leer el registro completo.
+
+Uso:
+    python trace_view.py outputs/simulation_3.trace                   # resumen
+    python trace_view.py outputs/simulation_3.trace --from 100 --to 120
+    python trace_view.py outputs/simulation_3.trace --from 5000 --window 10
+"""
+
+import argparse
+
+from parser.loader import MTConfigLoader
+from core.simulation import Simulator
+from core.trace import TraceReader
+from config import CONFIGURACION, MACHINE_CACHE_DIR, ID_WINDOW
+
+
+def parse_args():
+    """
+    Interpreta los argumentos de línea de comandos.
+    
+    Returns:
+        argparse.Namespace: Opciones del visor.
+    """
+    parser = argparse.ArgumentParser(description="Visor de registros binarios de simulación")
+    parser.add_argument("path", help="Ruta del registro binario (.trace)")
+    parser.add_argument(
+        "--from", dest="first", type=int, default=None,
+        help="Primer paso a mostrar (sin --from ni --to solo se muestra el resumen)"
+    )
+    parser.add_argument(
+        "--to", dest="last", type=int, default=None,
+        help="Último paso a mostrar (por defecto el último del registro)"
+    )
+    parser.add_argument(
+        "--machine", default=CONFIGURACION,
+        help="Archivo YAML de la máquina que generó el registro"
+    )
+    parser.add_argument(
+        "--window", type=int, default=ID_WINDOW,
+        help="Celdas a cada lado del cabezal en cada ID (por defecto ID_WINDOW)"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """
+    Muestra el resumen de un registro binario y el rango de pasos pedido.
+    
+    Raises:
+        ValueError: Si el registro corresponde a otra máquina o el rango
+            de pasos no es válido.
+    """
+    args = parse_args()
+
+    _, machine = MTConfigLoader(args.machine).load_compiled(MACHINE_CACHE_DIR)
+    simulator = Simulator(machine, id_window=args.window)
+
+    with TraceReader(args.path) as reader:
+        print(f"Cadena: {reader.input_str}")
+        print(f"Pasos registrados: {len(reader)}")
+
+        result = reader.result
+        if result is None:
+            print("Resultado: registro incompleto (simulación interrumpida)")
+        elif result["abort"] is not None:
+            print(f"Resultado: ABORTADA (presupuesto excedido: {result['abort'].reason})")
+        elif result["accepted"]:
+            print("Resultado: ACEPTADA")
+        else:
+            print("Resultado: RECHAZADA")
+
+        if args.first is None and args.last is None:
+            return
+
+        print()
+        first = args.first if args.first is not None else 1
+        for line in reader.lines(simulator, first, args.last):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()